@@ -0,0 +1,85 @@
+"""
+Benchmark batch persona scoring against per-query scoring.
+
+Usage:
+    python benchmarks/bench_batch_scoring.py [--queries 10000] [--top-k 5]
+
+Builds synthetic PR-description-style queries from the bundled skills,
+checks that SkillOrchestrator.relevance_ranking_batch() returns exactly what
+per-query relevance_ranking() does, and reports throughput for both, in
+both retrieval modes. The batch path is vectorized when NumPy is installed.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Run from a checkout without installing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sensei_mcp.orchestrator import SkillOrchestrator  # noqa: E402
+from sensei_mcp.personas import PersonaRegistry  # noqa: E402
+from sensei_mcp.personas.retrieval import _numpy  # noqa: E402
+
+
+SKILLS_DIR = Path(__file__).parent.parent / "src" / "sensei_mcp" / "personas" / "skills"
+
+TEMPLATES = [
+    "PR: {a}. Also touches {b}.",
+    "Refactor {a} before the release",
+    "Fix: {a} ({b})",
+    "{a}",
+]
+
+
+def make_queries(registry: PersonaRegistry, count: int, seed: int = 7):
+    """Deterministic queries mixing persona descriptions, use_when text and expertise."""
+    phrases = []
+    for persona in registry.get_all().values():
+        phrases.append(persona.description)
+        phrases.extend(persona.expertise_areas)
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(a=rng.choice(phrases), b=rng.choice(phrases))
+        for _ in range(count)
+    ]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    registry = PersonaRegistry(SKILLS_DIR)
+    queries = make_queries(registry, args.queries)
+    registry.search_index()  # Build outside the timings
+
+    print(f"{len(queries)} queries, {len(registry)} personas, top_k={args.top_k}, "
+          f"numpy={'yes' if _numpy() else 'no'}")
+    for retrieval in ("bm25", "keyword"):
+        orchestrator = SkillOrchestrator(registry, retrieval=retrieval)
+        orchestrator.relevance_ranking_batch(queries[:10], args.top_k)  # Warm up lazy matrices
+
+        single, single_s = timed(
+            lambda: [orchestrator.relevance_ranking(query)[:args.top_k] for query in queries]
+        )
+        batch, batch_s = timed(lambda: orchestrator.relevance_ranking_batch(queries, args.top_k))
+        if batch != single:
+            sys.exit(f"{retrieval}: batch results differ from per-query results")
+
+        print(f"  {retrieval:8s} per-query {single_s * 1000:7.0f} ms ({len(queries) / single_s:8.0f} q/s)"
+              f"   batch {batch_s * 1000:7.0f} ms ({len(queries) / batch_s:8.0f} q/s)"
+              f"   {single_s / batch_s:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Entry point for uvx execution"""
 import sys
+import signal
 import argparse
 
 def main():
@@ -13,9 +14,14 @@ Examples:
   sensei-mcp                    # Start the MCP server
   sensei-mcp --demo             # Run interactive demo (5 scenarios)
   sensei-mcp --version          # Show version information
+  sensei-mcp --session-store journal   # Append-only session storage
+  sensei-mcp --import-sessions ~/code/app  # Import JSON sessions into SQLite
+  sensei-mcp --compile-personas        # Prebuild the persona snapshot and search index
+  sensei-mcp --transport streamable-http --port 8000 --workers 4  # Shared team server
 
-The server communicates via JSON-RPC over stdio and is designed to be
-used with MCP clients like Claude Desktop, Cursor, Windsurf, or Cline.
+The server communicates via JSON-RPC over stdio (or HTTP with --transport)
+and is designed to be used with MCP clients like Claude Desktop, Cursor,
+Windsurf, or Cline.
 
 Demo mode showcases 5 real-world scenarios with multi-persona collaboration:
   1. Architecture Decision (microservices migration)
@@ -37,9 +43,120 @@ For more information, visit: https://github.com/amarodeabreu/sensei-mcp
         action="store_true",
         help="Run interactive demo showcasing persona capabilities"
     )
+    parser.add_argument(
+        "--session-store",
+        choices=["json", "journal", "sqlite"],
+        default="json",
+        help="Session storage backend (default: json). 'journal' appends one line per "
+             "decision/consultation and compacts into the JSON snapshot periodically; "
+             "'sqlite' keeps indexed tables in sessions.db"
+    )
+    parser.add_argument(
+        "--durability",
+        choices=["none", "file", "dir"],
+        default="none",
+        help="Session write durability (default: none). Writes are always atomic renames; "
+             "'file' also fsyncs the written file, 'dir' additionally fsyncs its directory"
+    )
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Coalesce session writes made within this window into one flush "
+             "(default: 0, write at the end of each tool call)"
+    )
+    parser.add_argument(
+        "--background-markdown",
+        action="store_true",
+        help="Update .sensei/decisions.md in a background thread instead of inline"
+    )
+    parser.add_argument(
+        "--compile-personas",
+        action="store_true",
+        help="Parse all persona SKILL.md files into the startup snapshot "
+             "(~/.sensei/cache/personas.pickle) and build the persona search index, then exit"
+    )
+    parser.add_argument(
+        "--skill-workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Parse persona SKILL.md files in N threads when no snapshot is available "
+             "(default: 1)"
+    )
+    parser.add_argument(
+        "--persona-retrieval",
+        choices=["bm25", "semantic", "keyword"],
+        default="bm25",
+        help="How personas are matched to queries beyond context detection (default: bm25). "
+             "'semantic' uses embeddings (requires numpy) and catches looser wording"
+    )
+    parser.add_argument(
+        "--embedding-model",
+        metavar="NAME",
+        help="sentence-transformers model for --persona-retrieval semantic "
+             "(e.g. all-MiniLM-L6-v2; default: hashed n-gram embeddings, no model)"
+    )
+    parser.add_argument(
+        "--persist-path-cache",
+        action="store_true",
+        help="Keep file path classifications in ~/.sensei/cache/path-shapes.json across restarts"
+    )
+    parser.add_argument(
+        "--response-cache-mb",
+        type=float,
+        default=8.0,
+        metavar="MB",
+        help="Memory for pre-rendered responses of deterministic tools such as "
+             "get_persona_content (default: 8, 0 disables)"
+    )
+    parser.add_argument(
+        "--tool-workers",
+        type=int,
+        default=8,
+        metavar="N",
+        help="Threads for the tools' blocking file I/O, so slow calls don't stall others (default: 8)"
+    )
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "streamable-http", "sse"],
+        default="stdio",
+        help="MCP transport (default: stdio). 'streamable-http' serves http://HOST:PORT/mcp "
+             "so several clients can share one server; 'sse' serves the older SSE transport at /sse"
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to listen on with an HTTP transport (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="Port to listen on with an HTTP transport (default: 8000)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Pre-fork N worker processes sharing personas and rulebook loaded once by a "
+             "supervising master (streamable-http only). SIGHUP reloads skills and rulebook "
+             "and replaces the workers gracefully"
+    )
+    parser.add_argument(
+        "--import-sessions",
+        nargs="*",
+        metavar="PROJECT_ROOT",
+        help="Import ~/.sensei/sessions/*.json (and <PROJECT_ROOT>/.sensei/*.json) "
+             "into SQLite session databases, then exit"
+    )
 
     # Parse arguments
     args = parser.parse_args()
+    if args.workers and args.transport != "streamable-http":
+        parser.error("--workers requires --transport streamable-http")
 
     # Handle demo mode
     if args.demo:
@@ -47,9 +164,117 @@ For more information, visit: https://github.com/amarodeabreu/sensei-mcp
         run_demo()
         return
 
+    # Handle persona snapshot compilation
+    if args.compile_personas:
+        import time
+        from .server import SKILLS_DIR, PERSONA_SNAPSHOT
+        from .personas.loader import SkillLoadReport
+        from .personas.snapshot import compile_snapshot
+
+        report = SkillLoadReport()
+        start = time.perf_counter()
+        skills = compile_snapshot(SKILLS_DIR, PERSONA_SNAPSHOT, workers=args.skill_workers, report=report)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Compiled {len(skills)} personas into {PERSONA_SNAPSHOT} ({elapsed_ms:.0f} ms)")
+        print("Slowest skill files:")
+        for name, seconds in report.slowest():
+            print(f"  {seconds * 1000:7.1f} ms  {name}")
+        if report.errors:
+            print(f"Failed to load {len(report.errors)} skill file(s):\n{report.format_errors()}")
+
+        # Prebuild the BM25 search index from the fresh snapshot
+        from .personas import PersonaRegistry
+        registry = PersonaRegistry(SKILLS_DIR, snapshot_path=PERSONA_SNAPSHOT)
+        start = time.perf_counter()
+        index = registry.search_index()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Indexed {len(index)} personas into {registry.search_index_path} ({elapsed_ms:.0f} ms)")
+
+        if args.persona_retrieval == "semantic":
+            from .personas.semantic import semantic_available
+            if not semantic_available():
+                print("Skipping semantic index: numpy is not installed")
+                return
+            registry.embedding_model = args.embedding_model
+            start = time.perf_counter()
+            semantic = registry.semantic_index()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"Embedded {semantic.vectors.shape[0]} skill chunks with {semantic.embedder.name} "
+                  f"({elapsed_ms:.0f} ms)")
+        return
+
+    # Handle SQLite import
+    if args.import_sessions is not None:
+        from pathlib import Path
+        from .server import SESSION_DIR
+        from .session_store import SqliteSessionStore
+
+        store = SqliteSessionStore()
+        session_dirs = [SESSION_DIR] + [Path(root) / ".sensei" for root in args.import_sessions]
+        for session_dir in session_dirs:
+            if not session_dir.is_dir():
+                print(f"Skipping {session_dir} (not a directory)")
+                continue
+            imported = store.import_json_sessions(session_dir)
+            print(f"Imported {len(imported)} session(s) into {session_dir / store.DB_NAME}")
+        store.close()
+        return
+
     # If we get here (no --help or --version), start the server
-    from .server import mcp
-    mcp.run()
+    from .server import (
+        mcp, session_mgr, persona_registry, orchestrator, response_cache, tool_pool, PATH_SHAPE_CACHE
+    )
+    from .engine import ContextInferenceEngine
+    from .session_store import SESSION_STORES
+
+    session_mgr.store = SESSION_STORES[args.session_store](durability=args.durability)
+    session_mgr.flush_interval = args.flush_interval
+    session_mgr.background_markdown = args.background_markdown
+    persona_registry.workers = args.skill_workers
+    persona_registry.embedding_model = args.embedding_model
+    response_cache.max_bytes = int(args.response_cache_mb * 1024 * 1024)
+    tool_pool.resize(max(1, args.tool_workers))
+    orchestrator.retrieval = args.persona_retrieval
+    if args.persona_retrieval == "semantic":
+        from .personas.semantic import semantic_available
+        if not semantic_available():
+            print("Warning: --persona-retrieval semantic requires numpy; using bm25", file=sys.stderr)
+    if args.persist_path_cache:
+        ContextInferenceEngine.load_path_cache(PATH_SHAPE_CACHE)
+
+    def shutdown():
+        tool_pool.shutdown()  # Let running tools finish their session writes
+        session_mgr.close()
+        if args.persist_path_cache:
+            try:
+                ContextInferenceEngine.save_path_cache(PATH_SHAPE_CACHE)
+            except OSError as e:
+                print(f"Warning: Could not save path classification cache: {e}", file=sys.stderr)
+
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+    if args.workers:
+        from .http_server import PreforkServer, bind_socket, preload_shared_state, reload_shared_state
+
+        loaded = preload_shared_state(args.persona_retrieval)
+        sock = bind_socket(args.host, args.port)
+        host, port = sock.getsockname()[:2]
+        print(f"Serving MCP at http://{host}:{port}{mcp.settings.streamable_http_path} with "
+              f"{args.workers} worker(s) ({loaded['personas']} personas, {loaded['sections']} "
+              f"rulebook sections preloaded)", file=sys.stderr, flush=True)
+        PreforkServer(
+            mcp, sock, args.workers,
+            reload=lambda: reload_shared_state(args.persona_retrieval),
+            on_exit=shutdown,
+        ).run()
+        return
+
+    # Turn SIGTERM into a normal exit so queued session writes are flushed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        mcp.run(args.transport)
+    finally:
+        shutdown()
 
 if __name__ == "__main__":
     main()
@@ -59,6 +59,15 @@ class SessionInsights:
     avg_consultations_per_day: float
 
 
+def time_range_cutoff(time_range: str) -> Optional[datetime]:
+    """Earliest timestamp included in a time range ("all_time" → None)."""
+    if time_range == "last_7_days":
+        return datetime.now() - timedelta(days=7)
+    if time_range == "last_30_days":
+        return datetime.now() - timedelta(days=30)
+    return None
+
+
 class SessionAnalyzer:
     """Analyzes session data to provide insights."""
 
@@ -136,15 +145,8 @@ class SessionAnalyzer:
         time_range: str
     ) -> List[Consultation]:
         """Filter consultations by time range."""
-        if time_range == "all_time":
-            return consultations
-
-        now = datetime.now()
-        if time_range == "last_7_days":
-            cutoff = now - timedelta(days=7)
-        elif time_range == "last_30_days":
-            cutoff = now - timedelta(days=30)
-        else:
+        cutoff = time_range_cutoff(time_range)
+        if cutoff is None:
             return consultations
 
         filtered = []
@@ -4,10 +4,12 @@ Context detector for intelligent persona selection.
 Following Snarky Senior Engineer: Simple regex patterns, max 10 contexts.
 Following Pragmatic Architect: Priority ordering, multiple contexts.
 Following Platform Builder: Debuggable with confidence scores.
+Following Performance Engineer: Precompile, prefilter, memoize.
 """
 
 import re
 from enum import Enum
+from functools import lru_cache
 from typing import List, Tuple
 
 
@@ -35,12 +37,38 @@ class QueryContext(Enum):
     GENERAL = "general"
 
 
+# A pattern starting with an alternation of plain words, e.g. \b(down|outage|crash)
+_LEADING_WORDS = re.compile(r"^(?:\\b)?\(([\w |/:-]+)\)")
+
+# After lower(), the only non-ASCII characters that IGNORECASE matches to ASCII letters
+_CASE_FOLD = str.maketrans({'\u0131': 'i', '\u017f': 's'})
+
+
+def _required_literals(pattern: str) -> Tuple[str, ...]:
+    """
+    Lowercase words of which at least one must occur in any text the pattern
+    matches (case-insensitively), or () if the pattern has no such prefix.
+    """
+    match = _LEADING_WORDS.match(pattern)
+    if not match:
+        return ()
+    return tuple(word.lower() for word in match.group(1).split('|'))
+
+
 class ContextDetector:
     """
     Detect query context to intelligently select personas.
 
     Uses regex pattern matching against predefined contexts.
     Returns primary context (highest priority match) plus all matching contexts.
+
+    Patterns are precompiled once. Most start with an alternation of plain
+    words (``\\b(down|outage|...)``), so a pattern can only match if one of
+    those literals occurs in the query. One pass of substring checks over the
+    distinct literals picks the patterns that can match, and only those run
+    search(). Results are identical to searching every pattern, and are
+    memoized per query, so repeated detection within a request (primary
+    context, explanation, orchestration) costs a cache lookup.
     """
 
     # Context patterns (regex)
@@ -108,6 +136,23 @@ class ContextDetector:
         QueryContext.GENERAL,
     ]
 
+    # Detection results kept per detector (distinct queries)
+    CACHE_SIZE = 256
+
+    def __init__(self):
+        # (context, compiled pattern, whether it always runs), in PATTERNS order
+        self._compiled = []
+        # Literal → indexes of the patterns it gates (shared literals such as 'database' gate several)
+        gates = {}
+        for context, patterns in self.PATTERNS.items():
+            for pattern in patterns:
+                literals = _required_literals(pattern)
+                for literal in literals:
+                    gates.setdefault(literal, []).append(len(self._compiled))
+                self._compiled.append((context, re.compile(pattern, re.IGNORECASE), not literals))
+        self._gates = tuple((literal, tuple(indexes)) for literal, indexes in gates.items())
+        self._detect_cached = lru_cache(maxsize=self.CACHE_SIZE)(self._detect)
+
     def detect_contexts(self, query: str) -> List[Tuple[QueryContext, int]]:
         """
         Detect all relevant contexts in the query with match counts.
@@ -118,23 +163,28 @@ class ContextDetector:
         Returns:
             List of (context, match_count) tuples, sorted by match_count descending
         """
+        return list(self._detect_cached(query))
+
+    def _detect(self, query: str) -> Tuple[Tuple[QueryContext, int], ...]:
         detected = {}
         query_lower = query.lower()
+        folded = query_lower.translate(_CASE_FOLD)
 
-        for context, patterns in self.PATTERNS.items():
-            matches = 0
-            for pattern in patterns:
-                if re.search(pattern, query_lower, re.IGNORECASE):
-                    matches += 1
+        # One pass over the distinct literals decides which patterns can match at all
+        candidates = set()
+        for literal, indexes in self._gates:
+            if literal in folded:
+                candidates.update(indexes)
 
-            if matches > 0:
-                detected[context] = matches
+        for index, (context, pattern, always) in enumerate(self._compiled):
+            if (always or index in candidates) and pattern.search(query_lower):
+                detected[context] = detected.get(context, 0) + 1
 
         # Sort by match count descending
         sorted_contexts = sorted(detected.items(), key=lambda x: x[1], reverse=True)
 
-        # Return as list of tuples
-        return sorted_contexts if sorted_contexts else [(QueryContext.GENERAL, 0)]
+        # Return as tuple of tuples (cached; detect_contexts hands out lists)
+        return tuple(sorted_contexts) if sorted_contexts else ((QueryContext.GENERAL, 0),)
 
     def get_primary_context(self, query: str) -> QueryContext:
         """
@@ -148,7 +198,10 @@ class ContextDetector:
         Returns:
             The primary QueryContext
         """
-        all_contexts = self.detect_contexts(query)
+        return self._primary(self._detect_cached(query))
+
+    def _primary(self, all_contexts) -> QueryContext:
+        """Highest-priority context among detected (context, count) pairs."""
         detected_contexts = [ctx for ctx, _ in all_contexts]
 
         # Apply priority ordering
@@ -175,7 +228,7 @@ class ContextDetector:
         if not contexts or contexts[0][0] == QueryContext.GENERAL:
             return "No specific context detected (GENERAL query)"
 
-        primary = self.get_primary_context(query)
+        primary = self._primary(contexts)
 
         lines = [f"Primary Context: {primary.value.upper()}"]
         if len(contexts) > 1:
@@ -1,71 +1,668 @@
+import hashlib
+import json
+import os
 import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Dict, List, Set
+from typing import Optional, Dict, FrozenSet, Iterable, List, Pattern, Set, Tuple
 
 from .models import ContextType
 
+# Start of every section marker; a section's content runs up to the next one
+_SECTION_BOUNDARY = "<!-- SECTION:"
+_SECTION_MARKER = re.compile(r"<!-- SECTION: (.*?) -->")
+# Topic labels of a section: "**Input/Output Contracts:**" lines and ### headers
+_SECTION_TOPIC = re.compile(r"^(?:\*\*([^*\n]+?):?\*\*:?|#{3,}\s+(.+?))\s*$", re.MULTILINE)
+_SECTION_SEPARATOR = "\n\n---\n\n"
+# Longest first paragraph kept in a section summary (characters)
+MAX_SUMMARY_INTRO = 240
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM token count (~4 characters per token for English Markdown)."""
+    return (len(text) + 3) // 4
+
+
+def summarize_section(section_name: str, content: str) -> str:
+    """
+    Short stand-in for a section that doesn't fit a token budget: its heading,
+    first paragraph and topic labels, plus how to get the full text.
+    """
+    blocks = [block.strip() for block in content.split("\n\n") if block.strip()]
+    heading = blocks[0] if blocks and blocks[0].startswith("#") else ""
+    intro = next((block for block in blocks
+                  if not block.startswith(("#", "-", "*", "|", "`", ">")) and block[0].isalnum()), "")
+    if len(intro) > MAX_SUMMARY_INTRO:
+        intro = intro[:MAX_SUMMARY_INTRO].rsplit(" ", 1)[0] + " …"
+    topics = [bold or header for bold, header in _SECTION_TOPIC.findall(content)]
+
+    parts = [part for part in (heading, intro) if part]
+    if topics:
+        parts.append("Covers: " + "; ".join(topics) + ".")
+    parts.append(f"*Summary only: `query_specific_standard(\"{section_name}\")` returns the full section.*")
+    return "\n\n".join(parts)
+
+
+@dataclass
+class SectionAssembly:
+    """Sections assembled within a token budget."""
+    content: str
+    tokens: int                                          # Estimated tokens of ``content``
+    full: List[str] = field(default_factory=list)        # Sections included in full ("local_rules": project rules)
+    summarized: List[str] = field(default_factory=list)  # Sections replaced by their summary
+    omitted: List[str] = field(default_factory=list)     # Sections left out entirely
+
+
+@dataclass(frozen=True)
+class _RulebookVersion:
+    """
+    One loaded version of the directives file. A reload publishes a new
+    instance with a single assignment, so a reader that took a version
+    slices and caches with that version's text and offsets only.
+    """
+    content: str
+    stamp: Tuple[int, int]                                # (mtime_ns, size) it was read at
+    offsets: Dict[str, Tuple[int, int]]                   # Section name → (start, end) in content
+    sections: Dict[str, str] = field(default_factory=dict)                # Sliced sections
+    budget: Dict[str, Tuple[int, str, int]] = field(default_factory=dict)  # (tokens, summary, summary tokens)
+
+
 class RulebookLoader:
-    """Loads and manages rulebook content with section extraction"""
+    """
+    Loads and manages rulebook content with section extraction.
+
+    The directives file is tokenized once into a section name → (start, end)
+    offset table, and sections are sliced out of it on first use. Unknown
+    names are answered from the same table, so misses cost a dict lookup
+    instead of a scan. The file's mtime and size are checked on every
+    lookup, and an edited rulebook is re-read and re-indexed without
+    restarting the server. Text, offsets and derived sections are one
+    immutable version object, replaced as a whole, so concurrent tool calls
+    never mix an old text with new offsets.
+
+    Project rules (``<project_root>/.sensei/rules.md``) are never stored on
+    the loader itself: load_local_rules() returns them, and callers pass
+    them to the extract methods per request, so one project's rules can't
+    leak into another project's response. They are cached per resolved
+    project root in a bounded LRU, validated by mtime and size.
+    """
 
-    def __init__(self, directives_path: Path):
+    def __init__(self, directives_path: Path, local_rules_cache_size: int = 32):
+        """
+        Args:
+            directives_path: Path to core-directives.md
+            local_rules_cache_size: Project roots whose rules are kept in memory
+        """
         self.directives_path = directives_path
-        self._full_content: Optional[str] = None
-        self._section_cache: Dict[str, str] = {}
-        self._local_rules: Optional[str] = None
-
-    def _load_full_content(self) -> str:
-        """Load full directives file"""
-        if self._full_content is None:
-            if not self.directives_path.exists():
+        self.local_rules_cache_size = local_rules_cache_size
+        self._version: Optional[_RulebookVersion] = None
+        # Resolved project root → ((mtime_ns, size) of rules.md, its content)
+        self._local_rules_cache: "OrderedDict[Path, Tuple[Tuple[int, int], str]]" = OrderedDict()
+        self._local_rules_lock = threading.Lock()
+
+    def _load(self) -> _RulebookVersion:
+        """Current version of the directives file (loaded again if it changed since it was indexed)"""
+        version = self._version
+        try:
+            stat = self.directives_path.stat()
+        except OSError:
+            if version is None:
                 raise FileNotFoundError(f"Core directives not found at {self.directives_path}")
-            self._full_content = self.directives_path.read_text()
-        return self._full_content
-        
-    def load_local_rules(self, project_root: Optional[str]):
-        """Load project-specific rules if they exist"""
+            return version  # Removed while running: keep serving what we have
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if version is None or stamp != version.stamp:
+            content = self.directives_path.read_text()
+            version = _RulebookVersion(content=content, stamp=stamp, offsets=self._index_sections(content))
+            self._version = version
+        return version
+
+    @staticmethod
+    def _index_sections(content: str) -> Dict[str, Tuple[int, int]]:
+        """Offsets of each named section's content, in one pass over the markers"""
+        offsets: Dict[str, Tuple[int, int]] = {}
+        position = content.find(_SECTION_BOUNDARY)
+        while position != -1:
+            marker = _SECTION_MARKER.match(content, position)
+            next_position = content.find(_SECTION_BOUNDARY, position + 1)
+            if marker:
+                end = content.find(_SECTION_BOUNDARY, marker.end())
+                # The first marker of a name wins
+                offsets.setdefault(marker.group(1), (marker.end(), len(content) if end == -1 else end))
+            position = next_position
+        return offsets
+
+    def load_local_rules(self, project_root: Optional[str]) -> Optional[str]:
+        """
+        Load project-specific rules if they exist.
+
+        Args:
+            project_root: Project root, or None for no project
+
+        Returns:
+            Content of ``<project_root>/.sensei/rules.md``, or None
+        """
         if not project_root:
-            return
-            
-        local_rules_path = Path(project_root) / ".sensei" / "rules.md"
-        if local_rules_path.exists():
-            self._local_rules = local_rules_path.read_text()
+            return None
 
-    def extract_section(self, section_name: str) -> str:
-        """Extract a specific section from the directives"""
-        if section_name == "local_rules" and self._local_rules:
-            return self._local_rules
+        root = Path(project_root).resolve()
+        local_rules_path = root / ".sensei" / "rules.md"
+        try:
+            stat = local_rules_path.stat()
+        except OSError:
+            with self._local_rules_lock:
+                self._local_rules_cache.pop(root, None)
+            return None
 
-        if section_name in self._section_cache:
-            return self._section_cache[section_name]
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._local_rules_lock:
+            cached = self._local_rules_cache.get(root)
+            if cached is not None and cached[0] == stamp:
+                self._local_rules_cache.move_to_end(root)
+                return cached[1]
 
-        content = self._load_full_content()
+        try:
+            rules = local_rules_path.read_text()
+        except OSError:
+            return None
+        if self.local_rules_cache_size > 0:
+            with self._local_rules_lock:
+                self._local_rules_cache[root] = (stamp, rules)
+                self._local_rules_cache.move_to_end(root)
+                while len(self._local_rules_cache) > self.local_rules_cache_size:
+                    self._local_rules_cache.popitem(last=False)
+        return rules
 
-        # Find section by HTML comment marker
-        pattern = f"<!-- SECTION: {section_name} -->(.*?)(?=<!-- SECTION:|$)"
-        match = re.search(pattern, content, re.DOTALL)
+    @staticmethod
+    def _section(version: _RulebookVersion, section_name: str) -> Optional[str]:
+        """Section content from a version's offset table, or None if there is no such section"""
+        content = version.sections.get(section_name)
+        if content is None:
+            offsets = version.offsets.get(section_name)
+            if offsets is None:
+                return None
+            content = version.content[offsets[0]:offsets[1]].strip()
+            version.sections[section_name] = content
+        return content
 
-        if match:
-            section_content = match.group(1).strip()
-            self._section_cache[section_name] = section_content
-            return section_content
+    def extract_section(self, section_name: str, local_rules: Optional[str] = None) -> str:
+        """
+        Extract a specific section from the directives.
 
-        return f"Section '{section_name}' not found in directives."
+        Args:
+            section_name: Section marker name
+            local_rules: This request's project rules (from load_local_rules()),
+                returned for section "local_rules"
+        """
+        if section_name == "local_rules" and local_rules:
+            return local_rules
 
-    def extract_multiple_sections(self, section_names: List[str]) -> str:
-        """Extract multiple sections and combine them"""
+        content = self._section(self._load(), section_name)
+        if content is None:
+            return f"Section '{section_name}' not found in directives."
+        return content
+
+    def extract_multiple_sections(self, section_names: List[str], local_rules: Optional[str] = None) -> str:
+        """
+        Extract multiple sections and combine them.
+
+        Args:
+            section_names: Section marker names
+            local_rules: This request's project rules (from load_local_rules()),
+                appended after the sections
+        """
+        version = self._load()
         sections = []
         for name in section_names:
-            content = self.extract_section(name)
-            if content and "not found" not in content:
+            if name == "local_rules" and local_rules:
+                content = local_rules
+            else:
+                content = self._section(version, name)
+            if content:
                 sections.append(content)
-                
+
         # Append local rules if they exist and we are loading relevant sections
         # (For now, just append them if they exist, or maybe only if specific contexts are triggered?
         # Let's append them at the end if they exist, as they might override or add to any section)
-        if self._local_rules:
-             sections.append(f"\n\n# 🏠 Project Local Rules\n\n{self._local_rules}")
+        if local_rules:
+             sections.append(f"\n\n# 🏠 Project Local Rules\n\n{local_rules}")
+
+        return _SECTION_SEPARATOR.join(sections)
+
+    @classmethod
+    def _budget_entry(cls, version: _RulebookVersion, section_name: str) -> Optional[Tuple[int, str, int]]:
+        """(tokens, summary, summary tokens) of a section, computed once per file version"""
+        entry = version.budget.get(section_name)
+        if entry is None:
+            content = cls._section(version, section_name)
+            if content is None:
+                return None
+            summary = summarize_section(section_name, content)
+            entry = (estimate_tokens(content), summary, estimate_tokens(summary))
+            version.budget[section_name] = entry
+        return entry
+
+    def preload(self) -> int:
+        """
+        Load the rulebook and prepare every section and its summary up front
+        (e.g. before forking workers that then share them). Returns the number of sections.
+        """
+        version = self._load()
+        for section_name in version.offsets:
+            self._budget_entry(version, section_name)
+        return len(version.offsets)
+
+    def section_tokens(self, section_name: str) -> Optional[int]:
+        """Estimated tokens of a section, or None if there is no such section"""
+        entry = self._budget_entry(self._load(), section_name)
+        return entry[0] if entry else None
+
+    def assemble_sections(self, section_names: List[str], max_tokens: int,
+                          local_rules: Optional[str] = None) -> SectionAssembly:
+        """
+        Combine sections within a token budget.
+
+        Every section first gets its summary, in the given (priority)
+        order, while they fit; then sections are expanded to full text
+        greedily in the same order. So the most important sections come in
+        full and the rest still appear as summaries instead of being cut.
+        Project rules are considered right after the first two (core)
+        sections and are included in full or not at all.
+
+        Args:
+            section_names: Section marker names, most important first
+            max_tokens: Approximate token budget for the combined content
+            local_rules: This request's project rules (from load_local_rules())
+
+        Returns:
+            SectionAssembly with the content and what was included how
+        """
+        version = self._load()
+        separator_tokens = estimate_tokens(_SECTION_SEPARATOR)
+
+        # (name, full text, tokens, summary, summary tokens); name None is the project rules
+        candidates = []
+        for name in section_names:
+            entry = self._budget_entry(version, name) if name != "local_rules" else None
+            if entry is not None:
+                candidates.append((name, self._section(version, name)) + entry)
+        if local_rules:
+            rules = f"# 🏠 Project Local Rules\n\n{local_rules}"
+            candidates.insert(min(2, len(candidates)), (None, rules, estimate_tokens(rules), None, None))
+
+        assembly = SectionAssembly(content="", tokens=0)
+        chosen: Dict[int, bool] = {}  # Candidate index → full text?
+        for index, (name, _, tokens, _, summary_tokens) in enumerate(candidates):
+            cost = (tokens if name is None else summary_tokens) + (separator_tokens if chosen else 0)
+            if assembly.tokens + cost <= max_tokens:
+                chosen[index] = name is None
+                assembly.tokens += cost
+            else:
+                assembly.omitted.append(name or "local_rules")
+        for index in chosen:
+            _, _, tokens, _, summary_tokens = candidates[index]
+            if not chosen[index] and assembly.tokens + tokens - summary_tokens <= max_tokens:
+                chosen[index] = True
+                assembly.tokens += tokens - summary_tokens
+
+        parts = []
+        for index, full in chosen.items():
+            name, text, _, summary, _ = candidates[index]
+            parts.append(text if full else summary)
+            (assembly.full if full else assembly.summarized).append(name or "local_rules")
+        assembly.content = _SECTION_SEPARATOR.join(parts)
+        return assembly
 
-        return "\n\n---\n\n".join(sections)
+
+# Top-level alternatives of a file pattern that don't need the regex engine
+_LITERAL_ALTERNATIVE = re.compile(r'((?:[A-Za-z0-9_/ -]|\\\.)*)(?:\(([a-z0-9]+(?:\|[a-z0-9]+)*)\))?')  # seed\.(sql|js)
+_EXTENSION_ALTERNATIVE = re.compile(r'\\\.\(([a-z0-9]+(?:\|[a-z0-9]+)*)\)')                            # \.(md|rst|adoc)
+
+
+# Path shapes: runs of 2+ digits (migration numbers, dates, shard ids) collapse to "00"
+_DIGIT_RUN = re.compile(r'\d{2,}')
+# Pattern syntax that could tell digit runs apart, which makes shapes inexact
+_DIGIT_SENSITIVE = re.compile(r'\\[dDwWbB1-9]|[\[{]|\d\d|(?<![a-z])\d|\d(?![a-z])')
+
+
+def _literal_expansions(alternative: str) -> Optional[List[str]]:
+    """
+    The plain strings an alternative matches, if it is a word with an optional
+    trailing group of words (``seed\\.(sql|js|ts)``), else None. A trailing
+    ``.*`` is dropped: it doesn't change whether a search matches.
+    """
+    if alternative.endswith('.*') and not alternative.endswith('\\.*'):
+        alternative = alternative[:-2]
+    match = _LITERAL_ALTERNATIVE.fullmatch(alternative)
+    if not match or not alternative:
+        return None
+    prefix = match.group(1).replace('\\.', '.')
+    if match.group(2) is None:
+        return [prefix]
+    return [prefix + option for option in match.group(2).split('|')]
+
+
+def _split_alternatives(pattern: str) -> List[str]:
+    """Split a regex on its top-level ``|``, unwrapping enclosing groups."""
+    while True:
+        parts = []
+        depth = start = i = 0
+        balanced_inside = True  # Does the first '(' stay open until the last character?
+        while i < len(pattern):
+            char = pattern[i]
+            if char == '\\':
+                i += 1
+            elif char == '[':
+                i = pattern.find(']', i + 2)
+                if i == -1:
+                    return [pattern]
+            elif char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+                if depth == 0 and i < len(pattern) - 1:
+                    balanced_inside = False
+            elif char == '|' and depth == 0:
+                parts.append(pattern[start:i])
+                start = i + 1
+            i += 1
+        parts.append(pattern[start:])
+
+        if (len(parts) == 1 and balanced_inside and pattern.startswith('(')
+                and not pattern.startswith('(?') and pattern.endswith(')')):
+            pattern = pattern[1:-1]
+            continue
+        return parts
+
+
+@dataclass
+class FileClassification:
+    """Contexts of a set of file paths."""
+    per_path: Dict[str, FrozenSet[ContextType]]   # Path → contexts its patterns map to
+    contexts: Set[ContextType]                     # Union over all paths
+
+
+class PathShapeCache:
+    """
+    Bounded LRU of path shape → FILE_PATTERNS match mask.
+
+    Masks are only valid for the patterns they were computed with, so the
+    cache is bound to a patterns fingerprint and cleared when it changes.
+    It can be saved to and loaded from a JSON file to survive restarts.
+    """
+
+    VERSION = 1
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Args:
+            max_entries: Distinct shapes kept (0 disables caching)
+        """
+        self.max_entries = max_entries
+        self.fingerprint: Optional[str] = None
+        self._masks: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def bind(self, fingerprint: str):
+        """Use the cache for patterns with ``fingerprint``, dropping masks of other patterns."""
+        with self._lock:
+            if fingerprint != self.fingerprint:
+                self._masks.clear()
+                self.fingerprint = fingerprint
+
+    def get(self, shape: str) -> Optional[int]:
+        with self._lock:
+            mask = self._masks.get(shape)
+            if mask is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._masks.move_to_end(shape)
+            return mask
+
+    def put(self, shape: str, mask: int):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._masks[shape] = mask
+            self._masks.move_to_end(shape)
+            while len(self._masks) > self.max_entries:
+                self._masks.popitem(last=False)
+            self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._masks.clear()
+            self._dirty = True
+
+    def stats(self) -> Dict[str, float]:
+        """Cache counters, occupancy and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._masks),
+            'max_entries': self.max_entries,
+        }
+
+    def load(self, path: Path) -> int:
+        """
+        Add the shapes saved in ``path`` (least recently used first).
+
+        Files written for other patterns, or unreadable ones, are ignored.
+
+        Returns:
+            Number of shapes loaded
+        """
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return 0
+        if not isinstance(data, dict) or data.get('version') != self.VERSION \
+                or data.get('fingerprint') != self.fingerprint:
+            return 0
+
+        shapes = data.get('shapes')
+        if not isinstance(shapes, dict) or self.max_entries <= 0:
+            return 0
+        loaded = 0
+        with self._lock:
+            # Newest saved shape first, each pushed to the old end: saved order is kept,
+            # and shapes already seen in this process stay more recent
+            for shape, mask in reversed(list(shapes.items())[-self.max_entries:]):
+                if shape not in self._masks and isinstance(mask, int):
+                    self._masks[shape] = mask
+                    self._masks.move_to_end(shape, last=False)
+                    loaded += 1
+            while len(self._masks) > self.max_entries:
+                self._masks.popitem(last=False)
+        return loaded
+
+    def save(self, path: Path) -> bool:
+        """
+        Write the cache to ``path`` (atomically) if it changed since the last save.
+
+        Returns:
+            True if the file was written
+        """
+        with self._lock:
+            if not self._dirty or self.fingerprint is None:
+                return False
+            data = {'version': self.VERSION, 'fingerprint': self.fingerprint, 'shapes': dict(self._masks)}
+            self._dirty = False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, separators=(',', ':')))
+        os.replace(tmp_path, path)
+        return True
+
+
+class FilePathClassifier:
+    """
+    Maps file paths to ContextTypes with the semantics of searching every
+    FILE_PATTERNS regex in the lowercased path, without running them all.
+
+    Each pattern is split into its top-level alternatives, and each
+    alternative is matched the cheapest way that is still exact:
+
+    - plain words (``api``, ``query\\.sql``, ``seed\\.(sql|js|ts)``):
+      substring checks
+    - dotted extension lists (``\\.(md|rst|adoc)``): a table lookup of the
+      text after each ``.`` in the path (prefixes included, as the unanchored
+      regex would match ``.c`` in ``.config``)
+    - anything else (``datadog\\.ya?ml``): one combined regex rules out paths
+      that match none of them; only paths it matches try each alternative
+
+    Literals without ``/`` and extensions can only match within one path
+    segment, so the bulk methods compute each distinct directory or file
+    name once per call. Matched patterns are tracked as a bitmask, and each
+    distinct mask is turned into a context set once.
+
+    With a PathShapeCache, the bulk methods look paths up by shape (the
+    lowercased path with digit runs collapsed, so ``migrations/0042.sql`` and
+    ``migrations/0043.sql`` share an entry) and skip matching entirely for
+    known shapes. Shapes only collapse digits when no pattern can tell digit
+    runs apart; otherwise the lowercased path is the key.
+    """
+
+    def __init__(self, patterns: Dict[str, List[ContextType]], cache: Optional[PathShapeCache] = None):
+        self.patterns = patterns
+        self.fingerprint = hashlib.sha256(repr([
+            (pattern, [context.value for context in contexts]) for pattern, contexts in patterns.items()
+        ]).encode('utf-8')).hexdigest()
+        self.shapes_collapse_digits = not any(_DIGIT_SENSITIVE.search(pattern) for pattern in patterns)
+        self.cache = cache
+        if cache is not None:
+            cache.bind(self.fingerprint)
+        self._pattern_contexts = [tuple(contexts) for contexts in patterns.values()]
+
+        literals: Dict[str, int] = {}
+        extensions: Dict[str, int] = {}
+        remaining: List[Tuple[Pattern, int]] = []
+        for index, pattern in enumerate(patterns):
+            bit = 1 << index
+            for alternative in _split_alternatives(pattern):
+                extension = _EXTENSION_ALTERNATIVE.fullmatch(alternative)
+                if extension:
+                    for suffix in extension.group(1).split('|'):
+                        extensions[suffix] = extensions.get(suffix, 0) | bit
+                    continue
+                expansions = _literal_expansions(alternative)
+                if expansions is None:
+                    remaining.append((re.compile(alternative), bit))
+                    continue
+                for literal in expansions:
+                    if literal == literal.lower():  # Others can't occur in a lowercased path
+                        literals[literal] = literals.get(literal, 0) | bit
+
+        # A literal without '/' can only match inside one path segment
+        self._segment_literals = tuple((literal, bits) for literal, bits in literals.items() if '/' not in literal)
+        self._path_literals = tuple((literal, bits) for literal, bits in literals.items() if '/' in literal)
+        self._extensions = extensions
+        self._extension_length = max(map(len, extensions), default=0)
+        self._remaining = tuple(remaining)
+        self._combined = re.compile('|'.join(f'(?:{regex.pattern})' for regex, _ in remaining)) if remaining else None
+        self._mask_contexts: Dict[int, FrozenSet[ContextType]] = {}
+
+    def _segment_mask(self, segment: str) -> int:
+        """Patterns matched by the slash-free literals and extensions within one path segment."""
+        mask = 0
+        for literal, bits in self._segment_literals:
+            if literal in segment:
+                mask |= bits
+
+        extensions = self._extensions
+        dot = segment.find('.')
+        while dot != -1:
+            suffix = segment[dot + 1:dot + 1 + self._extension_length]
+            for end in range(1, len(suffix) + 1):
+                mask |= extensions.get(suffix[:end], 0)
+            dot = segment.find('.', dot + 1)
+        return mask
+
+    def mask(self, file_path: str, segments: Optional[Dict[str, int]] = None) -> int:
+        """
+        Bitmask of the patterns (in FILE_PATTERNS order) that match ``file_path``.
+
+        Args:
+            file_path: Path to classify
+            segments: Memo of segment masks to share across paths (directory
+                names repeat a lot within a diff)
+        """
+        path = file_path.lower()
+        mask = 0
+        for segment in path.split('/'):
+            if segments is None:
+                mask |= self._segment_mask(segment)
+                continue
+            segment_mask = segments.get(segment)
+            if segment_mask is None:
+                segment_mask = segments[segment] = self._segment_mask(segment)
+            mask |= segment_mask
+
+        for literal, bits in self._path_literals:
+            if literal in path:
+                mask |= bits
+        if self._combined is not None and self._combined.search(path):
+            for regex, bits in self._remaining:
+                if not mask & bits and regex.search(path):
+                    mask |= bits
+        return mask
+
+    def shape(self, file_path: str) -> str:
+        """Cache key of a path: paths with the same shape match the same patterns."""
+        path = file_path.lower()
+        return _DIGIT_RUN.sub('00', path) if self.shapes_collapse_digits else path
+
+    def cached_mask(self, file_path: str, segments: Optional[Dict[str, int]] = None) -> int:
+        """mask() through the shape cache, when there is one."""
+        if self.cache is None:
+            return self.mask(file_path, segments)
+        shape = self.shape(file_path)
+        mask = self.cache.get(shape)
+        if mask is None:
+            mask = self.mask(shape, segments)  # Same patterns match the shape as the path
+            self.cache.put(shape, mask)
+        return mask
+
+    def contexts_for_mask(self, mask: int) -> FrozenSet[ContextType]:
+        """Union of the contexts of the patterns in ``mask``."""
+        contexts = self._mask_contexts.get(mask)
+        if contexts is None:
+            contexts = frozenset(
+                context
+                for index, pattern_contexts in enumerate(self._pattern_contexts)
+                if mask >> index & 1
+                for context in pattern_contexts
+            )
+            self._mask_contexts[mask] = contexts
+        return contexts
+
+    def contexts(self, file_paths: Iterable[str]) -> Set[ContextType]:
+        """Union of the contexts of all ``file_paths``."""
+        mask = 0
+        segments: Dict[str, int] = {}
+        for file_path in file_paths:
+            mask |= self.cached_mask(file_path, segments)
+        return set(self.contexts_for_mask(mask))
+
+    def classify(self, file_paths: Iterable[str]) -> FileClassification:
+        """Contexts of each path and of all of them together, in one pass."""
+        per_path = {}
+        total = 0
+        segments: Dict[str, int] = {}
+        for file_path in file_paths:
+            mask = self.cached_mask(file_path, segments)
+            total |= mask
+            per_path[file_path] = self.contexts_for_mask(mask)
+        return FileClassification(per_path=per_path, contexts=set(self.contexts_for_mask(total)))
 
 
 class ContextInferenceEngine:
@@ -350,6 +947,65 @@ class ContextInferenceEngine:
         ],
     }
 
+    _file_classifier: Optional[FilePathClassifier] = None
+    # Classification of path shapes seen before (see load_path_cache/save_path_cache)
+    path_cache = PathShapeCache()
+
+    @classmethod
+    def file_classifier(cls) -> FilePathClassifier:
+        """Classifier compiled from FILE_PATTERNS (rebuilt if FILE_PATTERNS is replaced)."""
+        classifier = cls._file_classifier
+        if classifier is None or classifier.patterns is not cls.FILE_PATTERNS \
+                or classifier.cache is not cls.path_cache:
+            classifier = cls._file_classifier = FilePathClassifier(cls.FILE_PATTERNS, cache=cls.path_cache)
+        return classifier
+
+    @classmethod
+    def load_path_cache(cls, path: Path) -> int:
+        """Load path shape classifications saved by save_path_cache(); returns the number loaded."""
+        cls.file_classifier()  # Binds the cache to the current patterns
+        return cls.path_cache.load(path)
+
+    @classmethod
+    def save_path_cache(cls, path: Path) -> bool:
+        """Persist the path shape cache (if it changed) so later processes skip known shapes."""
+        return cls.path_cache.save(path)
+
+    @classmethod
+    def classify_files(cls, file_paths: Iterable[str]) -> FileClassification:
+        """
+        Classify many file paths (e.g. every file in a large diff) in one pass.
+
+        Returns:
+            FileClassification with each path's contexts and their union.
+            Only FILE_PATTERNS contexts: the always-on core sections that
+            infer_contexts() adds are not included.
+        """
+        return cls.file_classifier().classify(file_paths)
+
+    # Always-on sections, first in every budget
+    CORE_CONTEXTS = (ContextType.CORE_PRINCIPLES, ContextType.PERSONALITY)
+
+    @classmethod
+    def operation_contexts(cls, operation: str) -> Set[ContextType]:
+        """Contexts of the OPERATION_PATTERNS keywords in ``operation``"""
+        contexts = set()
+        op_upper = operation.upper()
+        for op_keyword in cls.OPERATION_PATTERNS.keys():
+            if op_keyword in op_upper:
+                contexts.update(cls.OPERATION_PATTERNS[op_keyword])
+        return contexts
+
+    @classmethod
+    def keyword_contexts(cls, text: str) -> Set[ContextType]:
+        """Contexts of the KEYWORD_PATTERNS found in ``text``"""
+        contexts = set()
+        text_lower = text.lower()
+        for pattern, context_types in cls.KEYWORD_PATTERNS.items():
+            if re.search(pattern, text_lower):
+                contexts.update(context_types)
+        return contexts
+
     @classmethod
     def infer_contexts(cls,
                       file_paths: Optional[List[str]] = None,
@@ -361,29 +1017,43 @@ class ContextInferenceEngine:
         contexts = set()
 
         # ALWAYS include core sections
-        contexts.add(ContextType.CORE_PRINCIPLES)
-        contexts.add(ContextType.PERSONALITY)
+        contexts.update(cls.CORE_CONTEXTS)
 
         # Analyze file paths
         if file_paths:
-            for file_path in file_paths:
-                file_lower = file_path.lower()
-                for pattern, context_types in cls.FILE_PATTERNS.items():
-                    if re.search(pattern, file_lower):
-                        contexts.update(context_types)
+            contexts.update(cls.file_classifier().contexts(file_paths))
 
         # Analyze operation
         if operation:
-            op_upper = operation.upper()
-            for op_keyword in cls.OPERATION_PATTERNS.keys():
-                if op_keyword in op_upper:
-                    contexts.update(cls.OPERATION_PATTERNS[op_keyword])
+            contexts.update(cls.operation_contexts(operation))
 
         # Analyze description for keywords
         if description:
-            desc_lower = description.lower()
-            for pattern, context_types in cls.KEYWORD_PATTERNS.items():
-                if re.search(pattern, desc_lower):
-                    contexts.update(context_types)
+            contexts.update(cls.keyword_contexts(description))
 
         return contexts
+
+    @classmethod
+    def prioritize_contexts(cls,
+                            file_paths: Optional[List[str]] = None,
+                            operation: Optional[str] = None,
+                            description: Optional[str] = None,
+                            session_text: Optional[str] = None) -> List[ContextType]:
+        """
+        The contexts of infer_contexts(), most important first, for filling a token budget.
+
+        Order: core sections, then sections the session's constraints and
+        decisions point at (``session_text``), then file-derived,
+        operation-derived and keyword-derived ones. Each context appears once,
+        at its highest tier; ties keep ContextType order.
+        """
+        files = cls.file_classifier().contexts(file_paths) if file_paths else set()
+        operations = cls.operation_contexts(operation) if operation else set()
+        keywords = cls.keyword_contexts(description) if description else set()
+        inferred = set(cls.CORE_CONTEXTS) | files | operations | keywords
+        session = cls.keyword_contexts(session_text) & inferred if session_text else set()
+
+        ordered = list(cls.CORE_CONTEXTS)
+        for tier in (session, files, operations, keywords):
+            ordered.extend(context for context in ContextType if context in tier and context not in ordered)
+        return ordered
@@ -0,0 +1,271 @@
+"""
+HTTP transport and pre-fork multi-worker mode.
+
+Following Platform Builder: One shared server per team, not one per editor window.
+Following Site Reliability Engineer: Supervised workers, graceful reloads, no dropped requests.
+
+``sensei-mcp --transport streamable-http`` serves MCP over HTTP at ``/mcp``
+(``--transport sse`` serves the older SSE transport at ``/sse``), so many
+clients can share one server instead of each spawning its own.
+
+With ``--workers N`` the server pre-forks. The master process loads the
+shared read-only state once (parsed skills and personas, the BM25 or
+semantic index, the rulebook with its section summaries, the file path
+classifier), moves it out of the garbage collector's reach (gc.freeze(), so
+collections don't write to those pages) and forks N workers that inherit it
+copy-on-write, all accepting connections on one listening socket. Workers
+serve MCP in stateless mode, since consecutive requests of a client may
+reach different workers; session memory is on disk and already safe across
+processes (advisory locks + rebase).
+
+Signals to the master:
+- SIGHUP: graceful reload. Skills and rulebook are loaded again (the persona
+  snapshot is reused if skills are unchanged), a new generation of workers
+  is forked, and the previous workers finish in-flight requests and exit.
+  If loading fails, the running workers are kept.
+- SIGTERM / SIGINT: graceful shutdown.
+A worker that exits unexpectedly is replaced.
+"""
+
+import asyncio
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Callable, Dict, Optional, Set
+
+from mcp.server.fastmcp import FastMCP
+
+
+# Seconds in-flight requests get to finish when workers are stopped or replaced
+GRACEFUL_TIMEOUT = 30.0
+# A worker dying sooner than this after start is restarted only after a pause
+MIN_WORKER_UPTIME = 1.0
+
+
+def preload_shared_state(retrieval: str = "bm25") -> Dict[str, int]:
+    """
+    Load everything workers read but never modify, so forks share it.
+
+    Args:
+        retrieval: Persona retrieval mode; its index is built up front
+
+    Returns:
+        Counts of what was loaded (personas, rulebook sections)
+    """
+    from .engine import ContextInferenceEngine
+    from .server import persona_registry, rulebook
+
+    personas = persona_registry.get_all()
+    if retrieval == "semantic":
+        from .personas.semantic import semantic_available
+        if semantic_available():
+            persona_registry.semantic_index()
+    if retrieval != "keyword":
+        persona_registry.search_index()  # Also the fallback of semantic mode
+    sections = rulebook.preload()
+    ContextInferenceEngine.file_classifier()
+    return {"personas": len(personas), "sections": sections}
+
+
+def reload_shared_state(retrieval: str = "bm25") -> Dict[str, int]:
+    """Load skills and rulebook again (after edits) and drop responses rendered from the old ones."""
+    from .server import persona_registry, query_analyses, response_cache
+
+    persona_registry.reload()
+    query_analyses.clear()
+    response_cache.clear()
+    return preload_shared_state(retrieval)
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Listening socket the master binds once and every worker accepts on."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def http_app(mcp: FastMCP, transport: str):
+    """ASGI app of the MCP server for a transport ("streamable-http" or "sse")."""
+    if transport == "sse":
+        return mcp.sse_app()
+    return mcp.streamable_http_app()
+
+
+def serve_worker(app, sock: socket.socket, log_level: str = "info",
+                 on_exit: Optional[Callable[[], None]] = None):
+    """
+    Serve an ASGI app on an already bound socket until SIGTERM/SIGINT.
+
+    Args:
+        app: ASGI app (http_app()); not started yet in this process
+        sock: Listening socket (shared with the other workers)
+        log_level: uvicorn log level
+        on_exit: Called after the last request finished (e.g. to flush sessions)
+    """
+    import uvicorn
+
+    config = uvicorn.Config(
+        app,
+        log_level=log_level,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+    )
+    try:
+        asyncio.run(uvicorn.Server(config).serve(sockets=[sock]))
+    finally:
+        if on_exit is not None:
+            on_exit()
+
+
+class PreforkServer:
+    """Master process: forks workers sharing preloaded state and supervises them."""
+
+    def __init__(self, mcp: FastMCP, sock: socket.socket, workers: int,
+                 reload: Callable[[], object], on_exit: Optional[Callable[[], None]] = None,
+                 transport: str = "streamable-http"):
+        """
+        Args:
+            mcp: The FastMCP server (configured, tools registered)
+            sock: Bound listening socket
+            workers: Worker processes per generation
+            reload: Reloads the shared state in the master on SIGHUP
+            on_exit: Run in each worker when it stops
+            transport: "streamable-http" (stateless) or "sse"
+        """
+        if transport == "sse" and workers > 1:
+            raise ValueError("SSE sessions are bound to one process; use streamable-http for several workers")
+        if transport == "streamable-http":
+            mcp.settings.stateless_http = True  # A client's requests may reach any worker
+        self.mcp = mcp
+        self.sock = sock
+        self.workers = workers
+        self.reload = reload
+        self.on_exit = on_exit
+        self.transport = transport
+        self.generation = 0
+        self._app = None
+        self._current: Dict[int, float] = {}    # Current generation: pid → start time
+        self._retiring: Dict[int, float] = {}   # Replaced workers: pid → kill deadline
+        self._reload_requested = False
+        self._stopping = False
+
+    def _spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            # Worker: uvicorn installs its own SIGTERM/SIGINT handlers; HUP is for the master
+            code = 0
+            try:
+                for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+                    signal.signal(signum, signal.SIG_DFL)
+                signal.signal(signal.SIGHUP, signal.SIG_IGN)
+                serve_worker(self._app, self.sock, self.mcp.settings.log_level.lower(), self.on_exit)
+            except BaseException as e:
+                print(f"Worker {os.getpid()} failed: {e}", file=sys.stderr)
+                code = 1
+            finally:
+                sys.stderr.flush()
+                os._exit(code)
+        self._current[pid] = time.monotonic()
+        return pid
+
+    def _spawn_generation(self):
+        self.generation += 1
+        # Built (not started) here, so the app and the HTTP stack are shared too
+        import uvicorn  # noqa: F401
+        self._app = http_app(self.mcp, self.transport)
+        gc.freeze()  # Preloaded objects stay out of the children's collections
+        for _ in range(self.workers):
+            self._spawn()
+
+    def _reap(self):
+        """Collect exited workers; replace current-generation workers that died."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self._retiring.pop(pid, None)
+            started = self._current.pop(pid, None)
+            if started is None or self._stopping:
+                continue
+            print(f"Worker {pid} exited unexpectedly (status {status}); restarting", file=sys.stderr)
+            if time.monotonic() - started < MIN_WORKER_UPTIME:
+                time.sleep(MIN_WORKER_UPTIME)  # Don't spin on a worker that can't start
+            self._spawn()
+
+    def _retire(self, pids, deadline: float):
+        for pid in pids:
+            self._retiring[pid] = deadline
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _kill_overdue(self):
+        now = time.monotonic()
+        for pid, deadline in list(self._retiring.items()):
+            if now >= deadline:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+    def _do_reload(self):
+        self._reload_requested = False
+        try:
+            gc.unfreeze()
+            self.reload()
+        except Exception as e:
+            print(f"Reload failed, keeping the running workers: {e}", file=sys.stderr)
+            gc.freeze()
+            return
+        previous = list(self._current)
+        self._current = {}
+        self._spawn_generation()
+        self._retire(previous, time.monotonic() + GRACEFUL_TIMEOUT)
+        print(f"Reloaded: generation {self.generation} with {self.workers} worker(s)", file=sys.stderr)
+
+    def request_reload(self, *_):
+        self._reload_requested = True
+
+    def request_stop(self, *_):
+        self._stopping = True
+
+    def run(self, poll_interval: float = 0.2):
+        """Fork the workers and supervise them until SIGTERM/SIGINT."""
+        signal.signal(signal.SIGHUP, self.request_reload)
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+        self._spawn_generation()
+        try:
+            while not self._stopping:
+                self._reap()
+                if self._reload_requested:
+                    self._do_reload()
+                self._kill_overdue()
+                time.sleep(poll_interval)
+        finally:
+            self._stopping = True
+            self._retire(list(self._current), time.monotonic() + GRACEFUL_TIMEOUT)
+            self._current = {}
+            self._wait_for_workers()
+
+    def _wait_for_workers(self):
+        while self._retiring:
+            self._reap()
+            self._kill_overdue()
+            if self._retiring:
+                time.sleep(0.05)
+
+    @property
+    def worker_pids(self) -> Set[int]:
+        """Workers of the current generation."""
+        return set(self._current)
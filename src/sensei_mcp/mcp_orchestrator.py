@@ -10,10 +10,13 @@ Design Philosophy:
 - Enable compound intelligence from Sensei + external MCPs
 """
 
+import copy
 import json
 from typing import List, Dict, Optional, Set
 from enum import Enum
 
+from .query_analysis import QueryAnalysis, QueryAnalysisCache
+
 
 class MCPServer(Enum):
     """Available MCP servers for orchestration."""
@@ -736,9 +739,73 @@ class MCPOrchestrator:
         }
     }
 
-    def __init__(self):
-        """Initialize the MCP orchestrator."""
-        pass
+    # Keyword patterns for workflow template suggestions
+    WORKFLOW_KEYWORDS = {
+        WorkflowTemplate.AUTH_SECURITY_REVIEW: [
+            "auth", "authentication", "login", "security", "oauth", "jwt"
+        ],
+        WorkflowTemplate.PERFORMANCE_DEBUG: [
+            "performance", "slow", "speed", "optimize", "lcp", "cls"
+        ],
+        WorkflowTemplate.COST_OPTIMIZATION: [
+            "cost", "pricing", "expensive", "optimize", "cheaper"
+        ],
+        WorkflowTemplate.TECH_DUE_DILIGENCE: [
+            "should we", "evaluate", "adopt", "use", "technology", "library"
+        ],
+        WorkflowTemplate.INCIDENT_POSTMORTEM: [
+            "outage", "incident", "down", "failure", "postmortem"
+        ],
+        WorkflowTemplate.ACCESSIBILITY_AUDIT: [
+            "accessibility", "wcag", "a11y", "screen reader"
+        ],
+        WorkflowTemplate.API_DESIGN_REVIEW: [
+            "api", "endpoint", "rest", "graphql", "design"
+        ],
+        WorkflowTemplate.ARCHITECTURE_REFACTORING: [
+            "refactor", "refactoring", "architecture", "pattern", "clean up"
+        ],
+        WorkflowTemplate.CODE_PATTERN_ENFORCEMENT: [
+            "enforce", "pattern", "violation", "consistency", "standard"
+        ],
+        WorkflowTemplate.DEPENDENCY_INJECTION_MIGRATION: [
+            "dependency injection", "di", "solid", "testability", "constructor"
+        ],
+        WorkflowTemplate.PR_SECURITY_REVIEW: [
+            "pr", "pull request", "code review", "review pr", "pr #"
+        ],
+        WorkflowTemplate.COMMIT_PATTERN_ANALYSIS: [
+            "commit", "commits", "history", "git log", "recent changes"
+        ],
+        WorkflowTemplate.ISSUE_TRIAGE: [
+            "issue", "bug", "triage", "priority", "categorize"
+        ]
+    }
+
+    def __init__(self, analyses: Optional[QueryAnalysisCache] = None):
+        """
+        Initialize the MCP orchestrator.
+
+        Args:
+            analyses: Query analysis cache to share with the SkillOrchestrator
+                (a private one by default)
+        """
+        self.analyses = analyses if analyses is not None else QueryAnalysisCache()
+
+    def _analyze(self, query: str) -> QueryAnalysis:
+        """Cached query analysis with MCP and workflow keyword matches filled in."""
+        analysis = self.analyses.get(query)
+        if analysis.mcp_keywords is None or analysis.workflow_templates is None:
+            text = analysis.normalized
+            analysis.mcp_keywords = {
+                mcp.value: tuple(keyword for keyword in patterns["keywords"] if keyword in text)
+                for mcp, patterns in self.MCP_PATTERNS.items()
+            }
+            analysis.workflow_templates = tuple(
+                template.value for template, keywords in self.WORKFLOW_KEYWORDS.items()
+                if any(kw in text for kw in keywords)
+            )
+        return analysis
 
     def suggest_mcps_for_query(
         self,
@@ -758,7 +825,7 @@ class MCPOrchestrator:
             Dict with suggested MCPs, rationale, and workflow suggestions
         """
         suggested_mcps = []
-        query_lower = query.lower()
+        analysis = self._analyze(query)
 
         # Always include Sensei
         suggested_mcps.append({
@@ -774,11 +841,10 @@ class MCPOrchestrator:
             score = 0.0
             matched_keywords = []
 
-            # Keyword matching
-            for keyword in patterns["keywords"]:
-                if keyword in query_lower:
-                    score += 0.2
-                    matched_keywords.append(keyword)
+            # Keyword matching (scanned once per query, see _analyze)
+            for keyword in analysis.mcp_keywords[mcp.value]:
+                score += 0.2
+                matched_keywords.append(keyword)
 
             # Context relevance
             if context.upper() in patterns["contexts"]:
@@ -836,68 +902,24 @@ class MCPOrchestrator:
     ) -> List[Dict]:
         """Suggest pre-built workflow templates that match the query."""
         matching_workflows = []
-        query_lower = query.lower()
+        analysis = self._analyze(query)
 
-        # Workflow keyword patterns
-        workflow_keywords = {
-            WorkflowTemplate.AUTH_SECURITY_REVIEW: [
-                "auth", "authentication", "login", "security", "oauth", "jwt"
-            ],
-            WorkflowTemplate.PERFORMANCE_DEBUG: [
-                "performance", "slow", "speed", "optimize", "lcp", "cls"
-            ],
-            WorkflowTemplate.COST_OPTIMIZATION: [
-                "cost", "pricing", "expensive", "optimize", "cheaper"
-            ],
-            WorkflowTemplate.TECH_DUE_DILIGENCE: [
-                "should we", "evaluate", "adopt", "use", "technology", "library"
-            ],
-            WorkflowTemplate.INCIDENT_POSTMORTEM: [
-                "outage", "incident", "down", "failure", "postmortem"
-            ],
-            WorkflowTemplate.ACCESSIBILITY_AUDIT: [
-                "accessibility", "wcag", "a11y", "screen reader"
-            ],
-            WorkflowTemplate.API_DESIGN_REVIEW: [
-                "api", "endpoint", "rest", "graphql", "design"
-            ],
-            WorkflowTemplate.ARCHITECTURE_REFACTORING: [
-                "refactor", "refactoring", "architecture", "pattern", "clean up"
-            ],
-            WorkflowTemplate.CODE_PATTERN_ENFORCEMENT: [
-                "enforce", "pattern", "violation", "consistency", "standard"
-            ],
-            WorkflowTemplate.DEPENDENCY_INJECTION_MIGRATION: [
-                "dependency injection", "di", "solid", "testability", "constructor"
-            ],
-            WorkflowTemplate.PR_SECURITY_REVIEW: [
-                "pr", "pull request", "code review", "review pr", "pr #"
-            ],
-            WorkflowTemplate.COMMIT_PATTERN_ANALYSIS: [
-                "commit", "commits", "history", "git log", "recent changes"
-            ],
-            WorkflowTemplate.ISSUE_TRIAGE: [
-                "issue", "bug", "triage", "priority", "categorize"
-            ]
-        }
-
-        for template, keywords in workflow_keywords.items():
-            if any(kw in query_lower for kw in keywords):
-                template_info = self.WORKFLOW_TEMPLATES[template]
+        for template in map(WorkflowTemplate, analysis.workflow_templates):
+            template_info = self.WORKFLOW_TEMPLATES[template]
 
-                # Check if suggested MCPs match workflow requirements
-                suggested_mcp_names = [s["mcp"] for s in suggested_mcps]
-                required_mcps = [m.value for m in template_info["mcps"]]
-                coverage = len(set(suggested_mcp_names) & set(required_mcps))
+            # Check if suggested MCPs match workflow requirements
+            suggested_mcp_names = [s["mcp"] for s in suggested_mcps]
+            required_mcps = [m.value for m in template_info["mcps"]]
+            coverage = len(set(suggested_mcp_names) & set(required_mcps))
 
-                matching_workflows.append({
-                    "template": template.value,
-                    "name": template_info["name"],
-                    "description": template_info["description"],
-                    "mcp_coverage": f"{coverage}/{len(required_mcps)}",
-                    "cost_estimate": template_info["cost_estimate"],
-                    "time_estimate": template_info["time_estimate"]
-                })
+            matching_workflows.append({
+                "template": template.value,
+                "name": template_info["name"],
+                "description": template_info["description"],
+                "mcp_coverage": f"{coverage}/{len(required_mcps)}",
+                "cost_estimate": template_info["cost_estimate"],
+                "time_estimate": template_info["time_estimate"]
+            })
 
         return matching_workflows[:3]  # Top 3 matches
 
@@ -945,7 +967,8 @@ class MCPOrchestrator:
                 "available_templates": [t.value for t in WorkflowTemplate]
             }
 
-        template = self.WORKFLOW_TEMPLATES[template_enum].copy()
+        # Deep copy: substitution must not leak into the shared template (or later calls)
+        template = copy.deepcopy(self.WORKFLOW_TEMPLATES[template_enum])
 
         # Substitute parameters in steps if provided
         if parameters:
@@ -24,6 +24,8 @@ from pathlib import Path
 from .context_detector import ContextDetector, QueryContext
 from .personas.registry import PersonaRegistry
 from .personas.base import BasePersona
+from .personas.semantic import semantic_available
+from .query_analysis import QueryAnalysis, QueryAnalysisCache
 
 
 class SkillOrchestrator:
@@ -46,15 +48,52 @@ class SkillOrchestrator:
         QueryContext.GENERAL: ['snarky-senior-engineer', 'pragmatic-architect', 'product-engineering-lead'],
     }
 
-    def __init__(self, registry: PersonaRegistry):
+    # BM25 candidates must score at least this, and at least this fraction
+    # of the best candidate, to join the context personas
+    MIN_RETRIEVAL_SCORE = 2.0
+    RELATIVE_RETRIEVAL_CUTOFF = 0.5
+
+    # Semantic candidates: minimum cosine similarity, and fraction of the best candidate
+    MIN_SEMANTIC_SCORE = 0.3
+    RELATIVE_SEMANTIC_CUTOFF = 0.85
+
+    def __init__(
+        self,
+        registry: PersonaRegistry,
+        retrieval: str = 'bm25',
+        analyses: Optional[QueryAnalysisCache] = None
+    ):
         """
         Initialize the orchestrator.
 
         Args:
             registry: PersonaRegistry instance with all loaded personas
+            retrieval: How auto mode ranks personas beyond the context table:
+                'bm25' (SKILL.md content), 'keyword' (expertise keywords) or
+                'semantic' (embedding similarity; needs NumPy, else BM25 is used)
+            analyses: Query analysis cache to share with other consumers
+                (MCPOrchestrator, context hints); a private one by default
         """
         self.registry = registry
         self.detector = ContextDetector()
+        self.retrieval = retrieval
+        self.analyses = analyses if analyses is not None else QueryAnalysisCache()
+
+    def analyze(self, query: str) -> QueryAnalysis:
+        """
+        Cached analysis of the query, with contexts detected.
+
+        Args:
+            query: The user's query
+
+        Returns:
+            QueryAnalysis with contexts and primary_context filled in
+        """
+        analysis = self.analyses.get(query)
+        if analysis.primary_context is None:
+            analysis.contexts = tuple(self.detector.detect_contexts(query))
+            analysis.primary_context = self.detector.get_primary_context(query)
+        return analysis
 
     def select_personas(
         self,
@@ -91,11 +130,8 @@ class SkillOrchestrator:
 
         # Crisis mode: emergency team
         if mode == 'crisis':
-            return [
-                self.registry.get(name)
-                for name in self.CONTEXT_PERSONAS[QueryContext.CRISIS]
-                if self.registry.get(name)
-            ]
+            personas = (self.registry.get(name) for name in self.CONTEXT_PERSONAS[QueryContext.CRISIS])
+            return [persona for persona in personas if persona]
 
         # Full mode: all personas (expensive!)
         if mode == 'full':
@@ -103,30 +139,21 @@ class SkillOrchestrator:
             return list(all_personas.values())
 
         # Auto mode: intelligent selection
-        primary_context = self.detector.get_primary_context(query)
+        analysis = self.analyze(query)
+        primary_context = analysis.primary_context
 
         # Start with context-specific personas
         selected_names = self.CONTEXT_PERSONAS.get(primary_context, ['snarky-senior-engineer'])
-        personas = [self.registry.get(name) for name in selected_names if self.registry.get(name)]
-
-        # Add personas by relevance scoring (keyword matching)
-        all_personas = self.registry.get_all()
-        relevance_scores = []
-
-        for name, persona in all_personas.items():
-            if name not in selected_names:
-                score = persona.relevance_score(query)
-                if score > 0.2:  # Threshold for relevance
-                    relevance_scores.append((score, name, persona))
+        personas = [persona for persona in map(self.registry.get, selected_names) if persona]
 
-        # Sort by relevance and add top scorers
-        relevance_scores.sort(key=lambda x: x[0], reverse=True)
-
-        for score, name, persona in relevance_scores:
+        # Add top scorers by relevance: BM25 over skill content, embeddings, or expertise keywords
+        chosen = {p.name for p in personas}
+        for name, score in self._ranking(analysis):
             if len(personas) >= max_personas:
                 break
-            if name not in [p.name for p in personas]:
-                personas.append(persona)
+            if name not in chosen and name not in selected_names:
+                personas.append(self.registry.get(name))
+                chosen.add(name)
 
         # Always ensure Snarky is included (default voice)
         snarky = self.registry.get('snarky-senior-engineer')
@@ -135,6 +162,93 @@ class SkillOrchestrator:
 
         return personas[:max_personas]
 
+    def relevance_ranking(self, query: str) -> List[Tuple[str, float]]:
+        """
+        Personas relevant to the query beyond context detection, best first.
+
+        Returns:
+            (persona name, score) pairs above the relevance threshold
+        """
+        return self._ranking(self.analyses.get(query))
+
+    def _ranking(self, analysis: QueryAnalysis) -> List[Tuple[str, float]]:
+        """relevance_ranking(), memoized on the query analysis per retrieval mode."""
+        mode = 'semantic' if self._semantic() else ('keyword' if self.retrieval == 'keyword' else 'bm25')
+        ranked = analysis.persona_rankings.get(mode)
+        if ranked is None:
+            ranked = analysis.persona_rankings[mode] = tuple(self._rank(analysis, mode))
+        return list(ranked)
+
+    def _rank(self, analysis: QueryAnalysis, mode: str) -> List[Tuple[str, float]]:
+        if mode == 'keyword':
+            ranked = [
+                (name, score) for name, score in self.registry.relevance_scores(analysis.query).items()
+                if score > 0.2  # Threshold for relevance
+            ]
+            # Stable: ties keep registry order
+            return sorted(ranked, key=lambda x: x[1], reverse=True)
+
+        if mode == 'semantic':
+            ranked = self.registry.semantic_search(analysis.query)
+            return self._apply_semantic_cutoff(ranked) if ranked else []
+
+        ranked = self.registry.search_terms(analysis.tokens)
+        if not ranked:
+            return []
+        return self._apply_cutoff(ranked)
+
+    def relevance_ranking_batch(
+        self,
+        queries: List[str],
+        top_k: Optional[int] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        relevance_ranking() for many queries at once (e.g. CI scanning PR
+        descriptions).
+
+        Scores every query against every persona in one vectorized pass when
+        NumPy is installed; results are identical to relevance_ranking().
+
+        Args:
+            queries: Queries to rank
+            top_k: Keep at most this many personas per query
+
+        Returns:
+            One relevance_ranking(query)[:top_k] result per query, in query order
+        """
+        if self.retrieval == 'keyword':
+            rankings = []
+            for scores in self.registry.relevance_scores_batch(queries):
+                ranked = sorted(
+                    ((name, score) for name, score in scores.items() if score > 0.2),
+                    key=lambda x: x[1], reverse=True
+                )
+                rankings.append(ranked[:top_k] if top_k is not None else ranked)
+            return rankings
+
+        # The cutoffs are relative to the best score, so truncating first is safe
+        if self._semantic():
+            return [
+                self._apply_semantic_cutoff(ranked) if ranked else []
+                for ranked in self.registry.semantic_search_batch(queries, top_k)
+            ]
+        return [
+            self._apply_cutoff(ranked) if ranked else []
+            for ranked in self.registry.search_batch(queries, top_k)
+        ]
+
+    def _semantic(self) -> bool:
+        return self.retrieval == 'semantic' and semantic_available()
+
+    def _apply_semantic_cutoff(self, ranked: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
+        cutoff = max(self.MIN_SEMANTIC_SCORE, ranked[0][1] * self.RELATIVE_SEMANTIC_CUTOFF)
+        return [(name, score) for name, score in ranked if score >= cutoff]
+
+    def _apply_cutoff(self, ranked: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
+        """Keep BM25 candidates that are strong in absolute terms and relative to the best."""
+        cutoff = max(self.MIN_RETRIEVAL_SCORE, ranked[0][1] * self.RELATIVE_RETRIEVAL_CUTOFF)
+        return [(name, score) for name, score in ranked if score >= cutoff]
+
     def gather_perspectives(
         self,
         query: str,
@@ -306,8 +420,8 @@ class SkillOrchestrator:
         # 1. Select relevant personas
         personas = self.select_personas(query, mode, specific_personas)
 
-        # 2. Detect context
-        primary_context = self.detector.get_primary_context(query)
+        # 2. Detect context (cached analysis: auto selection already scanned this query)
+        primary_context = self.analyze(query).primary_context
 
         # 3. Gather perspectives (each persona analyzes with session context)
         perspectives = self.gather_perspectives(query, personas, session_context)
@@ -6,8 +6,13 @@ Following Pragmatic Architect's advice: Abstract base class for evolution.
 """
 
 from abc import ABC, abstractmethod
+from pathlib import Path
 from typing import List, Dict, Optional
 
+from .content import (
+    SkillContentCache, SkillSection, decode_skill_text, index_skill_sections, read_skill_bytes
+)
+
 
 class BasePersona(ABC):
     """
@@ -17,19 +22,24 @@ class BasePersona(ABC):
     Pragmatic Architect) with specific expertise, principles, and perspective.
     """
 
-    def __init__(self, skill_data: Dict):
+    def __init__(self, skill_data: Dict, content_cache: Optional[SkillContentCache] = None):
         """
         Initialize persona from parsed skill data.
 
         Args:
-            skill_data: Dict containing parsed SKILL.md content
+            skill_data: Dict containing parsed SKILL.md content. Without
+                'full_content' the body is read from 'source_path' on demand.
+            content_cache: Shared LRU for lazily read bodies
         """
         self._skill_data = skill_data
         self._metadata = skill_data.get('metadata', {})
         self._principles = skill_data.get('principles', [])
         self._personality = skill_data.get('personality', '')
         self._expertise = skill_data.get('expertise', [])
-        self._full_content = skill_data.get('full_content', '')
+        self._full_content = skill_data.get('full_content')
+        self._source_path = skill_data.get('source_path')
+        self._sections = [SkillSection(*section) for section in skill_data.get('sections', ())] or None
+        self._content_cache = content_cache
         # v0.4.0: Enhanced metadata
         self._examples = skill_data.get('examples', [])
         self._use_when = skill_data.get('use_when', '')
@@ -63,8 +73,64 @@ class BasePersona(ABC):
 
     @property
     def full_content(self) -> str:
-        """Full SKILL.md content for detailed analysis"""
-        return self._full_content
+        """Full SKILL.md content for detailed analysis (read on first use if not resident)"""
+        if self._full_content is not None:
+            return self._full_content
+        if not self._source_path:
+            return ''
+        if self._content_cache is not None:
+            return self._content_cache.get(Path(self._source_path))
+        return decode_skill_text(read_skill_bytes(Path(self._source_path)))
+
+    @property
+    def sections(self) -> List[SkillSection]:
+        """Numbered ``## N. Title`` sections of the SKILL.md, in file order"""
+        if self._sections is None:
+            self._sections = index_skill_sections(self._body_bytes())
+        return self._sections
+
+    def find_section(self, key: str) -> Optional[SkillSection]:
+        """
+        Look up a section by number ("4") or title ("APIs & Contracts", case-insensitive).
+
+        An exact title wins over a title that merely contains ``key``.
+        """
+        key = key.strip().rstrip('.')
+        if key.isdigit():
+            return next((s for s in self.sections if s.number == int(key)), None)
+        wanted = key.lower()
+        if not wanted:
+            return None
+        for section in self.sections:
+            if section.title.lower() == wanted:
+                return section
+        return next((s for s in self.sections if wanted in s.title.lower()), None)
+
+    def section_content(self, section: SkillSection) -> str:
+        """
+        Text of one section, read by offset without loading the whole body.
+
+        If the file changed since it was indexed (the range no longer starts
+        at a section header) the sections are indexed again.
+        """
+        data = self._body_bytes(section.start, section.end)
+        if data.startswith(b'## '):
+            try:
+                return decode_skill_text(data)
+            except UnicodeDecodeError:
+                pass  # Range now splits a character
+        self._sections = index_skill_sections(self._body_bytes())
+        current = next((s for s in self._sections if s.number == section.number), None)
+        if current is None:
+            return ''
+        return decode_skill_text(self._body_bytes(current.start, current.end))
+
+    def _body_bytes(self, start: int = 0, end: int = -1) -> bytes:
+        """Raw SKILL.md bytes (from the file, or the resident content)"""
+        if self._full_content is None and self._source_path:
+            return read_skill_bytes(Path(self._source_path), start, end)
+        data = (self._full_content or '').encode('utf-8')
+        return data[start:end if end >= 0 else len(data)]
 
     # v0.4.0: Enhanced metadata properties
     @property
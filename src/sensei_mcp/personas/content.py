@@ -0,0 +1,145 @@
+"""
+Lazy SKILL.md body loading.
+
+Following Performance Engineer: Keep metadata resident, page bodies in on demand.
+
+Personas keep only parsed metadata in memory. The full SKILL.md body is read
+through a read-only memory map when first needed (get_persona_content,
+consult_skill) and kept in a small LRU, so a long-running server with large
+skill libraries holds at most ``max_entries`` bodies.
+
+Bodies can also be delivered in parts: index_skill_sections() records the
+byte range of each numbered ``## N. Title`` section when a skill is loaded,
+so a single section is an offset read, and paginate() splits long text into
+pages at heading or paragraph boundaries.
+"""
+
+import mmap
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Same headers the loader takes expertise areas from ("## 3.1 ..." subsections stay in section 3)
+_SECTION_HEADER = re.compile(rb'^## (\d+)\.[ \t]+([^\r\n]+)', re.MULTILINE)
+_PAGE_BREAKS = ('\n## ', '\n### ', '\n\n', '\n')
+
+
+class SkillSection(NamedTuple):
+    """A numbered ``## N. Title`` section and its byte range in the SKILL.md file."""
+    number: int
+    title: str
+    start: int
+    end: int
+
+
+def read_skill_bytes(path: Path, start: int = 0, end: int = -1) -> bytes:
+    """
+    Read ``path[start:end]`` through a read-only memory map.
+
+    Only the touched pages are read, so offset reads of large skill files
+    don't load the whole file.
+    """
+    with open(path, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return mapped[start:end if end >= 0 else len(mapped)]
+        except ValueError:
+            return b""  # Empty files can't be mapped
+
+
+def decode_skill_text(data: bytes) -> str:
+    """Decode skill file bytes the way Path.read_text() would (universal newlines)."""
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def index_skill_sections(data: bytes) -> List[SkillSection]:
+    """
+    Byte ranges of the numbered sections of a SKILL.md file.
+
+    A section runs from its header to the next numbered header (or the end
+    of the file). Text before the first numbered header is not a section.
+    """
+    headers = list(_SECTION_HEADER.finditer(data))
+    return [
+        SkillSection(
+            int(match.group(1)),
+            match.group(2).decode('utf-8', 'replace').strip(),
+            match.start(),
+            headers[i + 1].start() if i + 1 < len(headers) else len(data),
+        )
+        for i, match in enumerate(headers)
+    ]
+
+
+def paginate(text: str, offset: int, max_chars: int) -> Tuple[str, Optional[int]]:
+    """
+    One page of ``text`` starting at ``offset``.
+
+    Pages end at the last section heading, subsection heading, paragraph or
+    line break in the second half of the page, in that order of preference
+    (a hard cut at ``max_chars`` only if there is none).
+
+    Returns:
+        (page, offset of the next page or None on the last page)
+    """
+    end = offset + max_chars
+    if end >= len(text):
+        return text[offset:], None
+    for separator in _PAGE_BREAKS:
+        cut = text.rfind(separator, offset + max_chars // 2, end)
+        if cut > offset:
+            end = cut + 1
+            break
+    return text[offset:end], end
+
+
+class SkillContentCache:
+    """LRU of decoded SKILL.md bodies keyed by path."""
+
+    def __init__(self, max_entries: int = 16):
+        """
+        Args:
+            max_entries: Bodies kept in memory (0 disables caching)
+        """
+        self.max_entries = max_entries
+        self._bodies: "OrderedDict[Path, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path) -> str:
+        """Full decoded content of a skill file (newlines normalized like read_text())."""
+        with self._lock:
+            body = self._bodies.get(path)
+            if body is not None:
+                self.hits += 1
+                self._bodies.move_to_end(path)
+                return body
+            self.misses += 1
+
+        body = decode_skill_text(read_skill_bytes(path))
+        if self.max_entries > 0:
+            with self._lock:
+                self._bodies[path] = body
+                while len(self._bodies) > self.max_entries:
+                    self._bodies.popitem(last=False)
+        return body
+
+    def clear(self):
+        with self._lock:
+            self._bodies.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Cache counters and occupancy."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._bodies),
+            'max_entries': self.max_entries,
+            'bytes': sum(len(body) for body in self._bodies.values()),
+        }
@@ -6,10 +6,47 @@ Following Platform Builder: Validation and clear error messages.
 """
 
 import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import yaml
 
+from .content import decode_skill_text, index_skill_sections
+
+
+# libyaml's C parser is ~10x faster than the pure-Python one when installed
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@dataclass
+class SkillLoadReport:
+    """Per-file timings and failures from SkillLoader.load_all_skills()."""
+    timings: Dict[str, float] = field(default_factory=dict)  # file name → seconds
+    errors: Dict[str, str] = field(default_factory=dict)     # file name → error message
+    total_seconds: float = 0.0
+
+    def slowest(self, count: int = 5) -> List[Tuple[str, float]]:
+        """The ``count`` slowest files as (file name, seconds), slowest first."""
+        return sorted(self.timings.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def format_errors(self) -> str:
+        """One line per failed file."""
+        return "\n".join(f"  - {name}: {error}" for name, error in self.errors.items())
+
+
+def _load_skill_timed(skill_path: Path, include_content: bool = True
+                      ) -> Tuple[Optional[Dict], Optional[str], float]:
+    """Load one skill for a pool worker: (skill data or None, error or None, seconds)."""
+    start = time.perf_counter()
+    try:
+        skill_data = SkillLoader.load_skill(skill_path, include_content)
+    except Exception as e:
+        return None, str(e) or type(e).__name__, time.perf_counter() - start
+    return skill_data, None, time.perf_counter() - start
+
 
 class SkillLoader:
     """
@@ -34,15 +71,19 @@ class SkillLoader:
     """
 
     @staticmethod
-    def load_skill(skill_path: Path) -> Dict:
+    def load_skill(skill_path: Path, include_content: bool = True) -> Dict:
         """
         Parse a SKILL.md file and extract metadata + content.
 
         Args:
             skill_path: Path to the SKILL.md file
+            include_content: Keep the whole file as ``full_content``. Without it
+                only ``source_path`` is kept and the body is read on demand.
 
         Returns:
-            Dict with keys: metadata, principles, personality, expertise, full_content
+            Dict with keys: metadata, principles, personality, expertise,
+            sections (number, title, start byte, end byte), source_path and
+            (unless include_content is False) full_content
 
         Raises:
             FileNotFoundError: If skill file doesn't exist
@@ -52,7 +93,8 @@ class SkillLoader:
             raise FileNotFoundError(f"Skill file not found: {skill_path}")
 
         try:
-            content = skill_path.read_text(encoding='utf-8')
+            data = skill_path.read_bytes()
+            content = decode_skill_text(data)
         except Exception as e:
             raise ValueError(f"Failed to read skill file {skill_path}: {e}")
 
@@ -70,7 +112,7 @@ class SkillLoader:
         related = metadata.get('related', [])
         quick_tip = metadata.get('quick_tip', '')
 
-        return {
+        skill_data = {
             'metadata': metadata,
             'principles': principles,
             'personality': personality,
@@ -79,8 +121,12 @@ class SkillLoader:
             'use_when': use_when,  # v0.4.0: When to consult this persona
             'related': related,    # v0.4.0: Related persona names
             'quick_tip': quick_tip,  # v0.4.0: One-line expertise summary
-            'full_content': content
+            'sections': [tuple(section) for section in index_skill_sections(data)],
+            'source_path': str(skill_path)
         }
+        if include_content:
+            skill_data['full_content'] = content
+        return skill_data
 
     @staticmethod
     def _extract_frontmatter(content: str, skill_path: Path) -> Dict:
@@ -94,7 +140,7 @@ class SkillLoader:
             )
 
         try:
-            metadata = yaml.safe_load(frontmatter_match.group(1))
+            metadata = yaml.load(frontmatter_match.group(1), Loader=_YAML_LOADER)
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML frontmatter in {skill_path}: {e}")
 
@@ -191,39 +237,68 @@ class SkillLoader:
         return expertise
 
     @staticmethod
-    def load_all_skills(skills_dir: Path) -> Dict[str, Dict]:
+    def load_all_skills(skills_dir: Path, workers: int = 1, use_processes: bool = False,
+                        report: Optional[SkillLoadReport] = None,
+                        include_content: bool = True) -> Dict[str, Dict]:
         """
         Load all SKILL.md files from a directory.
 
+        Files are parsed in name order (or fanned out over a pool, with results
+        still merged in name order), so the result is deterministic.
+
         Args:
             skills_dir: Directory containing SKILL.md files
+            workers: Parse files in a pool of this many workers (1 = serially)
+            use_processes: Use a process pool instead of a thread pool
+            report: Optional SkillLoadReport to fill with per-file timings and
+                errors. Without one, failures are summarized on stderr.
+            include_content: Keep each file's ``full_content`` (see load_skill)
 
         Returns:
             Dict mapping persona name to skill data
 
         Raises:
-            ValueError: If no skills found or if any skill is malformed
+            ValueError: If no skills found or if no skill could be loaded
         """
         if not skills_dir.exists():
             raise ValueError(f"Skills directory not found: {skills_dir}")
 
-        skills = {}
-        skill_files = list(skills_dir.glob('*.md'))
+        skill_files = sorted(skills_dir.glob('*.md'))
 
         if not skill_files:
             raise ValueError(f"No SKILL.md files found in {skills_dir}")
 
-        for skill_file in skill_files:
-            try:
-                skill_data = SkillLoader.load_skill(skill_file)
-                persona_name = skill_data['metadata']['name']
-                skills[persona_name] = skill_data
-            except Exception as e:
-                # Log error but continue loading other skills
-                print(f"Warning: Failed to load {skill_file.name}: {e}")
+        start = time.perf_counter()
+        if workers > 1 and len(skill_files) > 1:
+            pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            with pool_class(max_workers=workers) as pool:
+                results = list(pool.map(_load_skill_timed, skill_files,
+                                        [include_content] * len(skill_files)))
+        else:
+            results = [_load_skill_timed(skill_file, include_content) for skill_file in skill_files]
+
+        summarize_errors = report is None
+        report = report if report is not None else SkillLoadReport()
+
+        skills = {}
+        for skill_file, (skill_data, error, seconds) in zip(skill_files, results):
+            report.timings[skill_file.name] = seconds
+            if error is not None:
+                # Keep loading other skills; failures are reported together
+                report.errors[skill_file.name] = error
                 continue
+            skills[skill_data['metadata']['name']] = skill_data
+        report.total_seconds = time.perf_counter() - start
 
         if not skills:
-            raise ValueError(f"Failed to load any valid skills from {skills_dir}")
+            raise ValueError(
+                f"Failed to load any valid skills from {skills_dir}"
+                + (f":\n{report.format_errors()}" if report.errors else "")
+            )
+
+        if summarize_errors and report.errors:
+            # stdout is the MCP JSON-RPC channel
+            print(f"Warning: Failed to load {len(report.errors)} skill file(s):\n{report.format_errors()}",
+                  file=sys.stderr)
 
         return skills
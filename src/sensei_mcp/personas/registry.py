@@ -5,10 +5,17 @@ Following Pragmatic Architect: Lazy loading with caching.
 Following Platform Builder: Introspection and categorization.
 """
 
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from .base import BasePersona
+from .content import SkillContentCache, decode_skill_text, read_skill_bytes
 from .loader import SkillLoader
+from .retrieval import BM25Index, _numpy
+from .semantic import SemanticIndex, load_embedder
+from .snapshot import load_snapshot, skills_content_hash, write_snapshot
 
 
 class ConcretePersona(BasePersona):
@@ -20,8 +27,8 @@ class ConcretePersona(BasePersona):
     with actual LLM-based analysis using the skill content.
     """
 
-    def __init__(self, skill_data: Dict):
-        super().__init__(skill_data)
+    def __init__(self, skill_data: Dict, content_cache: Optional[SkillContentCache] = None):
+        super().__init__(skill_data, content_cache)
         self._category = skill_data.get('metadata', {}).get('category', self._infer_category())
 
     def _infer_category(self) -> str:
@@ -37,11 +44,31 @@ class ConcretePersona(BasePersona):
         return self._category
 
 
+@dataclass
+class _RegistryState:
+    """
+    One load of the skills directory: parsed skill data, the personas made
+    from it and the indexes over it. reload() builds a new one and publishes
+    it with a single assignment, so a concurrent call keeps working on one
+    consistent load.
+    """
+    skill_data: Dict[str, Dict]
+    expertise_index: Dict[str, List[Tuple[str, int]]]  # keyword → [(persona, occurrences)]
+    expertise_counts: Dict[str, int]                   # persona → expertise keywords
+    order: Dict[str, int]                              # persona → position in skill_data
+    personas: Dict[str, BasePersona] = field(default_factory=dict)
+    search_index: Optional[BM25Index] = None
+    semantic_index: Optional[SemanticIndex] = None
+
+
 class PersonaRegistry:
     """
     Registry for discovering and managing skill personas.
 
     Provides lazy loading, caching, and categorization of personas.
+    Thread-safe: the first load and index builds happen once under a lock
+    however many tool calls ask at the same time, and reload() swaps the
+    whole loaded state at once.
     """
 
     # Persona categories based on claude-skills repository (v0.8.0 - 64 personas)
@@ -102,25 +129,267 @@ class PersonaRegistry:
         'meta': ['skill-orchestrator', 'skill-matrix', 'skill-chains']
     }
 
-    def __init__(self, skills_dir: Path):
+    def __init__(self, skills_dir: Path, snapshot_path: Optional[Path] = None, workers: int = 1,
+                 content_cache_size: int = 16):
         """
         Initialize the persona registry.
 
         Args:
             skills_dir: Directory containing SKILL.md files
+            snapshot_path: Optional precompiled snapshot of the parsed skills.
+                Used when it matches skills_dir; (re)written after parsing otherwise.
+            workers: Thread pool size for parsing SKILL.md files (1 = serially)
+            content_cache_size: Full SKILL.md bodies kept in memory. Only metadata
+                stays resident; bodies are read (mmap) when full_content is used.
         """
         self.skills_dir = skills_dir
-        self._personas: Dict[str, BasePersona] = {}
-        self._skill_data: Optional[Dict[str, Dict]] = None
-        self._loaded = False
+        self.snapshot_path = snapshot_path
+        self.workers = workers
+        self.content_cache = SkillContentCache(content_cache_size)
+        # Semantic matching: None = hashed n-gram embeddings, else a sentence-transformers model
+        self.embedding_model: Optional[str] = None
+        self._state: Optional[_RegistryState] = None
+        self._lock = threading.RLock()  # Serializes loading and index builds
+
+    def _loaded_state(self) -> _RegistryState:
+        """The loaded skills, loading them on first use."""
+        state = self._state
+        if state is None:
+            with self._lock:
+                state = self._state
+                if state is None:
+                    state = self._state = self._load_state()
+        return state
+
+    def _load_state(self) -> _RegistryState:
+        """Parse (or read from the snapshot) all skill data. Caller holds the lock."""
+        skill_data = None
+        if self.snapshot_path:
+            skill_data = load_snapshot(self.snapshot_path, self.skills_dir)
+
+        if skill_data is None:
+            skill_data = SkillLoader.load_all_skills(
+                self.skills_dir, workers=self.workers, include_content=False
+            )
+            if self.snapshot_path:
+                try:
+                    write_snapshot(self.snapshot_path, self.skills_dir, skill_data)
+                except OSError:
+                    pass  # Read-only cache dir: parse again next start
+        return self._build_state(skill_data)
+
+    def reload(self):
+        """
+        Load all skills again, e.g. after SKILL.md edits.
+
+        Parsed skills, personas, indexes and cached bodies are replaced; the
+        snapshot is reused if the skills are unchanged and rebuilt otherwise.
+        Calls running meanwhile finish on the previous load.
+        """
+        with self._lock:
+            self._state = self._load_state()
+        self.content_cache.clear()
+
+    @staticmethod
+    def _build_state(skill_data: Dict[str, Dict]) -> _RegistryState:
+        """State for parsed skills, with personas indexed by lowercased expertise keyword."""
+        index: Dict[str, List[Tuple[str, int]]] = {}
+        counts: Dict[str, int] = {}
+        order: Dict[str, int] = {}
+        for position, (name, data) in enumerate(skill_data.items()):
+            expertise = data.get('expertise', [])
+            order[name] = position
+            counts[name] = len(expertise)
+            for keyword, occurrences in Counter(k.lower() for k in expertise).items():
+                index.setdefault(keyword, []).append((name, occurrences))
+        return _RegistryState(skill_data=skill_data, expertise_index=index,
+                              expertise_counts=counts, order=order)
+
+    def relevance_scores(self, query: str) -> Dict[str, float]:
+        """
+        Score personas against a query using the inverted expertise index.
+
+        Gives the same scores as BasePersona.relevance_score() (substring match
+        of each expertise keyword in the query, normalized by the persona's
+        keyword count), but checks each distinct keyword once instead of every
+        persona's keywords.
+
+        Args:
+            query: The query to score
+
+        Returns:
+            Dict of persona name → score for personas scoring above 0, in
+            registry order
+        """
+        state = self._loaded_state()
+
+        query_lower = query.lower()
+        matches: Dict[str, int] = {}
+        for keyword, postings in state.expertise_index.items():
+            if keyword in query_lower:
+                for name, occurrences in postings:
+                    matches[name] = matches.get(name, 0) + occurrences
+
+        return {
+            name: min(matches[name] / state.expertise_counts[name], 1.0)
+            for name in sorted(matches, key=state.order.__getitem__)
+        }
+
+    def relevance_scores_batch(self, queries: Sequence[str]) -> List[Dict[str, float]]:
+        """
+        relevance_scores() for many queries at once.
+
+        With NumPy, keyword matches form a query × keyword matrix that is
+        multiplied with the keyword × persona occurrence matrix in one step.
+
+        Returns:
+            One relevance_scores() result per query, in query order
+        """
+        np = _numpy()
+        if np is None:
+            return [self.relevance_scores(query) for query in queries]
+        state = self._loaded_state()
+
+        names = list(state.skill_data)
+        keywords = list(state.expertise_index)
+        occurrences = np.zeros((len(keywords), len(names)))
+        for row, keyword in enumerate(keywords):
+            for name, count in state.expertise_index[keyword]:
+                occurrences[row, state.order[name]] = count
+        counts = np.array([state.expertise_counts[name] for name in names], dtype=float)
+
+        lowered = [query.lower() for query in queries]
+        matches = np.array(
+            [[keyword in query_lower for keyword in keywords] for query_lower in lowered],
+            dtype=float
+        ).reshape(len(queries), len(keywords))
+
+        hits = matches @ occurrences
+        rows, columns = np.nonzero(hits)  # Row-major, so each query's personas are in registry order
+        scores = np.minimum(hits[rows, columns] / counts[columns], 1.0)
+
+        results: List[Dict[str, float]] = [{} for _ in queries]
+        for row, column, score in zip(rows.tolist(), columns.tolist(), scores.tolist()):
+            results[row][names[column]] = score
+        return results
+
+    @property
+    def search_index_path(self) -> Optional[Path]:
+        """Where the BM25 index is persisted: next to the snapshot (personas.bm25.pickle)."""
+        if not self.snapshot_path:
+            return None
+        return self.snapshot_path.with_name(f"{self.snapshot_path.stem}.bm25{self.snapshot_path.suffix}")
+
+    def search_index(self) -> BM25Index:
+        """
+        BM25 index over each persona's SKILL.md content.
+
+        Built on first use and persisted next to the snapshot, invalidated
+        together with it when any SKILL.md changes.
+        """
+        state = self._loaded_state()
+        if state.search_index is not None:
+            return state.search_index
+
+        with self._lock:
+            if state.search_index is not None:
+                return state.search_index  # Built by a concurrent call
+
+            index_path = self.search_index_path
+            index = load_snapshot(index_path, self.skills_dir, key='bm25') if index_path else None
+            if (not isinstance(index, BM25Index) or index.format_version != BM25Index.FORMAT_VERSION
+                    or index.names != list(state.skill_data)):
+                index = BM25Index.build(state.skill_data, lambda name: self._read_body(state, name))
+                if index_path:
+                    try:
+                        write_snapshot(index_path, self.skills_dir, index, key='bm25')
+                    except OSError:
+                        pass
+
+            state.search_index = index
+            return index
+
+    @staticmethod
+    def _read_body(state: _RegistryState, name: str) -> str:
+        skill_data = state.skill_data[name]
+        if 'full_content' in skill_data:
+            return skill_data['full_content']
+        return decode_skill_text(read_skill_bytes(Path(skill_data['source_path'])))
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Rank personas for a query with BM25 over their SKILL.md content.
+
+        Returns:
+            (persona name, score) pairs, best first
+        """
+        return self.search_index().search(query, limit)
+
+    def search_terms(self, terms: Sequence[str], limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """search() for an already tokenized query (retrieval.tokenize())."""
+        return self.search_index().search_terms(terms, limit)
+
+    def search_batch(self, queries: Sequence[str],
+                     limit: Optional[int] = None) -> List[List[Tuple[str, float]]]:
+        """search() for many queries at once (vectorized when NumPy is installed)."""
+        return self.search_index().search_batch(queries, limit)
 
-    def _load_all(self):
-        """Lazy load all skill data."""
-        if self._loaded:
-            return
+    @property
+    def semantic_index_path(self) -> Optional[Path]:
+        """Where semantic index metadata is persisted (vectors live next to it as .f32 files)."""
+        if not self.snapshot_path:
+            return None
+        return self.snapshot_path.with_name(f"{self.snapshot_path.stem}.semantic{self.snapshot_path.suffix}")
+
+    def semantic_index(self) -> SemanticIndex:
+        """
+        Chunk embeddings of every persona for semantic matching (requires NumPy).
+
+        Computed once per skills content hash and embedder, then memory-mapped
+        from the cache directory on later starts.
+        """
+        state = self._loaded_state()
+        if state.semantic_index is not None:
+            return state.semantic_index
+
+        with self._lock:
+            if state.semantic_index is not None:
+                return state.semantic_index  # Built by a concurrent call
+
+            embedder = load_embedder(self.embedding_model)
+            metadata_path = self.semantic_index_path
+            index = None
+            if metadata_path:
+                metadata = load_snapshot(metadata_path, self.skills_dir, key='semantic')
+                if isinstance(metadata, dict) and metadata.get('names') == list(state.skill_data):
+                    index = SemanticIndex.load(metadata_path.parent, metadata, embedder)
+
+            if index is None:
+                index = SemanticIndex.build(state.skill_data, lambda name: self._read_body(state, name), embedder)
+                if metadata_path:
+                    try:
+                        content_hash = skills_content_hash(self.skills_dir)
+                        metadata = index.save(metadata_path.parent, content_hash)
+                        write_snapshot(metadata_path, self.skills_dir, metadata, content_hash, key='semantic')
+                    except OSError:
+                        pass
+
+            state.semantic_index = index
+            return index
+
+    def semantic_search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Rank personas by embedding similarity to the query (requires NumPy).
+
+        Returns:
+            (persona name, cosine similarity) pairs, best first
+        """
+        return self.semantic_index().search(query, limit)
 
-        self._skill_data = SkillLoader.load_all_skills(self.skills_dir)
-        self._loaded = True
+    def semantic_search_batch(self, queries: Sequence[str],
+                              limit: Optional[int] = None) -> List[List[Tuple[str, float]]]:
+        """semantic_search() for many queries with one matrix multiply."""
+        return self.semantic_index().search_batch(queries, limit)
 
     def get(self, name: str) -> Optional[BasePersona]:
         """
@@ -132,22 +401,19 @@ class PersonaRegistry:
         Returns:
             BasePersona instance or None if not found
         """
-        # Check cache first
-        if name in self._personas:
-            return self._personas[name]
+        state = self._loaded_state()
 
-        # Lazy load if needed
-        if not self._loaded:
-            self._load_all()
+        # Check cache first
+        persona = state.personas.get(name)
+        if persona is not None:
+            return persona
 
         # Get skill data
-        if not self._skill_data or name not in self._skill_data:
+        if name not in state.skill_data:
             return None
 
-        # Create and cache persona
-        persona = ConcretePersona(self._skill_data[name])
-        self._personas[name] = persona
-        return persona
+        # Create and cache persona (setdefault: concurrent callers share one)
+        return state.personas.setdefault(name, ConcretePersona(state.skill_data[name], self.content_cache))
 
     def get_all(self) -> Dict[str, BasePersona]:
         """
@@ -156,15 +422,14 @@ class PersonaRegistry:
         Returns:
             Dict mapping persona name to BasePersona instance
         """
-        if not self._loaded:
-            self._load_all()
+        state = self._loaded_state()
 
         # Load any not yet cached
-        for name in self._skill_data.keys():
-            if name not in self._personas:
-                self._personas[name] = ConcretePersona(self._skill_data[name])
+        for name in state.skill_data.keys():
+            if name not in state.personas:
+                state.personas.setdefault(name, ConcretePersona(state.skill_data[name], self.content_cache))
 
-        return self._personas.copy()
+        return {name: state.personas[name] for name in state.skill_data}
 
     def get_by_category(self, category: str) -> List[BasePersona]:
         """
@@ -197,13 +462,12 @@ class PersonaRegistry:
         Returns:
             List of persona names
         """
-        if not self._loaded:
-            self._load_all()
+        state = self._loaded_state()
 
         if category:
             return self.CATEGORIES.get(category, [])
 
-        return list(self._skill_data.keys())
+        return list(state.skill_data.keys())
 
     def search_by_expertise(self, keywords) -> List[BasePersona]:
         """
@@ -255,17 +519,14 @@ class PersonaRegistry:
 
     def __len__(self) -> int:
         """Return number of available personas."""
-        if not self._loaded:
-            self._load_all()
-        return len(self._skill_data)
+        return len(self._loaded_state().skill_data)
 
     def __contains__(self, name: str) -> bool:
         """Check if a persona exists."""
-        if not self._loaded:
-            self._load_all()
-        return name in self._skill_data
+        return name in self._loaded_state().skill_data
 
     def __repr__(self) -> str:
-        if not self._loaded:
+        state = self._state
+        if state is None:
             return f"<PersonaRegistry: {self.skills_dir} (not loaded)>"
-        return f"<PersonaRegistry: {len(self._skill_data)} personas loaded>"
+        return f"<PersonaRegistry: {len(state.skill_data)} personas loaded>"
@@ -0,0 +1,308 @@
+"""
+Lexical persona retrieval (BM25) over SKILL.md content.
+
+Following Search & Discovery Engineer: Rank by evidence in the documents, not
+by a hand-maintained keyword list.
+Following Snarky Senior Engineer: A tokenizer, a suffix stemmer and a sparse
+index. No search engine dependency.
+
+Each persona is one document made of weighted fields: name, description,
+use_when, examples and quick_tip from the frontmatter, section headers, and
+the SKILL.md body. Term frequencies are field-weighted (BM25F-style), and the
+BM25 contribution of every (term, persona) pair is precomputed at build time,
+so a query only sums the postings of its terms.
+
+For batch workloads (e.g. CI scoring hundreds of PR descriptions),
+search_batch() scores many queries with one sparse × dense product against a
+term × persona impact matrix when NumPy is installed (optional), and falls
+back to per-query search() otherwise. Both give identical results.
+"""
+
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Field → term frequency weight
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'description': 3.0,
+    'use_when': 2.0,
+    'examples': 2.0,
+    'quick_tip': 2.0,
+    'headers': 2.0,
+    'body': 1.0,
+}
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before
+being below between both but by can could did do does doing done down during each else etc
+every few for from further get gets had has have having he her here hers him his how i if in
+into is it its itself just let like may me might more most much must my need needs no nor not
+now of off on once only or other our ours out over own per same shall she should so some such
+than that the their theirs them then there these they this those through to too under until up
+upon us use used using very via want was we were what when where which while who whom why will
+with within without would yes yet you your yours
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_SECTION_HEADER = re.compile(r"^#{1,6}\s+(.+)$", re.MULTILINE)
+_FRONTMATTER = re.compile(r"^---\n.*?\n---", re.DOTALL)
+
+# Longest suffixes first; a suffix is only removed if a 3+ letter stem remains
+_SUFFIXES = (
+    'ational', 'ization', 'fulness', 'iveness', 'ations', 'ation', 'ments',
+    'ment', 'ness', 'ities', 'ity', 'ings', 'ing', 'ers', 'er', 'ed', 'ly', 'es', 's',
+)
+
+
+def stem(word: str) -> str:
+    """
+    Light suffix-stripping stemmer.
+
+    Maps inflections onto one stem (deploy/deployed/deployment,
+    database/databases, scale/scaling) without a stemming dependency.
+    """
+    if len(word) <= 3 or word.isdigit():
+        return word
+    if word.endswith(('ies', 'ied')) and len(word) > 4:
+        return word[:-3] + 'y'
+    if word.endswith('ss'):
+        return word
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    if word.endswith('e') and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+_stems: Dict[str, str] = {}
+_MAX_STEMS = 50_000
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords, stem."""
+    terms = []
+    for token in _TOKEN.findall(text.lower()):
+        if len(token) <= 1 or token in STOPWORDS:
+            continue
+        term = _stems.get(token)
+        if term is None:
+            # Skill vocabulary is small; memoizing keeps index builds fast
+            if len(_stems) >= _MAX_STEMS:
+                _stems.clear()
+            term = _stems[token] = stem(token)
+        terms.append(term)
+    return terms
+
+
+def _numpy() -> Optional[Any]:
+    """NumPy if installed (imported on first batch use, not at server start)."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def skill_fields(skill_data: Dict, body: str) -> Dict[str, str]:
+    """Split one persona's skill data and SKILL.md body into indexable fields."""
+    metadata = skill_data.get('metadata', {})
+    body = _FRONTMATTER.sub('', body, count=1)
+    examples = skill_data.get('examples') or []
+    if isinstance(examples, str):
+        examples = [examples]
+    return {
+        'name': metadata.get('name', '').replace('-', ' '),
+        'description': str(metadata.get('description', '')),
+        'use_when': str(skill_data.get('use_when') or ''),
+        'examples': ' '.join(str(example) for example in examples),
+        'quick_tip': str(skill_data.get('quick_tip') or ''),
+        'headers': ' '.join(_SECTION_HEADER.findall(body)),
+        'body': body,
+    }
+
+
+class BM25Index:
+    """
+    Sparse BM25 index over personas.
+
+    Postings are stored per term as two compact arrays: persona ids and the
+    precomputed BM25 impact of the term in that persona.
+    """
+
+    # Bump when tokenization or weighting changes so persisted indexes are rebuilt
+    FORMAT_VERSION = 1
+
+    def __init__(self, names: List[str], postings: Dict[str, Tuple[array, array]],
+                 k1: float = 1.2, b: float = 0.75):
+        self.names = names
+        self.postings = postings
+        self.k1 = k1
+        self.b = b
+        self.format_version = self.FORMAT_VERSION
+
+    @classmethod
+    def build(cls, skills: Dict[str, Dict], read_body: Callable[[str], str],
+              k1: float = 1.2, b: float = 0.75) -> "BM25Index":
+        """
+        Build an index from parsed skill data.
+
+        Args:
+            skills: Dict mapping persona name to skill data (registry order)
+            read_body: Returns the full SKILL.md content for a persona name
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        names = list(skills)
+        doc_terms: List[Counter] = []
+        for name in names:
+            fields = skill_fields(skills[name], read_body(name))
+            weighted = Counter()
+            for field, text in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for term in tokenize(text):
+                    weighted[term] += weight
+            doc_terms.append(weighted)
+
+        lengths = [sum(terms.values()) for terms in doc_terms]
+        avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        document_frequency = Counter(term for terms in doc_terms for term in terms)
+        total = len(names)
+
+        postings: Dict[str, Tuple[array, array]] = {}
+        for doc_id, terms in enumerate(doc_terms):
+            norm = k1 * (1 - b + b * lengths[doc_id] / avg_length) if avg_length else k1
+            for term, tf in terms.items():
+                df = document_frequency[term]
+                idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                ids, impacts = postings.setdefault(term, (array('I'), array('f')))
+                ids.append(doc_id)
+                impacts.append(idf * tf * (k1 + 1) / (tf + norm))
+
+        return cls(names, postings, k1, b)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Rank personas for a query.
+
+        Returns:
+            (persona name, score) for personas matching at least one query
+            term, best first; ties keep registry order
+        """
+        return self.search_terms(tokenize(query), limit)
+
+    def search_terms(self, terms: Iterable[str], limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """search() for an already tokenized query (see tokenize())."""
+        scores: Dict[int, float] = {}
+        # First-occurrence order, so search_batch() adds the same impacts in the same order
+        for term in dict.fromkeys(terms):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            for doc_id, impact in zip(*posting):
+                scores[doc_id] = scores.get(doc_id, 0.0) + impact
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(self.names[doc_id], score) for doc_id, score in ranked]
+
+    def search_batch(self, queries: Sequence[str],
+                     limit: Optional[int] = None) -> List[List[Tuple[str, float]]]:
+        """
+        Rank personas for many queries at once.
+
+        With NumPy, the queries become a sparse query × term matrix (CSR
+        arrays) that is multiplied with the term × persona impact matrix in
+        one vectorized pass; without it, each query goes through search().
+
+        Args:
+            queries: Queries to rank
+            limit: Keep at most this many personas per query
+
+        Returns:
+            One search() result per query, in query order
+        """
+        np = _numpy()
+        if np is None:
+            return [self.search(query, limit) for query in queries]
+
+        term_ids, impacts = self._impact_matrix(np)
+        scores = np.zeros((len(queries), len(self.names)))
+
+        # Query × term matrix in CSR form: row i holds the known terms of query i
+        indptr = [0]
+        indices: List[int] = []
+        for query in queries:
+            for term in dict.fromkeys(tokenize(query)):
+                term_id = term_ids.get(term)
+                if term_id is not None:
+                    indices.append(term_id)
+            indptr.append(len(indices))
+
+        if indices:
+            indptr = np.asarray(indptr)
+            rows = np.flatnonzero(indptr[1:] > indptr[:-1])
+            # Sparse × dense product: sum the impact rows of each query's terms
+            scores[rows] = np.add.reduceat(impacts[np.asarray(indices)], indptr[rows], axis=0)
+
+        # Best first; the stable sort keeps registry order for ties, like search()
+        order = np.argsort(-scores, axis=1, kind='stable')
+        if limit is not None:
+            order = order[:, :limit]
+        ranked_scores = np.take_along_axis(scores, order, axis=1)
+
+        # Matching personas are a prefix of each sorted row; only materialize those
+        matched = ranked_scores > 0
+        pairs = list(zip(np.asarray(self.names, dtype=object)[order[matched]].tolist(),
+                         ranked_scores[matched].tolist()))
+        ends = np.cumsum(matched.sum(axis=1)).tolist()
+        return [pairs[start:end] for start, end in zip([0] + ends, ends)]
+
+    def _impact_matrix(self, np) -> Tuple[Dict[str, int], Any]:
+        """Term → row id, and the dense term × persona matrix of BM25 impacts (built once)."""
+        matrix = getattr(self, '_matrix', None)
+        if matrix is None:
+            term_ids = {term: term_id for term_id, term in enumerate(self.postings)}
+            impacts = np.zeros((len(term_ids), len(self.names)))
+            for term_id, (ids, values) in enumerate(self.postings.values()):
+                impacts[term_id, np.frombuffer(ids, dtype=ids.typecode)] = np.frombuffer(values, dtype=values.typecode)
+            matrix = self._matrix = (term_ids, impacts)
+        return matrix
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state.pop('_matrix', None)  # Derived; not worth persisting
+        return state
+
+    def matched_terms(self, query: str, name: str) -> List[str]:
+        """Query words (as typed) that occur in a persona's document, strongest first."""
+        try:
+            doc_id = self.names.index(name)
+        except ValueError:
+            return []
+
+        matched = {}
+        for word in _TOKEN.findall(query.lower()):
+            if len(word) <= 1 or word in STOPWORDS or word in matched:
+                continue
+            posting = self.postings.get(stem(word))
+            if posting is None:
+                continue
+            ids, impacts = posting
+            for position, posting_id in enumerate(ids):
+                if posting_id == doc_id:
+                    matched[word] = impacts[position]
+                    break
+        return sorted(matched, key=matched.get, reverse=True)
+
+    def vocabulary(self) -> Iterable[str]:
+        return self.postings.keys()
+
+    def __len__(self) -> int:
+        return len(self.names)
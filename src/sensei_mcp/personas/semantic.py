@@ -0,0 +1,307 @@
+"""
+Embedding-based semantic persona matching.
+
+Following Search & Discovery Engineer: Match what the user means, not only
+the words they typed.
+Following Performance Engineer: Embed the skills once, memory-map the vectors,
+brute-force the search.
+
+Each SKILL.md is split into chunks (the frontmatter summary plus one chunk
+per section), every chunk is embedded, and a persona's score for a query is
+the cosine similarity of its best-matching chunk. Vectors are computed once
+per skills content hash and embedder, stored as a raw float32 file next to
+the persona snapshot and memory-mapped on later starts.
+
+Two embedders are available:
+
+- HashingEmbedder: hashed word and character n-gram features (the "hashing
+  trick"), IDF-weighted over the skill chunks. No model, no downloads; it
+  catches inflections, compounds and typos ("time-outs", "timeouts",
+  "timing out") but not true paraphrases.
+- SentenceTransformerEmbedder: a small local CPU model (e.g. all-MiniLM-L6-v2)
+  when ``sentence-transformers`` is installed.
+
+NumPy is required (``pip install sensei-mcp[semantic]``); without it,
+semantic_available() is False and callers fall back to BM25.
+"""
+
+import os
+import re
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .retrieval import STOPWORDS, _FRONTMATTER, _numpy
+
+
+_WORD = re.compile(r"[a-z0-9]+")
+_SECTION = re.compile(r"^#{1,3}\s+", re.MULTILINE)
+
+# Chunks shorter than this (in characters) are merged into the summary chunk
+MIN_CHUNK_CHARS = 80
+# Long sections are truncated; small models only read the first few hundred tokens anyway
+MAX_CHUNK_CHARS = 2000
+# Bound on HashingEmbedder's per-word feature memo
+_MAX_WORDS = 50_000
+
+
+def semantic_available() -> bool:
+    """Whether semantic matching can run (NumPy is installed)."""
+    return _numpy() is not None
+
+
+def skill_chunks(skill_data: Dict, body: str) -> List[str]:
+    """
+    Split a persona into the texts that get embedded.
+
+    The first chunk summarizes the persona (name, description, use_when,
+    examples); the rest are the SKILL.md sections.
+    """
+    metadata = skill_data.get('metadata', {})
+    examples = skill_data.get('examples') or []
+    if isinstance(examples, str):
+        examples = [examples]
+    summary = [
+        metadata.get('name', '').replace('-', ' '),
+        str(metadata.get('description', '')),
+        str(skill_data.get('use_when') or ''),
+        ' '.join(str(example) for example in examples),
+    ]
+
+    chunks = []
+    for section in _SECTION.split(_FRONTMATTER.sub('', body, count=1)):
+        section = section.strip()
+        if len(section) < MIN_CHUNK_CHARS:
+            summary.append(section)
+        else:
+            chunks.append(section[:MAX_CHUNK_CHARS])
+    return [' '.join(part for part in summary if part)] + chunks
+
+
+class HashingEmbedder:
+    """
+    Hashed word + character n-gram embeddings.
+
+    Features are word unigrams, word bigrams and character 3–5-grams of each
+    word, hashed into ``dim`` signed buckets. fit_encode() learns per-bucket IDF
+    weights from the skill chunks so that n-grams shared by every skill
+    ("ing", "ion") don't dominate.
+    """
+
+    VERSION = 1
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.idf = None
+        self._words: Dict[str, Tuple[List[int], List[float]]] = {}
+
+    @property
+    def name(self) -> str:
+        """Cache key: changes whenever the vectors would."""
+        return f"hashing-v{self.VERSION}-{self.dim}"
+
+    def _hash(self, gram: str) -> Tuple[int, float]:
+        h = zlib.crc32(gram.encode('utf-8'))
+        # One hash bit picks the sign so collisions tend to cancel out
+        return h % self.dim, (1.0 if h & 0x80000000 else -1.0)
+
+    def _word_features(self, word: str) -> Tuple[List[int], List[float]]:
+        """Buckets and signs of a word and its character n-grams (memoized: skill vocabulary repeats a lot)."""
+        features = self._words.get(word)
+        if features is None:
+            padded = f"<{word}>"
+            grams = [f"w:{word}"]
+            for n in (3, 4, 5):
+                grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+            if len(self._words) >= _MAX_WORDS:
+                self._words.clear()
+            buckets, signs = zip(*(self._hash(gram) for gram in grams))
+            features = self._words[word] = (list(buckets), list(signs))
+        return features
+
+    def _counts(self, texts: Sequence[str]) -> Any:
+        """Raw signed feature counts, one row per text."""
+        np = _numpy()
+        counts = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = [w for w in _WORD.findall(text.lower()) if w not in STOPWORDS]
+            buckets: List[int] = []
+            signs: List[float] = []
+            for word in words:
+                word_buckets, word_signs = self._word_features(word)
+                buckets += word_buckets
+                signs += word_signs
+            for pair in zip(words, words[1:]):
+                bucket, sign = self._hash("b:%s %s" % pair)
+                buckets.append(bucket)
+                signs.append(sign)
+            if buckets:
+                counts[row] = np.bincount(buckets, weights=signs, minlength=self.dim)
+        return counts
+
+    def fit_encode(self, texts: Sequence[str]) -> Any:
+        """Learn bucket IDF weights from a corpus (the skill chunks) and embed it."""
+        np = _numpy()
+        counts = self._counts(texts)
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+        return self._normalize(counts)
+
+    def encode(self, texts: Sequence[str]) -> Any:
+        """Embed texts as L2-normalized float32 rows."""
+        return self._normalize(self._counts(texts))
+
+    def _normalize(self, vectors: Any) -> Any:
+        np = _numpy()
+        if self.idf is not None:
+            vectors *= self.idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+class SentenceTransformerEmbedder:
+    """Embeddings from a local sentence-transformers model (CPU)."""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+        from sentence_transformers import SentenceTransformer  # optional dependency
+
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name, device='cpu')
+
+    @property
+    def name(self) -> str:
+        return "st-" + re.sub(r"[^A-Za-z0-9.-]+", "_", self.model_name)
+
+    def fit_encode(self, texts: Sequence[str]) -> Any:
+        return self.encode(texts)  # Pretrained
+
+    def encode(self, texts: Sequence[str]) -> Any:
+        np = _numpy()
+        vectors = self.model.encode(list(texts), normalize_embeddings=True, convert_to_numpy=True)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+
+
+def load_embedder(model: Optional[str] = None):
+    """
+    Embedder for semantic matching.
+
+    Args:
+        model: A sentence-transformers model name, or None for the hashing
+            embedder. Falls back to hashing (with a warning on stderr) if the
+            model can't be loaded.
+    """
+    if model:
+        try:
+            return SentenceTransformerEmbedder(model)
+        except Exception as e:  # ImportError, missing model files, ...
+            print(f"Warning: Could not load embedding model {model!r} ({e}); "
+                  f"using hashed n-gram embeddings", file=sys.stderr)
+    return HashingEmbedder()
+
+
+class SemanticIndex:
+    """
+    Chunk embeddings of every persona, searched by brute force.
+
+    ``vectors`` rows are grouped by persona in registry order; ``starts[i]``
+    is the first row of persona i.
+    """
+
+    def __init__(self, names: List[str], starts: Any, vectors: Any, embedder):
+        self.names = names
+        self.starts = starts
+        self.vectors = vectors
+        self.embedder = embedder
+
+    @classmethod
+    def build(cls, skills: Dict[str, Dict], read_body, embedder) -> "SemanticIndex":
+        """Chunk and embed every persona (skills in registry order)."""
+        np = _numpy()
+        names = list(skills)
+        chunks: List[str] = []
+        starts = []
+        for name in names:
+            starts.append(len(chunks))
+            chunks.extend(skill_chunks(skills[name], read_body(name)))
+        return cls(names, np.asarray(starts, dtype=np.int64), embedder.fit_encode(chunks), embedder)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Rank personas by cosine similarity of their best chunk to the query.
+
+        Returns:
+            (persona name, similarity) for personas with positive similarity,
+            best first; ties keep registry order
+        """
+        return self.search_batch([query], limit)[0]
+
+    def search_batch(self, queries: Sequence[str],
+                     limit: Optional[int] = None) -> List[List[Tuple[str, float]]]:
+        """search() for many queries with one matrix multiply."""
+        np = _numpy()
+        if not queries:
+            return []
+        similarities = self.embedder.encode(queries) @ self.vectors.T
+        scores = np.maximum.reduceat(similarities, self.starts, axis=1).astype(float)
+
+        order = np.argsort(-scores, axis=1, kind='stable')
+        if limit is not None:
+            order = order[:, :limit]
+        results = []
+        for doc_ids, row in zip(order.tolist(), np.take_along_axis(scores, order, axis=1).tolist()):
+            results.append([(self.names[doc_id], score) for doc_id, score in zip(doc_ids, row) if score > 0])
+        return results
+
+    # Persistence: a raw float32 matrix (memory-mapped on load) plus a small
+    # metadata payload stored through the persona snapshot machinery
+
+    def vectors_filename(self, content_hash: str) -> str:
+        return f"semantic-{self.embedder.name}-{content_hash[:16]}.f32"
+
+    def save(self, directory: Path, content_hash: str) -> Dict:
+        """
+        Write the vectors to ``directory`` and return the metadata needed by load().
+
+        Vector files of older skill contents for the same embedder are removed.
+        """
+        filename = self.vectors_filename(content_hash)
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = directory / f"{filename}.{os.getpid()}.tmp"
+        self.vectors.astype('<f4').tofile(tmp_path)
+        os.replace(tmp_path, directory / filename)
+
+        for stale in directory.glob(f"semantic-{self.embedder.name}-*.f32"):
+            if stale.name != filename:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+
+        return {
+            'embedder': self.embedder.name,
+            'names': self.names,
+            'starts': self.starts.tolist(),
+            'shape': tuple(self.vectors.shape),
+            'idf': None if getattr(self.embedder, 'idf', None) is None else self.embedder.idf.tolist(),
+            'vectors_file': filename,
+        }
+
+    @classmethod
+    def load(cls, directory: Path, metadata: Dict, embedder) -> Optional["SemanticIndex"]:
+        """Memory-map vectors written by save(); None if they don't match ``embedder``."""
+        np = _numpy()
+        if metadata.get('embedder') != embedder.name:
+            return None
+        path = directory / metadata['vectors_file']
+        try:
+            vectors = np.memmap(path, dtype='<f4', mode='r', shape=metadata['shape'])
+        except (OSError, ValueError):
+            return None
+        if metadata.get('idf') is not None:
+            embedder.idf = np.asarray(metadata['idf'], dtype=np.float32)
+        return cls(metadata['names'], np.asarray(metadata['starts'], dtype=np.int64), vectors, embedder)
+
+    def __len__(self) -> int:
+        return len(self.names)
@@ -0,0 +1,139 @@
+"""
+Precompiled persona registry snapshot.
+
+Following Performance Engineer: Parse once, load in one read.
+Following Platform Builder: Invalidate automatically, never serve stale data.
+
+Parsing every SKILL.md (YAML frontmatter plus several regex passes) dominates
+server cold start. A snapshot stores the parsed skill data in a single pickle
+keyed by a content hash of the skills directory. Bodies are not included;
+personas read them on demand (see content.py). On load, a cheap stat
+fingerprint (name, size, mtime) of the skill files is checked first; if it
+differs, the content hash decides whether the snapshot is still valid (e.g.
+after a checkout that only touched mtimes).
+"""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .loader import SkillLoader, SkillLoadReport
+
+
+# Bump when SkillLoader's output format changes so old snapshots are rebuilt
+SNAPSHOT_VERSION = 4
+
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+
+def skills_fingerprint(skills_dir: Path) -> Fingerprint:
+    """(name, size, mtime_ns) of every skill file, sorted by name."""
+    entries = []
+    with os.scandir(skills_dir) as it:
+        for entry in it:
+            if entry.name.endswith('.md') and entry.is_file():
+                st = entry.stat()
+                entries.append((entry.name, st.st_size, st.st_mtime_ns))
+    return tuple(sorted(entries))
+
+
+def skills_content_hash(skills_dir: Path) -> str:
+    """SHA-256 over the names and contents of every skill file."""
+    digest = hashlib.sha256()
+    for skill_file in sorted(skills_dir.glob('*.md')):
+        digest.update(skill_file.name.encode('utf-8') + b'\0')
+        digest.update(skill_file.read_bytes() + b'\0')
+    return digest.hexdigest()
+
+
+def load_snapshot(snapshot_path: Path, skills_dir: Path, key: str = 'skills') -> Optional[Any]:
+    """
+    Load parsed skill data from a snapshot if it matches the skills directory.
+
+    Args:
+        snapshot_path: Snapshot file written by write_snapshot()
+        skills_dir: Directory containing SKILL.md files
+        key: Payload stored in the snapshot ('skills' for parsed skill data;
+            other artifacts derived from the skills use their own key/file)
+
+    Returns:
+        The payload (for 'skills': dict mapping persona name to skill data),
+        or None if the snapshot is missing, unreadable or stale
+    """
+    try:
+        with open(snapshot_path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except Exception:
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+        return None
+    if key not in snapshot:
+        return None
+    if snapshot.get('skills_dir') != str(skills_dir.resolve()):
+        return None  # Skill data records source paths under the original directory
+
+    fingerprint = skills_fingerprint(skills_dir)
+    if snapshot.get('fingerprint') == fingerprint:
+        return snapshot[key]
+
+    content_hash = skills_content_hash(skills_dir)
+    if snapshot.get('content_hash') != content_hash:
+        return None
+
+    # Same content, new mtimes: refresh the fingerprint so the next start is fast again
+    try:
+        write_snapshot(snapshot_path, skills_dir, snapshot[key], content_hash, key)
+    except OSError:
+        pass
+    return snapshot[key]
+
+
+def write_snapshot(snapshot_path: Path, skills_dir: Path, skills: Any,
+                   content_hash: Optional[str] = None, key: str = 'skills'):
+    """
+    Write parsed skill data to a snapshot file (atomically).
+
+    Args:
+        snapshot_path: Where to write the snapshot
+        skills_dir: Directory the skills were parsed from
+        skills: Dict mapping persona name to skill data (or the payload for ``key``)
+        content_hash: Precomputed skills_content_hash(), if available
+        key: Payload name (see load_snapshot)
+    """
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'skills_dir': str(skills_dir.resolve()),
+        'fingerprint': skills_fingerprint(skills_dir),
+        'content_hash': content_hash or skills_content_hash(skills_dir),
+        key: skills,
+    }
+
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, snapshot_path)
+
+
+def compile_snapshot(skills_dir: Path, snapshot_path: Path, workers: int = 1,
+                     report: Optional[SkillLoadReport] = None) -> Dict[str, Dict]:
+    """
+    Parse every SKILL.md (metadata only; bodies are read lazily) and write a
+    fresh snapshot.
+
+    Args:
+        skills_dir: Directory containing SKILL.md files
+        snapshot_path: Where to write the snapshot
+        workers: Parse files in a thread pool of this many workers
+        report: Optional SkillLoadReport to fill with timings and errors
+
+    Returns:
+        Dict mapping persona name to skill data
+    """
+    skills = SkillLoader.load_all_skills(skills_dir, workers=workers, report=report,
+                                         include_content=False)
+    write_snapshot(snapshot_path, skills_dir, skills)
+    return skills
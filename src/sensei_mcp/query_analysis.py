@@ -0,0 +1,121 @@
+"""
+Shared, memoized analysis of a query.
+
+Following Performance Engineer: Analyze each query once, whoever asks.
+Following Platform Builder: One bounded cache, observable via stats().
+
+A single tool call may run context detection, persona ranking, the context
+hint keyword map and MCP suggestions on the same query, and agents often
+replay the same prompts. QueryAnalysis holds everything derived from the
+query text; each consumer fills in its part on first use, and
+QueryAnalysisCache keeps analyses in a bounded LRU so repeat queries are
+answered from memory.
+
+Consumers:
+- SkillOrchestrator: contexts, primary_context, persona_rankings
+- MCPOrchestrator: mcp_keywords, workflow_templates
+- server._generate_context_hint: hint_context
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from .context_detector import QueryContext
+from .personas.retrieval import tokenize
+
+
+@dataclass
+class QueryAnalysis:
+    """
+    Everything derived from one query's text.
+
+    ``query``, ``normalized`` and ``tokens`` are computed up front; the other
+    fields are None until the consumer that owns them computes them.
+    """
+    query: str
+    normalized: str                     # Lowercased text every keyword scan matches against
+    tokens: Tuple[str, ...]             # Retrieval terms (stopwords removed, stemmed)
+
+    # Context detection: (context, match count) pairs and the priority winner
+    contexts: Optional[Tuple[Tuple[QueryContext, int], ...]] = None
+    primary_context: Optional[QueryContext] = None
+
+    # Persona ranking per retrieval mode ('bm25', 'semantic', 'keyword')
+    persona_rankings: Dict[str, Tuple[Tuple[str, float], ...]] = field(default_factory=dict)
+
+    # MCP server value → matched keywords, and keyword-matched workflow template values
+    mcp_keywords: Optional[Dict[str, Tuple[str, ...]]] = None
+    workflow_templates: Optional[Tuple[str, ...]] = None
+
+    # Context named by the hint keyword map ('' if no keyword matched)
+    hint_context: Optional[str] = None
+
+    @classmethod
+    def of(cls, query: str) -> "QueryAnalysis":
+        return cls(query=query, normalized=query.lower(), tokens=tuple(tokenize(query)))
+
+
+class QueryAnalysisCache:
+    """
+    Bounded LRU of QueryAnalysis objects keyed by a hash of the query.
+
+    Thread-safe. Fields filled in concurrently for the same query are
+    deterministic, so a rare duplicate computation is harmless.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        """
+        Args:
+            max_entries: Distinct queries kept (0 disables caching)
+        """
+        self.max_entries = max_entries
+        self._analyses: "OrderedDict[bytes, QueryAnalysis]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query: str) -> bytes:
+        """Fixed-size cache key, so long prompts aren't kept twice."""
+        return hashlib.blake2b(query.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+    def get(self, query: str) -> QueryAnalysis:
+        """The analysis of ``query``, created (and cached) on first use."""
+        key = self.key(query)
+        with self._lock:
+            analysis = self._analyses.get(key)
+            if analysis is not None and analysis.query == query:
+                self.hits += 1
+                self._analyses.move_to_end(key)
+                return analysis
+            self.misses += 1
+
+        analysis = QueryAnalysis.of(query)
+        if self.max_entries > 0:
+            with self._lock:
+                # Another thread may have won the race; keep its (possibly filled-in) analysis
+                existing = self._analyses.get(key)
+                if existing is not None and existing.query == query:
+                    analysis = existing
+                else:
+                    self._analyses[key] = analysis
+                self._analyses.move_to_end(key)
+                while len(self._analyses) > self.max_entries:
+                    self._analyses.popitem(last=False)
+        return analysis
+
+    def clear(self):
+        with self._lock:
+            self._analyses.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Cache counters and occupancy."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._analyses),
+            'max_entries': self.max_entries,
+        }
@@ -0,0 +1,165 @@
+"""
+Response cache for deterministic MCP tools.
+
+Following Performance Engineer: Render once, serve the bytes.
+Following Platform Builder: Bounded by size, invalidated by content, observable.
+
+Tools like get_persona_content or list_available_skills return the same large
+strings for the same arguments until the skills or the rulebook change.
+ResponseCache.cached() wraps such a tool: responses are kept pre-rendered,
+keyed by tool name and normalized arguments (defaults applied, dicts with
+sorted keys), and tagged with the generation of the content sources the tool
+declares. A source is any registered callable returning a token that changes
+with the content (e.g. a stat fingerprint of the skills directory). A
+response whose generation no longer matches is rendered again.
+
+Sources are polled at most once per ``generation_ttl`` seconds, so an edit
+may take that long to show. Total cached response size is bounded in bytes
+(least recently used responses are evicted first).
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class ResponseCache:
+    """Byte-bounded LRU of rendered tool responses."""
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024, generation_ttl: float = 1.0):
+        """
+        Args:
+            max_bytes: Total UTF-8 size of cached responses (0 disables caching)
+            generation_ttl: Seconds a source's generation token is reused before polling again
+        """
+        self.max_bytes = max_bytes
+        self.generation_ttl = generation_ttl
+        self._sources: Dict[str, Callable[[], Hashable]] = {}
+        self._generations: Dict[str, Tuple[float, Hashable]] = {}  # Source → (polled at, token)
+        # Key → (tool, generation, response, size in bytes)
+        self._responses: "OrderedDict[bytes, Tuple[str, Tuple, str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.evictions = 0
+
+    def register_source(self, name: str, generation: Callable[[], Hashable]):
+        """
+        Declare a content source tools can depend on.
+
+        Args:
+            name: Source name used in cached(...)
+            generation: Returns a token that changes whenever the content does
+        """
+        self._sources[name] = generation
+        self._generations.pop(name, None)
+
+    def generation(self, name: str) -> Hashable:
+        """Current generation token of a source (polled at most every generation_ttl seconds)."""
+        now = time.monotonic()
+        polled = self._generations.get(name)
+        if polled is not None and now - polled[0] < self.generation_ttl:
+            return polled[1]
+        token = self._sources[name]()
+        self._generations[name] = (now, token)
+        return token
+
+    def cached(self, *sources: str, name: Optional[str] = None):
+        """
+        Decorator caching a function's (string) responses.
+
+        Args:
+            sources: Registered sources the response depends on
+            name: Name in keys and stats (default: the function's name)
+
+        Example:
+            @mcp.tool()
+            @response_cache.cached("skills")
+            def list_available_skills(category: str = None) -> str: ...
+        """
+        def decorator(fn: Callable[..., str]) -> Callable[..., str]:
+            tool = name or fn.__name__
+            signature = inspect.signature(fn)
+            unknown = [source for source in sources if source not in self._sources]
+            if unknown:
+                raise ValueError(f"Unknown response cache source(s) for {tool}: {', '.join(unknown)}")
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = self.key(tool, bound.arguments)
+                generation = tuple(self.generation(source) for source in sources)
+
+                response = self.get(key, tool, generation)
+                if response is None:
+                    response = fn(*bound.args, **bound.kwargs)
+                    self.put(key, tool, generation, response)
+                return response
+
+            wrapper.cache = self
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def key(tool: str, arguments: Dict[str, Any]) -> bytes:
+        """Cache key of a call: tool name + arguments as canonical JSON."""
+        normalized = json.dumps(arguments, sort_keys=True, separators=(',', ':'), default=repr)
+        return hashlib.blake2b(f"{tool}\0{normalized}".encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+    def get(self, key: bytes, tool: str, generation: Tuple) -> Optional[str]:
+        with self._lock:
+            entry = self._responses.get(key)
+            if entry is None or entry[1] != generation:
+                self.misses[tool] = self.misses.get(tool, 0) + 1
+                return None
+            self.hits[tool] = self.hits.get(tool, 0) + 1
+            self._responses.move_to_end(key)
+            return entry[2]
+
+    def put(self, key: bytes, tool: str, generation: Tuple, response: str):
+        if not isinstance(response, str):
+            return
+        size = len(response.encode('utf-8', 'surrogatepass'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._responses.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[3]
+            self._responses[key] = (tool, generation, response, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, _, evicted_size) = self._responses.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._responses.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters (total and per tool), occupancy and evictions."""
+        with self._lock:
+            hits = sum(self.hits.values())
+            misses = sum(self.misses.values())
+            return {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                'entries': len(self._responses),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+                'tools': {
+                    tool: {'hits': self.hits.get(tool, 0), 'misses': self.misses.get(tool, 0)}
+                    for tool in sorted(set(self.hits) | set(self.misses))
+                },
+            }
@@ -7,8 +7,10 @@ into Claude's context based on file types, operations, and maintains session
 memory of architectural decisions.
 """
 
+import asyncio
 import json
-import subprocess
+import os
+from datetime import timedelta
 from pathlib import Path
 from typing import List, Optional
 
@@ -17,9 +19,14 @@ from mcp.server.fastmcp import FastMCP
 from .models import ContextType
 from .session import SessionManager
 from .engine import ContextInferenceEngine, RulebookLoader
+from .personas.content import paginate
 from .personas.registry import PersonaRegistry
+from .personas.snapshot import skills_fingerprint
 from .orchestrator import SkillOrchestrator
-from .analytics import SessionAnalyzer
+from .query_analysis import QueryAnalysisCache
+from .response_cache import ResponseCache
+from .tool_pool import ToolPool
+from .analytics import SessionAnalyzer, time_range_cutoff
 from .exporter import ConsultationExporter, SessionExporter
 from .merge import SessionMerger, format_merge_result, format_comparison
 
@@ -31,23 +38,49 @@ SERVER_DIR = Path(__file__).parent
 DIRECTIVES_PATH = SERVER_DIR / "core-directives.md"
 SESSION_DIR = Path.home() / ".sensei" / "sessions"
 SKILLS_DIR = SERVER_DIR / "personas" / "skills"
+CACHE_DIR = Path.home() / ".sensei" / "cache"
+PERSONA_SNAPSHOT = CACHE_DIR / "personas.pickle"
+PATH_SHAPE_CACHE = CACHE_DIR / "path-shapes.json"
+GIT_TIMEOUT = 60.0  # Seconds per git command in analyze_changes
 
 # Initialize managers
 session_mgr = SessionManager(SESSION_DIR)
 rulebook = RulebookLoader(DIRECTIVES_PATH)
 
 # Initialize orchestrator (v0.3.0 - Multi-persona mode)
-persona_registry = PersonaRegistry(SKILLS_DIR)
-orchestrator = SkillOrchestrator(persona_registry)
+persona_registry = PersonaRegistry(SKILLS_DIR, snapshot_path=PERSONA_SNAPSHOT)
+# One query analysis per distinct query, shared by persona selection, MCP suggestions and hints
+query_analyses = QueryAnalysisCache()
+orchestrator = SkillOrchestrator(persona_registry, analyses=query_analyses)
+
+
+def _file_generation(path: Path):
+    """(mtime_ns, size) of a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+# Tools are async; their blocking file I/O runs here instead of on the event loop
+tool_pool = ToolPool()
+
+# Pre-rendered responses of deterministic tools, invalidated when the content they render changes
+response_cache = ResponseCache()
+response_cache.register_source("skills", lambda: skills_fingerprint(SKILLS_DIR))
+response_cache.register_source("rulebook", lambda: _file_generation(DIRECTIVES_PATH))
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def get_engineering_context(
     operation: str = "",
     file_paths: List[str] = None,
     description: str = "",
     session_id: str = "default",
-    project_root: str = None
+    project_root: str = None,
+    max_tokens: int = None
 ) -> str:
     """
     Get relevant Sensei engineering context for the current task.
@@ -58,13 +91,16 @@ def get_engineering_context(
         description: Additional context about the task
         session_id: Session identifier
         project_root: Absolute path to the project root (for local rules/sessions)
+        max_tokens: Approximate token budget for the standards sections. Most
+            relevant sections are loaded in full, the rest as summaries.
+            Default: no limit
 
     Returns:
         Markdown-formatted engineering standards relevant to this task
     """
     # Load session (and local rules if project_root provided)
     session = session_mgr.get_or_create_session(session_id, project_root)
-    rulebook.load_local_rules(project_root)
+    local_rules = rulebook.load_local_rules(project_root)
 
     # Infer relevant contexts
     contexts = ContextInferenceEngine.infer_contexts(
@@ -104,18 +140,43 @@ def get_engineering_context(
     response.append(f"*Loaded {len(section_names)} of 57 available sections based on your task*\n\n")
 
     # Load and append relevant sections
-    relevant_content = rulebook.extract_multiple_sections(section_names)
+    if max_tokens:
+        # Session-relevant, then file-, operation- and keyword-derived sections
+        session_text = " ".join(
+            session.active_constraints + session.patterns_agreed
+            + [f"{dec.description} {dec.rationale}" for dec in session.decisions[-10:]]
+        )
+        prioritized = ContextInferenceEngine.prioritize_contexts(
+            file_paths=file_paths,
+            operation=operation,
+            description=description,
+            session_text=session_text
+        )
+        assembly = rulebook.assemble_sections(
+            [ctx.value for ctx in prioritized], max_tokens, local_rules=local_rules
+        )
+        relevant_content = assembly.content
+    else:
+        relevant_content = rulebook.extract_multiple_sections(section_names, local_rules=local_rules)
     response.append(relevant_content)
 
     # Add footer
     response.append("\n\n---\n")
-    response.append(f"*Token efficiency: ~{len(relevant_content.split())} words loaded vs ~15,000 full rulebook*\n")
+    if max_tokens:
+        response.append(f"*Token budget: ~{assembly.tokens:,} of {max_tokens:,} tokens | "
+                        f"{len(assembly.full)} sections in full, {len(assembly.summarized)} summarized, "
+                        f"{len(assembly.omitted)} omitted*\n")
+        if assembly.omitted:
+            response.append(f"*Omitted: {', '.join(assembly.omitted)} (use `query_specific_standard`)*\n")
+    else:
+        response.append(f"*Token efficiency: ~{len(relevant_content.split())} words loaded vs ~15,000 full rulebook*\n")
     response.append(f"*Session: {session_id} | Last updated: {session.last_updated}*\n")
 
     return "\n".join(response)
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def record_decision(
     category: str,
     description: str,
@@ -140,24 +201,26 @@ def record_decision(
     Returns:
         Confirmation message with decision ID
     """
-    session = session_mgr.get_or_create_session(session_id, project_root)
-
-    decision = session_mgr.add_decision(
-        category=category,
-        description=description,
-        rationale=rationale,
-        context={"constraint": constraint, "pattern": pattern},
-        project_root=project_root
-    )
+    # One write for the decision and any constraint/pattern it adds
+    with session_mgr.batch():
+        session = session_mgr.get_or_create_session(session_id, project_root)
+
+        decision = session_mgr.add_decision(
+            category=category,
+            description=description,
+            rationale=rationale,
+            context={"constraint": constraint, "pattern": pattern},
+            project_root=project_root
+        )
 
-    # Update session constraints/patterns
-    if constraint and constraint not in session.active_constraints:
-        session.active_constraints.append(constraint)
-        session_mgr.save_session()
+        # Update session constraints/patterns
+        if constraint and constraint not in session.active_constraints:
+            session.active_constraints.append(constraint)
+            session_mgr.save_session()
 
-    if pattern and pattern not in session.patterns_agreed:
-        session.patterns_agreed.append(pattern)
-        session_mgr.save_session()
+        if pattern and pattern not in session.patterns_agreed:
+            session.patterns_agreed.append(pattern)
+            session_mgr.save_session()
 
     return f"""✅ Decision recorded: {decision.id}
 
@@ -170,6 +233,7 @@ This will be remembered for the rest of the session and included in future conte
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def validate_against_standards(
     code_snippet: str = None,
     design_description: str = None,
@@ -191,7 +255,7 @@ def validate_against_standards(
         Structured validation report
     """
     session = session_mgr.get_or_create_session(session_id, project_root)
-    rulebook.load_local_rules(project_root)
+    local_rules = rulebook.load_local_rules(project_root)
 
     report = ["# 🔍 Standards Validation Report\n"]
 
@@ -230,7 +294,7 @@ def validate_against_standards(
 
     if contexts:
         section_names = [ctx.value for ctx in contexts]
-        relevant_content = rulebook.extract_multiple_sections(section_names)
+        relevant_content = rulebook.extract_multiple_sections(section_names, local_rules=local_rules)
 
         report.append(f"\n## 📚 Applicable Standards ({len(contexts)} sections)\n")
         report.append(relevant_content)
@@ -239,6 +303,7 @@ def validate_against_standards(
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def get_session_summary(session_id: str = "default", project_root: str = None) -> str:
     """
     Get a summary of the current session's decisions and context.
@@ -283,23 +348,13 @@ def get_session_summary(session_id: str = "default", project_root: str = None) -
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def list_sessions() -> str:
     """
     List all available sessions in the global directory.
     (Note: Does not list local project sessions)
     """
-    sessions = []
-    for session_file in SESSION_DIR.glob("*.json"):
-        try:
-            with open(session_file, 'r') as f:
-                data = json.load(f)
-                sessions.append({
-                    'id': data['session_id'],
-                    'updated': data['last_updated'],
-                    'decisions': len(data['decisions'])
-                })
-        except (json.JSONDecodeError, KeyError):
-            continue
+    sessions = session_mgr.list_sessions()
 
     if not sessions:
         return "No global sessions found."
@@ -312,6 +367,7 @@ def list_sessions() -> str:
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def query_specific_standard(
     section_name: str,
     session_id: str = "default",
@@ -319,13 +375,19 @@ def query_specific_standard(
 ) -> str:
     """Query a specific section of the rulebook directly by name."""
     session_mgr.get_or_create_session(session_id, project_root)
-    rulebook.load_local_rules(project_root)
+    local_rules = rulebook.load_local_rules(project_root)
+
+    return _render_standard(section_name, local_rules)
+
 
-    content = rulebook.extract_section(section_name)
+@response_cache.cached("rulebook", name="query_specific_standard")
+def _render_standard(section_name: str, local_rules: Optional[str]) -> str:
+    content = rulebook.extract_section(section_name, local_rules=local_rules)
     return f"# 📖 Section: {section_name}\n\n{content}"
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def check_consistency(
     proposed_change: str,
     session_id: str = "default",
@@ -432,8 +494,35 @@ def _suggest_personas_for_contexts(contexts, files):
     return unique_suggestions[:5]  # Top 5 suggestions
 
 
+async def _git(project_root: str, *args: str) -> str:
+    """Stdout of a git command run in project_root, without blocking the event loop."""
+    process = await asyncio.create_subprocess_exec(
+        "git", *args,
+        cwd=project_root,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), GIT_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"git {' '.join(args)} took longer than {GIT_TIMEOUT:g}s") from None
+    finally:
+        if process.returncode is None:  # Timed out or the call was cancelled
+            process.kill()
+            await process.wait()
+    return stdout.decode("utf-8", "replace")
+
+
+async def _git_staged_or_head(project_root: str, *args: str) -> str:
+    """``git diff --staged ARGS``, or ``git diff HEAD ARGS`` if nothing is staged."""
+    output = await _git(project_root, "diff", "--staged", *args)
+    if not output.strip():
+        output = await _git(project_root, "diff", "HEAD", *args)
+    return output.strip()
+
+
 @mcp.tool()
-def analyze_changes(
+async def analyze_changes(
     project_root: str,
     include_diff_stats: bool = True,
     suggest_personas: bool = True
@@ -453,100 +542,118 @@ def analyze_changes(
         return "❌ Project root is required for git analysis."
 
     try:
-        # Run git diff --name-only --staged
-        result = subprocess.run(
-            ["git", "diff", "--name-only", "--staged"],
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            check=False
-        )
-
-        # If no staged changes, try HEAD (last commit)
-        if not result.stdout.strip():
-             result = subprocess.run(
-                ["git", "diff", "--name-only", "HEAD"],
-                cwd=project_root,
-                capture_output=True,
-                text=True,
-                check=False
-            )
+        # Changed file names and diff stats (v0.5.0) are independent: run git for both at once.
+        # Staged changes first; if there are none, HEAD (last commit)
+        names = _git_staged_or_head(project_root, "--name-only")
+        if include_diff_stats:
+            names, diff_stats = await asyncio.gather(names, _git_staged_or_head(project_root, "--stat"))
+        else:
+            names, diff_stats = await names, None
 
-        files = result.stdout.strip().splitlines()
+        files = names.splitlines()
 
         if not files:
             return "No changed files found (checked staged and HEAD)."
 
-        # Get diff stats if requested (v0.5.0)
-        diff_stats = None
-        if include_diff_stats:
-            stats_result = subprocess.run(
-                ["git", "diff", "--staged", "--stat"],
-                cwd=project_root,
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            if not stats_result.stdout.strip():
-                stats_result = subprocess.run(
-                    ["git", "diff", "HEAD", "--stat"],
-                    cwd=project_root,
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-            diff_stats = stats_result.stdout.strip()
-
-        # Infer context for these files
-        contexts = ContextInferenceEngine.infer_contexts(file_paths=files)
-        section_names = [ctx.value for ctx in contexts]
-
-        # Build report
-        report = ["# 🕵️ Git Change Analysis (v0.5.0)\n\n"]
-        report.append(f"**Analyzed {len(files)} changed files:**\n")
-        for f in files[:10]: # Limit to 10 files
-            report.append(f"- `{f}`\n")
-        if len(files) > 10:
-            report.append(f"...and {len(files)-10} more\n")
-
-        # Add diff stats (v0.5.0)
-        if diff_stats:
-            report.append(f"\n**Change Statistics:**\n```\n{diff_stats}\n```\n")
-
-        report.append(f"\n**Inferred Contexts ({len(contexts)}):**\n")
-        for ctx in section_names:
-            report.append(f"- {ctx}\n")
-
-        # Suggest personas based on contexts (v0.5.0)
-        if suggest_personas:
-            persona_suggestions = _suggest_personas_for_contexts(contexts, files)
-            if persona_suggestions:
-                report.append("\n**🎭 Recommended Personas for Review:**\n")
-                for persona, reason in persona_suggestions:
-                    report.append(f"- `{persona}`: {reason}\n")
-
-                # Provide example command
-                persona_list = [p for p, _ in persona_suggestions[:3]]
-                report.append(f"\n**Example Command:**\n")
-                report.append(f"```python\n")
-                report.append(f"get_engineering_guidance(\n")
-                report.append(f'    query="Review these changes for quality and impact",\n')
-                report.append(f"    specific_personas={persona_list}\n")
-                report.append(f")\n```\n")
-
-        report.append("\n**Alternative:**\n")
-        report.append(f"Run `get_engineering_context(file_paths={files[:5]})` to load standards for these contexts.")
-
-        return "".join(report)
+        return await tool_pool.run(_change_report, files, diff_stats, suggest_personas)
 
     except Exception as e:
         return f"❌ Error running git analysis: {str(e)}"
 
 
+def _change_report(files: List[str], diff_stats: Optional[str], suggest_personas: bool) -> str:
+    """analyze_changes report: inferred contexts and suggested personas for the changed files."""
+    # Infer context for these files
+    contexts = ContextInferenceEngine.infer_contexts(file_paths=files)
+    section_names = [ctx.value for ctx in contexts]
+
+    # Build report
+    report = ["# 🕵️ Git Change Analysis (v0.5.0)\n\n"]
+    report.append(f"**Analyzed {len(files)} changed files:**\n")
+    for f in files[:10]: # Limit to 10 files
+        report.append(f"- `{f}`\n")
+    if len(files) > 10:
+        report.append(f"...and {len(files)-10} more\n")
+
+    # Add diff stats (v0.5.0)
+    if diff_stats:
+        report.append(f"\n**Change Statistics:**\n```\n{diff_stats}\n```\n")
+
+    report.append(f"\n**Inferred Contexts ({len(contexts)}):**\n")
+    for ctx in section_names:
+        report.append(f"- {ctx}\n")
+
+    # Suggest personas based on contexts (v0.5.0)
+    if suggest_personas:
+        persona_suggestions = _suggest_personas_for_contexts(contexts, files)
+        if persona_suggestions:
+            report.append("\n**🎭 Recommended Personas for Review:**\n")
+            for persona, reason in persona_suggestions:
+                report.append(f"- `{persona}`: {reason}\n")
+
+            # Provide example command
+            persona_list = [p for p, _ in persona_suggestions[:3]]
+            report.append(f"\n**Example Command:**\n")
+            report.append(f"```python\n")
+            report.append(f"get_engineering_guidance(\n")
+            report.append(f'    query="Review these changes for quality and impact",\n')
+            report.append(f"    specific_personas={persona_list}\n")
+            report.append(f")\n```\n")
+
+    report.append("\n**Alternative:**\n")
+    report.append(f"Run `get_engineering_context(file_paths={files[:5]})` to load standards for these contexts.")
+
+    return "".join(report)
+
+
 # ============================================================================
 # v0.3.0 NEW TOOLS - Multi-Persona Orchestration
 # ============================================================================
 
+# Context hint: context → personas to suggest
+_HINT_CONTEXT_SUGGESTIONS = {
+    'SECURITY': ['security-sentinel', 'compliance-guardian', 'api-platform-engineer'],
+    'CRISIS': ['incident-commander', 'site-reliability-engineer', 'executive-liaison'],
+    'ARCHITECTURAL': ['pragmatic-architect', 'snarky-senior-engineer', 'product-engineering-lead'],
+    'COST': ['finops-optimizer', 'site-reliability-engineer', 'pragmatic-architect'],
+    'DATABASE': ['data-engineer', 'pragmatic-architect', 'site-reliability-engineer'],
+    'TECHNICAL': ['snarky-senior-engineer', 'legacy-archaeologist', 'qa-automation-engineer'],
+    'API': ['api-platform-engineer', 'security-sentinel', 'pragmatic-architect'],
+    'FRONTEND': ['frontend-ux-specialist', 'devex-champion', 'qa-automation-engineer'],
+    'MOBILE': ['mobile-platform-engineer', 'frontend-ux-specialist', 'qa-automation-engineer'],
+    'DATA': ['data-engineer', 'pragmatic-architect', 'observability-engineer'],
+    'ML': ['ml-pragmatist', 'data-engineer', 'pragmatic-architect'],
+    'TEAM': ['empathetic-team-lead', 'product-engineering-lead', 'devex-champion'],
+}
+
+# Context hint: keyword → more specific context (first match wins)
+_HINT_KEYWORDS = {
+    'database': 'DATABASE',
+    'sql': 'DATABASE',
+    'postgres': 'DATABASE',
+    'mongodb': 'DATABASE',
+    'api': 'API',
+    'endpoint': 'API',
+    'rest': 'API',
+    'graphql': 'API',
+    'security': 'SECURITY',
+    'vulnerability': 'SECURITY',
+    'auth': 'SECURITY',
+    'frontend': 'FRONTEND',
+    'react': 'FRONTEND',
+    'vue': 'FRONTEND',
+    'mobile': 'MOBILE',
+    'ios': 'MOBILE',
+    'android': 'MOBILE',
+    'machine learning': 'ML',
+    'model': 'ML',
+    'training': 'ML',
+    'team': 'TEAM',
+    'culture': 'TEAM',
+    'hiring': 'TEAM',
+}
+
+
 def _generate_context_hint(query: str, context: str, num_personas: int) -> str:
     """
     Generate helpful hints when few personas were selected (v0.5.0).
@@ -565,59 +672,18 @@ def _generate_context_hint(query: str, context: str, num_personas: int) -> str:
     if num_personas >= 2:
         return ""
 
-    # Context-based suggestions
-    context_suggestions = {
-        'SECURITY': ['security-sentinel', 'compliance-guardian', 'api-platform-engineer'],
-        'CRISIS': ['incident-commander', 'site-reliability-engineer', 'executive-liaison'],
-        'ARCHITECTURAL': ['pragmatic-architect', 'snarky-senior-engineer', 'product-engineering-lead'],
-        'COST': ['finops-optimizer', 'site-reliability-engineer', 'pragmatic-architect'],
-        'DATABASE': ['data-engineer', 'pragmatic-architect', 'site-reliability-engineer'],
-        'TECHNICAL': ['snarky-senior-engineer', 'legacy-archaeologist', 'qa-automation-engineer'],
-        'API': ['api-platform-engineer', 'security-sentinel', 'pragmatic-architect'],
-        'FRONTEND': ['frontend-ux-specialist', 'devex-champion', 'qa-automation-engineer'],
-        'MOBILE': ['mobile-platform-engineer', 'frontend-ux-specialist', 'qa-automation-engineer'],
-        'DATA': ['data-engineer', 'pragmatic-architect', 'observability-engineer'],
-        'ML': ['ml-pragmatist', 'data-engineer', 'pragmatic-architect'],
-        'TEAM': ['empathetic-team-lead', 'product-engineering-lead', 'devex-champion'],
-    }
-
-    # Keyword-based detection
-    query_lower = query.lower()
-    keywords_map = {
-        'database': 'DATABASE',
-        'sql': 'DATABASE',
-        'postgres': 'DATABASE',
-        'mongodb': 'DATABASE',
-        'api': 'API',
-        'endpoint': 'API',
-        'rest': 'API',
-        'graphql': 'API',
-        'security': 'SECURITY',
-        'vulnerability': 'SECURITY',
-        'auth': 'SECURITY',
-        'frontend': 'FRONTEND',
-        'react': 'FRONTEND',
-        'vue': 'FRONTEND',
-        'mobile': 'MOBILE',
-        'ios': 'MOBILE',
-        'android': 'MOBILE',
-        'machine learning': 'ML',
-        'model': 'ML',
-        'training': 'ML',
-        'team': 'TEAM',
-        'culture': 'TEAM',
-        'hiring': 'TEAM',
-    }
+    # Keyword-based detection (scanned once per query, cached on the query analysis)
+    analysis = query_analyses.get(query)
+    if analysis.hint_context is None:
+        analysis.hint_context = next(
+            (ctx for keyword, ctx in _HINT_KEYWORDS.items() if keyword in analysis.normalized), ''
+        )
 
     # Try to find more specific context from keywords
-    suggested_context = context
-    for keyword, ctx in keywords_map.items():
-        if keyword in query_lower:
-            suggested_context = ctx
-            break
+    suggested_context = analysis.hint_context or context
 
     # Get suggestions for this context
-    suggestions = context_suggestions.get(suggested_context, [])
+    suggestions = _HINT_CONTEXT_SUGGESTIONS.get(suggested_context, [])
 
     if suggestions:
         hint = f"\n\n💡 **Context Hint:** This looks like a {suggested_context} question. "
@@ -631,6 +697,7 @@ def _generate_context_hint(query: str, context: str, num_personas: int) -> str:
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def get_engineering_guidance(
     query: str,
     mode: str = "orchestrated",
@@ -695,7 +762,7 @@ def get_engineering_guidance(
 
     # Standards mode (legacy) - delegate to get_engineering_context
     if mode == "standards":
-        return get_engineering_context(
+        return get_engineering_context.blocking(
             operation="",
             file_paths=None,
             description=query,
@@ -748,6 +815,7 @@ def get_engineering_guidance(
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def consult_skill(
     skill_name: str,
     query: str,
@@ -815,6 +883,8 @@ def consult_skill(
 
 
 @mcp.tool()
+@tool_pool.offloaded
+@response_cache.cached("skills")
 def list_available_skills(
     category: str = None,
     format: str = "standard"
@@ -907,10 +977,61 @@ def list_available_skills(
 # v0.6.0 NEW TOOLS - Option B: Granular Persona Content Access
 # ============================================================================
 
+PERSONA_CONTENT_MODES = ("full", "digest", "outline")
+
+
+def _persona_outline(persona, exclude=()) -> str:
+    """One line per numbered section: number, title and approximate size."""
+    return "".join(
+        f"- §{section.number} {section.title} (~{(section.end - section.start + 3) // 4:,} tokens)\n"
+        for section in persona.sections if section.number not in exclude
+    )
+
+
+def _persona_digest(persona) -> str:
+    """Core principles (§0) and personality (§1), plus an outline of the remaining sections."""
+    found = [section for section in map(persona.find_section, ("0", "1")) if section]
+    result = [persona.section_content(section).rstrip("\n") + "\n\n" for section in found]
+    if not found:
+        # Skill without the standard numbering: use what the loader extracted
+        if persona.core_principles:
+            result.append("## Core Principles\n\n")
+            result.extend(f"{i}. {principle}\n" for i, principle in enumerate(persona.core_principles, 1))
+            result.append("\n")
+        if persona.personality:
+            result.append(f"## Personality & Tone\n\n{persona.personality}\n\n")
+    outline = _persona_outline(persona, exclude={section.number for section in found})
+    if outline:
+        result.append(f"## Other Sections\n\n{outline}\n")
+        result.append(f'Fetch any of them with `get_persona_content(persona_name="{persona.name}", section="N")`.\n')
+    return "".join(result)
+
+
+def _persona_sections(persona, section: str):
+    """Sections named by ``section``: one number or title, or a comma-separated list."""
+    whole = persona.find_section(section)
+    if whole:
+        return [whole], []  # Titles may contain commas ("Risk, Compliance & Data Governance")
+    found, missing = [], []
+    for key in filter(None, (part.strip() for part in section.split(","))):
+        match = persona.find_section(key)
+        if match is None:
+            missing.append(key)
+        elif match not in found:
+            found.append(match)
+    return found, missing
+
+
 @mcp.tool()
+@tool_pool.offloaded
+@response_cache.cached("skills")
 def get_persona_content(
     persona_name: str,
-    include_metadata: bool = True
+    include_metadata: bool = True,
+    mode: str = "full",
+    section: str = None,
+    cursor: str = None,
+    max_chars: int = None
 ) -> str:
     """
     Get full skill content for a specific persona.
@@ -919,6 +1040,10 @@ def get_persona_content(
     expertise, principles, personality, and guidelines. The calling LLM
     should use this content to analyze queries from that persona's perspective.
 
+    Large skills can be fetched in parts: an outline of the numbered
+    sections, a digest (core principles + personality), individual sections,
+    and pages of at most ``max_chars`` characters.
+
     **MCP Design Philosophy:**
     This tool returns CONTENT for the LLM to use, not pre-generated analysis.
     The calling LLM (Claude) receives the persona content and performs
@@ -927,14 +1052,26 @@ def get_persona_content(
     Args:
         persona_name: Name of persona (e.g., "security-sentinel", "pragmatic-architect")
         include_metadata: Include metadata header (name, description, expertise)
+        mode: What to return:
+            - "full" (DEFAULT): The complete SKILL.md
+            - "digest": Core principles and personality only (§0 and §1), plus an outline
+            - "outline": Section numbers, titles and sizes
+        section: Return only these sections, by number ("4") or title ("APIs & Contracts"),
+            or several separated by commas ("0, 1, 14"). Overrides mode.
+        cursor: Resume a paginated response (the value from the previous page's footer)
+        max_chars: Split the response into pages of at most this many characters
 
     Returns:
-        Full persona skill content (markdown format)
+        Persona skill content (markdown format)
 
     Example:
         # Get Security Sentinel's content
         content = get_persona_content("security-sentinel")
 
+        # Principles and personality, then one section on demand
+        get_persona_content("snarky-senior-engineer", mode="digest")
+        get_persona_content("snarky-senior-engineer", section="APIs & Contracts")
+
         # Claude then uses this content to analyze from that perspective
     """
     persona = persona_registry.get(persona_name)
@@ -943,23 +1080,74 @@ def get_persona_content(
         available = ", ".join(sorted(persona_registry.list_names()))
         return f"❌ Persona '{persona_name}' not found.\n\nAvailable personas: {available}"
 
+    if mode not in PERSONA_CONTENT_MODES:
+        return f"❌ Unknown mode '{mode}'. Available modes: {', '.join(PERSONA_CONTENT_MODES)}"
+    if max_chars is not None and max_chars <= 0:
+        return f"❌ max_chars must be positive (got {max_chars})"
+    try:
+        offset = int(cursor) if cursor else 0
+    except ValueError:
+        offset = -1
+    if offset < 0:
+        return f"❌ Invalid cursor '{cursor}'. Use the cursor from the previous page's footer."
+
+    if section:
+        sections, missing = _persona_sections(persona, section)
+        if missing:
+            return (
+                f"❌ Section(s) not found in '{persona_name}': {', '.join(missing)}\n\n"
+                f"Available sections:\n{_persona_outline(persona)}"
+            )
+        body = "".join(persona.section_content(s).rstrip("\n") + "\n\n" for s in sections)
+    elif mode == "digest":
+        body = _persona_digest(persona)
+    elif mode == "outline":
+        body = f"## Sections\n\n{_persona_outline(persona)}"
+    else:
+        body = persona.full_content
+
     result = []
 
-    # Optional metadata header
-    if include_metadata:
+    # Optional metadata header (first page only)
+    if include_metadata and offset == 0:
         result.append(f"# {persona.name.replace('-', ' ').title()}\n")
         result.append(f"**Description:** {persona.description}\n")
         if persona.expertise_areas:
             result.append(f"**Expertise:** {', '.join(persona.expertise_areas)}\n")
         result.append(f"\n---\n\n")
 
-    # Full skill content (the complete SKILL.md)
-    result.append(persona.full_content)
+    if max_chars is None and not cursor:
+        # Skill content (the complete SKILL.md unless narrowed down)
+        result.append(body)
+        return "".join(result)
+
+    if offset and offset >= len(body):
+        return f"❌ Cursor '{cursor}' is past the end of the content ({len(body):,} characters)."
+    page, next_offset = paginate(body, offset, max_chars or len(body))
+    result.append(page)
+    if next_offset is None:
+        result.append(f"\n\n---\n📄 Characters {offset:,}–{len(body):,} of {len(body):,} (last page)\n")
+    else:
+        arguments = [f'persona_name="{persona_name}"']
+        if not include_metadata:
+            arguments.append("include_metadata=False")
+        if mode != "full":
+            arguments.append(f'mode="{mode}"')
+        if section:
+            arguments.append(f'section="{section}"')
+        arguments.append(f'cursor="{next_offset}"')
+        if max_chars:
+            arguments.append(f"max_chars={max_chars}")
+        result.append(
+            f"\n\n---\n📄 Characters {offset:,}–{next_offset:,} of {len(body):,}. "
+            f"Next page: `get_persona_content({', '.join(arguments)})`\n"
+        )
 
     return "".join(result)
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def suggest_personas_for_query(
     query: str,
     max_suggestions: int = 5,
@@ -968,8 +1156,8 @@ def suggest_personas_for_query(
     """
     Suggest relevant personas for a given query using intelligent selection.
 
-    Uses keyword matching, context detection, and relevance scoring to
-    recommend which personas would be most helpful for the query.
+    Uses context detection and BM25 retrieval over each persona's SKILL.md
+    content to recommend which personas would be most helpful for the query.
 
     **MCP Design Philosophy:**
     This tool helps the LLM discover which personas to consult, but doesn't
@@ -995,9 +1183,10 @@ def suggest_personas_for_query(
         # Returns JSON with suggested personas and why they're relevant
         # LLM then calls get_persona_content() for each suggestion
     """
-    from .context_detector import ContextDetector, QueryContext
+    from .context_detector import QueryContext
 
-    detector = ContextDetector()
+    # Shared with select_personas() below, so the query is only scanned once
+    detector = orchestrator.detector
 
     # Detect context if not provided
     if context_hint:
@@ -1016,19 +1205,27 @@ def suggest_personas_for_query(
         max_personas=max_suggestions
     )
 
+    # Relevance: BM25 score over skill content, relative to the best match
+    search_scores = dict(persona_registry.search(query))
+    best_score = max(search_scores.values(), default=0.0)
+    search_index = persona_registry.search_index()
+
     # Build suggestions with rationale
     suggestions = []
     for persona in personas:
-        relevance = persona.relevance_score(query)
+        relevance = search_scores.get(persona.name, 0.0) / best_score if best_score else 0.0
 
-        # Generate rationale based on expertise match
+        # Generate rationale based on expertise match, then skill content match
         matched_expertise = [
             kw for kw in persona.expertise_areas
             if kw.lower() in query.lower()
         ]
+        matched_terms = search_index.matched_terms(query, persona.name)
 
         if matched_expertise:
             rationale = f"Expert in {', '.join(matched_expertise[:3])}"
+        elif matched_terms:
+            rationale = f"Skill covers {', '.join(matched_terms[:3])}"
         else:
             rationale = f"Relevant for {primary_context.value} context"
 
@@ -1051,6 +1248,7 @@ def suggest_personas_for_query(
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def get_session_context(
     session_id: str = "default",
     project_root: str = None
@@ -1101,6 +1299,7 @@ def get_session_context(
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def record_consultation(
     query: str,
     personas_used: List[str],
@@ -1132,8 +1331,11 @@ def record_consultation(
             synthesis="[Claude's full analysis and recommendation]"
         )
     """
+    # Select the session first: this pool thread's current one may belong to another call
+    session_mgr.get_or_create_session(session_id, project_root)
+
     # Record consultation
-    consultation_id = session_mgr.add_consultation(
+    consultation = session_mgr.add_consultation(
         query=query,
         mode="manual",  # Manual multi-persona consultation
         personas_consulted=personas_used,
@@ -1144,7 +1346,7 @@ def record_consultation(
 
     return f"""✅ Consultation recorded
 
-**ID:** {consultation_id}
+**ID:** {consultation.id}
 **Query:** {query}
 **Personas Used:** {', '.join(personas_used)}
 **Session:** {session_id}
@@ -1158,6 +1360,7 @@ This consultation has been added to session history and will be included in anal
 # ============================================================================
 
 @mcp.tool()
+@tool_pool.offloaded
 def get_session_insights(
     session_id: str = "default",
     project_root: str = None,
@@ -1198,8 +1401,13 @@ def get_session_insights(
             format="json"
         )
     """
-    # Load session
-    session = session_mgr.get_or_create_session(session_id, project_root)
+    # Load session (consultations outside the window are skipped by the store)
+    cutoff = time_range_cutoff(time_range)
+    session = session_mgr.load_session_window(
+        session_id,
+        project_root,
+        since=(cutoff - timedelta(days=1)).date().isoformat() if cutoff else None
+    )
 
     # Analyze
     analyzer = SessionAnalyzer(session)
@@ -1210,6 +1418,7 @@ def get_session_insights(
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def export_consultation(
     consultation_id: str,
     session_id: str = "default",
@@ -1244,16 +1453,11 @@ def export_consultation(
             format="json"
         )
     """
-    # Load session
-    session = session_mgr.get_or_create_session(session_id, project_root)
-
     # Find consultation
-    consultation = next(
-        (c for c in session.consultations if c.id == consultation_id),
-        None
-    )
+    consultation = session_mgr.find_consultation(consultation_id, session_id, project_root)
 
     if not consultation:
+        session = session_mgr.get_or_create_session(session_id, project_root)
         return f"❌ Consultation '{consultation_id}' not found in session '{session_id}'.\n\nAvailable consultations: {', '.join([c.id for c in session.consultations])}"
 
     # Export
@@ -1261,6 +1465,7 @@ def export_consultation(
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def export_session_summary(
     session_id: str = "default",
     project_root: str = None,
@@ -1333,6 +1538,7 @@ merger = SessionMerger()
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def merge_sessions(
     session_ids: List[str],
     target_session_id: str,
@@ -1392,6 +1598,7 @@ def merge_sessions(
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def compare_sessions(
     session_a_id: str,
     session_b_id: str,
@@ -1442,13 +1649,14 @@ from .mcp_orchestrator import MCPOrchestrator
 from .demo_executor import DemoExecutor
 
 # Initialize MCP orchestrator
-mcp_orchestrator = MCPOrchestrator()
+mcp_orchestrator = MCPOrchestrator(analyses=query_analyses)
 
 # Initialize demo executor
 demo_executor = DemoExecutor(mcp_orchestrator)
 
 
 @mcp.tool()
+@tool_pool.offloaded
 def suggest_mcps_for_query(
     query: str,
     context: str = "GENERAL",
@@ -1490,6 +1698,8 @@ def suggest_mcps_for_query(
 
 
 @mcp.tool()
+@tool_pool.offloaded
+@response_cache.cached()
 def get_mcp_workflow_template(
     template_name: str,
     parameters: dict = None
@@ -1537,10 +1747,13 @@ def get_mcp_workflow_template(
         parameters=parameters or {}
     )
 
-    return json.dumps(result, indent=2)
+    # Steps name their MCP server as an MCPServer enum
+    return json.dumps(result, indent=2, default=lambda value: value.value)
 
 
 @mcp.tool()
+@tool_pool.offloaded
+@response_cache.cached()
 def list_mcp_workflow_templates() -> str:
     """
     List all available multi-MCP workflow templates.
@@ -1567,6 +1780,7 @@ def list_mcp_workflow_templates() -> str:
 # ============================================================================
 
 @mcp.tool()
+@tool_pool.offloaded
 def run_demo(
     demo_type: str,
     custom_params: dict = None,
@@ -1637,6 +1851,8 @@ def run_demo(
 
 
 @mcp.tool()
+@tool_pool.offloaded
+@response_cache.cached()
 def list_demos() -> str:
     """
     List all available demonstration workflows.
@@ -1658,6 +1874,28 @@ def list_demos() -> str:
     return json.dumps(demos, indent=2)
 
 
+@mcp.tool()
+async def get_server_stats() -> str:
+    """
+    Report the server's cache statistics.
+
+    Covers the tool response cache (per tool), query analyses, file path
+    classification, loaded sessions and the tool thread pool of the process
+    that answered (one of several with ``--workers``).
+
+    Returns:
+        JSON with hit/miss counters, hit rates and occupancy per cache
+    """
+    return json.dumps({
+        "response_cache": response_cache.stats(),
+        "query_analyses": query_analyses.stats(),
+        "path_classification": ContextInferenceEngine.path_cache.stats(),
+        "sessions": session_mgr.cache_stats(),
+        "tool_pool": tool_pool.stats(),
+        "process": {"pid": os.getpid()},
+    }, indent=2)
+
+
 if __name__ == "__main__":
     # Run the MCP server
     mcp.run()
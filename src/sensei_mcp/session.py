@@ -1,19 +1,169 @@
 import json
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from dataclasses import asdict
+from typing import Optional, Dict, Any, List, Set, Tuple
 
 from .models import SessionState, Decision, Consultation
+from .session_store import SessionStore, SessionEntry, JsonSessionStore, atomic_write_text, session_lock
+
+
+DECISIONS_MD_TITLE = "# Architectural Decisions Log\n"
+
+# decisions.md header: title, marker recording which session's decisions are
+# rendered and how many, last-updated line. Lets new decisions be prepended
+# without re-rendering the rest of the log.
+_DECISIONS_MD_HEADER = re.compile(
+    r"# Architectural Decisions Log\n"
+    r"<!-- sensei:decisions session=(?P<session>.*?) rendered=(?P<count>\d+) -->\n"
+    r"\*Last updated: [^\n]*\*\n\n"
+)
+
+
+@dataclass
+class _CachedSession:
+    """LRU cache entry: a loaded session plus the store token it was loaded at"""
+    session: SessionState
+    token: Any
+    size: int
+
+
+@dataclass
+class _LoadedSession:
+    """The in-memory copy of a session file that tool calls share, and the store token it matches"""
+    ref: "weakref.ReferenceType[SessionState]"
+    token: Any
+
+
+# Base token of a copy that is no longer the shared one: never equals a store
+# token, so writing it always rebases onto the stored version
+_STALE_COPY = object()
+
+
+@dataclass
+class _PendingWrite:
+    """Mutations of one session waiting to be flushed"""
+    session: SessionState
+    project_root: Optional[Path]
+    entries: List[SessionEntry] = field(default_factory=list)
+    full: bool = False  # A full save was requested (state changed beyond appends)
+
+
+def _estimate_session_size(session: SessionState) -> int:
+    """Rough in-memory size of a session in bytes (dominated by free text)"""
+    size = 256
+    for d in session.decisions:
+        size += 128 + len(d.description) + len(d.rationale)
+    for c in session.consultations:
+        size += 128 + len(c.query) + len(c.synthesis)
+    for item in session.active_constraints + session.patterns_agreed:
+        size += 64 + len(item)
+    return size
+
 
 class SessionManager:
-    """Manages session state persistence"""
+    """
+    Manages session state persistence.
+
+    Thread-safe: tools run concurrently on a thread pool. The current session
+    (``current_session``/``current_project_root``) is per thread, so one
+    tool's get_or_create_session() doesn't redirect another tool's
+    add_decision(). Loads, mutations and writes of one session file are
+    serialized by a lock per file, so store I/O and waits for another
+    process's file lock only hold up calls on that session; the manager lock
+    guards just the in-memory bookkeeping (cache, queued writes).
+    """
 
-    def __init__(self, global_session_dir: Path):
+    def __init__(self, global_session_dir: Path, store: Optional[SessionStore] = None,
+                 cache_max_entries: int = 64, cache_max_bytes: int = 64 * 1024 * 1024,
+                 flush_interval: float = 0.0, lock_timeout: float = 10.0,
+                 background_markdown: bool = False):
+        """
+        Args:
+            global_session_dir: Directory for sessions without a project .sensei directory
+            store: Persistence backend (default: JsonSessionStore)
+            cache_max_entries: Max sessions kept in the in-memory LRU (0 disables caching)
+            cache_max_bytes: Max estimated bytes of cached sessions
+            flush_interval: Debounce window in seconds. 0 writes through at the end of
+                each mutation (or batch); > 0 coalesces writes made within the window
+            lock_timeout: Seconds to wait for another process holding a session's lock
+            background_markdown: Render decisions.md in a background writer thread
+        """
         self.global_session_dir = global_session_dir
         self.global_session_dir.mkdir(parents=True, exist_ok=True)
-        self.current_session: Optional[SessionState] = None
-        self.current_project_root: Optional[Path] = None
+        self._local = threading.local()
+
+        # LRU of loaded sessions keyed by (resolved session dir, session_id),
+        # validated against the store's version token on every lookup
+        self.cache_max_entries = cache_max_entries
+        self.cache_max_bytes = cache_max_bytes
+        self._cache: "OrderedDict[Tuple[Path, str], _CachedSession]" = OrderedDict()
+        self._cache_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Write coalescing: mutations are queued per session file and flushed
+        # once per batch() / debounce window. Batches are per thread; a session
+        # file queued inside an open batch is held (not flushed) until it closes
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._file_locks: Dict[Path, threading.RLock] = {}
+        self._pending: Dict[Path, _PendingWrite] = {}
+        self._batch_holds: Dict[Path, int] = {}  # Session file → open batches that queued it
+        self._flush_timer: Optional[threading.Timer] = None
+
+        # Concurrent tool calls share one in-memory copy per session file (held
+        # weakly: it lives while a thread, the cache or a pending write uses it)
+        self._loaded: Dict[Path, _LoadedSession] = {}
+
+        # Other processes may write the same sessions. Writes hold the session
+        # lock and compare the store token with the one the shared copy was
+        # read at; on mismatch (or for an older copy) our mutations are rebased
+        # onto the latest stored version
+        self.lock_timeout = lock_timeout
+
+        # decisions.md projection: (session_id, decision count) last rendered per
+        # path, and the optional single background writer with coalesced jobs
+        self.background_markdown = background_markdown
+        self._decisions_rendered: Dict[Path, Tuple[str, int]] = {}
+        self._markdown_jobs: Dict[Path, SessionState] = {}
+        self._markdown_executor: Optional[ThreadPoolExecutor] = None
+
+        self.store = store or JsonSessionStore()
+
+    @property
+    def current_session(self) -> Optional[SessionState]:
+        """Session the calling thread last loaded (per thread)"""
+        return getattr(self._local, 'session', None)
+
+    @current_session.setter
+    def current_session(self, session: Optional[SessionState]):
+        self._local.session = session
+
+    @property
+    def current_project_root(self) -> Optional[Path]:
+        """Project root of the calling thread's current session"""
+        return getattr(self._local, 'project_root', None)
+
+    @current_project_root.setter
+    def current_project_root(self, project_root: Optional[Path]):
+        self._local.project_root = project_root
+
+    @property
+    def store(self) -> SessionStore:
+        """Persistence backend. Replacing it clears the session cache."""
+        return self._store
+
+    @store.setter
+    def store(self, store: SessionStore):
+        self._store = store
+        self.clear_cache()
 
     def _get_session_path(self, session_id: str, project_root: Optional[str] = None) -> Path:
         """
@@ -21,33 +171,70 @@ class SessionManager:
         If project_root is provided and has a .sensei directory, use that.
         Otherwise use the global session directory.
         """
+        session_file, self.current_project_root = self._resolve_session_path(session_id, project_root)
+        return session_file
+
+    def _resolve_session_path(self, session_id: str,
+                              project_root: Optional[str] = None) -> Tuple[Path, Optional[Path]]:
+        """Side-effect free variant of _get_session_path: (session file, project root or None)"""
         if project_root:
             path = Path(project_root)
             if (path / ".sensei").exists():
-                self.current_project_root = path
-                return path / ".sensei" / f"{session_id}.json"
-        
-        self.current_project_root = None
-        return self.global_session_dir / f"{session_id}.json"
+                return path / ".sensei" / f"{session_id}.json", path
+
+        return self.global_session_dir / f"{session_id}.json", None
 
     def get_or_create_session(self, session_id: str = "default", project_root: Optional[str] = None) -> SessionState:
         """Load existing session or create new one"""
         session_file = self._get_session_path(session_id, project_root)
 
-        if session_file.exists():
-            with open(session_file, 'r') as f:
-                data = json.load(f)
-                self.current_session = SessionState(
-                    session_id=data['session_id'],
-                    started_at=data['started_at'],
-                    decisions=[Decision(**d) for d in data['decisions']],
-                    active_constraints=data['active_constraints'],
-                    patterns_agreed=data['patterns_agreed'],
-                    consultations=[Consultation(**c) for c in data.get('consultations', [])],
-                    last_updated=data['last_updated']
-                )
-        else:
-            self.current_session = SessionState(
+        # Under the file lock, so concurrent loads of one session share one object
+        with self._file_lock(session_file):
+            return self._load_current(session_file, session_id)
+
+    def _file_lock(self, session_file: Path) -> threading.RLock:
+        """Lock serializing this process's loads, mutations and writes of one session file"""
+        with self._lock:
+            lock = self._file_locks.get(session_file)
+            if lock is None:
+                lock = self._file_locks[session_file] = threading.RLock()
+            return lock
+
+    def _load_current(self, session_file: Path, session_id: str) -> SessionState:
+        """Make session_file the current session. Caller holds its file lock."""
+        # Unflushed mutations win over whatever is on disk
+        with self._lock:
+            pending = self._pending.get(session_file)
+        if pending is not None:
+            self.current_session = pending.session
+            return self.current_session
+
+        cache_key = self._cache_key(session_file, session_id)
+        token = self.store.version_token(session_file)
+
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None and token is not None and cached.token == token:
+                self.cache_hits += 1
+                self._cache.move_to_end(cache_key)
+                self.current_session = cached.session
+                return self.current_session
+
+            # Not cached (evicted, caching disabled, or not stored yet) but another
+            # tool call still works on it: share that copy rather than load a second
+            loaded = self._loaded.get(session_file)
+            shared = loaded.ref() if loaded is not None else None
+            if shared is not None and loaded.token == token:
+                self.cache_hits += 1
+                self.current_session = shared
+                return self.current_session
+
+            self.cache_misses += 1
+
+        session = self.store.load(session_file)
+        stored = session is not None
+        if not stored:
+            session = SessionState(
                 session_id=session_id,
                 started_at=datetime.now().isoformat(),
                 decisions=[],
@@ -56,9 +243,108 @@ class SessionManager:
                 consultations=[],
                 last_updated=datetime.now().isoformat()
             )
+        with self._lock:
+            if stored:
+                self._cache_put(cache_key, session, token)
+            self._register(session_file, session, token)
+        self.current_session = session
 
         return self.current_session
 
+    def _register(self, session_file: Path, session: SessionState, token: Any):
+        """Make ``session`` the shared copy of session_file, matching store ``token``"""
+        def forget(ref):
+            with self._lock:
+                loaded = self._loaded.get(session_file)
+                if loaded is not None and loaded.ref is ref:
+                    del self._loaded[session_file]
+
+        self._loaded[session_file] = _LoadedSession(ref=weakref.ref(session, forget), token=token)
+
+    def _base_token(self, session_file: Path, session: SessionState) -> Any:
+        """Store token ``session`` was read or last written at"""
+        loaded = self._loaded.get(session_file)
+        if loaded is None or loaded.ref() is not session:
+            return _STALE_COPY
+        return loaded.token
+
+    @staticmethod
+    def _cache_key(session_file: Path, session_id: str) -> Tuple[Path, str]:
+        return (session_file.parent.resolve(), session_id)
+
+    def _cache_put(self, key: Tuple[Path, str], session: SessionState, token: Any):
+        """Insert/refresh a cache entry and evict least recently used entries over budget"""
+        self._cache_drop(key)
+        if token is None or self.cache_max_entries <= 0:
+            return
+
+        entry = _CachedSession(session=session, token=token, size=_estimate_session_size(session))
+        self._cache[key] = entry
+        self._cache_bytes += entry.size
+
+        while self._cache and (len(self._cache) > self.cache_max_entries
+                               or self._cache_bytes > self.cache_max_bytes):
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= evicted.size
+
+    def _cache_drop(self, key: Tuple[Path, str]):
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._cache_bytes -= entry.size
+
+    def clear_cache(self):
+        """Drop all cached sessions (counters are kept); the next load reads the store"""
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+            self._loaded.clear()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Session cache counters and occupancy"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': round(self.cache_hits / lookups, 3) if lookups else 0.0,
+            'entries': len(self._cache),
+            'bytes': self._cache_bytes,
+            'max_entries': self.cache_max_entries,
+            'max_bytes': self.cache_max_bytes,
+        }
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        """Summaries (id, updated, decisions) of sessions in the global directory"""
+        # Queries go to the store: write what is still queued for it first
+        with self._lock:
+            queued = [f for f in self._pending if f.parent == self.global_session_dir]
+        for session_file in queued:
+            self._flush_file(session_file)
+        return self.store.list_sessions(self.global_session_dir)
+
+    def find_consultation(self, consultation_id: str, session_id: str = "default",
+                          project_root: Optional[str] = None) -> Optional[Consultation]:
+        """Look up one consultation without making its session current"""
+        session_file, _ = self._resolve_session_path(session_id, project_root)
+        self._flush_file(session_file)
+        return self.store.find_consultation(session_file, consultation_id)
+
+    def load_session_window(self, session_id: str = "default", project_root: Optional[str] = None,
+                            since: Optional[str] = None) -> SessionState:
+        """
+        Load a session for read-only analysis, keeping consultations from ``since`` on.
+        Does not change the current session.
+        """
+        session_file, _ = self._resolve_session_path(session_id, project_root)
+        self._flush_file(session_file)
+        session = self.store.load_window(session_file, since)
+        if session is None:
+            now = datetime.now().isoformat()
+            session = SessionState(
+                session_id=session_id, started_at=now, decisions=[], active_constraints=[],
+                patterns_agreed=[], consultations=[], last_updated=now
+            )
+        return session
+
     def save_session(self):
         """Persist current session to disk"""
         if not self.current_session:
@@ -75,44 +361,296 @@ class SessionManager:
         # But for now, let's assume we are saving to the same place we loaded from.
         # To make this robust, let's just re-use the logic if we have the project root.
         
-        session_file = self._get_session_path(self.current_session.session_id, str(self.current_project_root) if self.current_project_root else None)
+        self._persist()
+
+    def _persist(self, entries: Optional[List[SessionEntry]] = None):
+        """
+        Queue the current session for writing and flush unless writes are being coalesced.
+
+        With ``entries`` only those appended records are handed to the store
+        (journaling backends write just those); otherwise the full state is saved.
+        """
+        session_file = self._current_file()
+        with self._file_lock(session_file):
+            self._queue(session_file, entries)
+        self._flush_or_schedule()
+
+    def _current_file(self) -> Path:
+        """Session file of the calling thread's current session"""
+        project_root = str(self.current_project_root) if self.current_project_root else None
+        session_file, _ = self._resolve_session_path(self.current_session.session_id, project_root)
+        return session_file
+
+    def _queue(self, session_file: Path, entries: Optional[List[SessionEntry]] = None):
+        """Queue the current session's mutations. Caller holds the session's file lock."""
         self.current_session.last_updated = datetime.now().isoformat()
 
-        with open(session_file, 'w') as f:
-            data = {
-                'session_id': self.current_session.session_id,
-                'started_at': self.current_session.started_at,
-                'decisions': [asdict(d) for d in self.current_session.decisions],
-                'active_constraints': self.current_session.active_constraints,
-                'patterns_agreed': self.current_session.patterns_agreed,
-                'consultations': [asdict(c) for c in self.current_session.consultations],
-                'last_updated': self.current_session.last_updated
-            }
-            json.dump(data, f, indent=2)
-            
+        with self._lock:
+            if self._batch_depth > 0 and session_file not in self._local.batch_files:
+                self._local.batch_files.add(session_file)
+                self._batch_holds[session_file] = self._batch_holds.get(session_file, 0) + 1
+
+            session = self.current_session
+            pending = self._pending.get(session_file)
+            if pending is None:
+                pending = _PendingWrite(session, self.current_project_root)
+                self._pending[session_file] = pending
+            elif pending.session is not session:
+                # Another copy of this session is queued (e.g. one loaded before
+                # a write from another process): add our records to it
+                self._fold(pending.session, session)
+                self.current_session = pending.session
+
+            if entries:
+                pending.entries.extend(entries)
+            else:
+                pending.full = True
+
+    @contextmanager
+    def batch(self):
+        """
+        Unit of work: mutations inside the block are written once when it exits.
+
+        Usage:
+            with session_mgr.batch():
+                session_mgr.add_decision(...)
+                session.active_constraints.append(...)
+                session_mgr.save_session()
+        """
+        if self._batch_depth == 0:
+            self._local.batch_files = set()
+        self._local.batch_depth = self._batch_depth + 1
+        try:
+            yield self
+        finally:
+            self._local.batch_depth -= 1
+            if self._batch_depth == 0:
+                # Outermost exit: the sessions this batch queued may be written
+                with self._lock:
+                    for session_file in self._local.batch_files:
+                        self._batch_holds[session_file] -= 1
+                        if not self._batch_holds[session_file]:
+                            del self._batch_holds[session_file]
+                self._local.batch_files = set()
+            self._flush_or_schedule()
+
+    @property
+    def _batch_depth(self) -> int:
+        """Nesting depth of the calling thread's open batches"""
+        return getattr(self._local, 'batch_depth', 0)
+
+    def _flush_or_schedule(self):
+        """Flush now, or arm the debounce timer (nothing while this thread's batch is open)"""
+        with self._lock:
+            if not self._pending or self._batch_depth > 0:
+                return
+            if self.flush_interval > 0:
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.flush_interval, self._on_flush_timer)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+                return
+        self.flush()
+
+    def _on_flush_timer(self):
+        with self._lock:
+            self._flush_timer = None
+        self.flush()  # Sessions of open batches are written (or re-timed) when they close
+
+    def flush(self, include_batches: bool = False):
+        """
+        Write queued session mutations (one store write per session).
+
+        Args:
+            include_batches: Also write sessions held by an open batch() (on shutdown)
+        """
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            session_files = list(self._pending)
+
+        for session_file in session_files:
+            self._flush_file(session_file, include_batches)
+
+    def _flush_file(self, session_file: Path, include_batches: bool = False):
+        """Write one session's queued mutations, if any and not held by an open batch"""
+        # Store I/O and waiting for another process only hold up this session
+        with self._file_lock(session_file):
+            with self._lock:
+                if session_file in self._batch_holds and not include_batches:
+                    return  # Written once when the batch closes
+                pending = self._pending.pop(session_file, None)
+            if pending is None:
+                return  # Nothing queued, or written by a concurrent flush
+            try:
+                self._write(session_file, pending)
+            except BaseException:
+                # Keep it (e.g. lock timeout) for the next flush. Nothing
+                # was queued meanwhile: queueing takes the file lock
+                with self._lock:
+                    self._pending[session_file] = pending
+                raise
+
+    def _write(self, session_file: Path, pending: _PendingWrite):
+        """Hand one session's queued mutations to the store. Caller holds its file lock."""
+        with session_lock(session_file, self.lock_timeout):
+            with self._lock:
+                base_token = self._base_token(session_file, pending.session)
+            if self.store.version_token(session_file) != base_token:
+                # Another process wrote this session since we read it, or our
+                # copy was superseded by a newer one
+                self._rebase(session_file, pending)
+
+            session = pending.session
+            if pending.full:
+                self.store.save(session_file, session)
+            else:
+                self.store.append(session_file, session, pending.entries)
+            token = self.store.version_token(session_file)
+
+        with self._lock:
+            self._register(session_file, session, token)
+            # Our own write is the newest version: keep serving it from the cache
+            self._cache_put(self._cache_key(session_file, session.session_id), session, token)
+
         # Also save decisions to Markdown if we are in a project
-        if self.current_project_root:
-            self._save_decisions_md(self.current_project_root / ".sensei" / "decisions.md")
+        if pending.project_root:
+            self._queue_decisions_md(pending.project_root / ".sensei" / "decisions.md", session)
+
+    def _rebase(self, session_file: Path, pending: _PendingWrite):
+        """
+        Re-apply our unsaved records on top of the latest stored session.
+        Caller holds the session lock.
+        """
+        ours = pending.session
+        latest = self.store.load(session_file)
+        if latest is None:
+            return  # Deleted underneath us: our copy is all there is
 
-    def _save_decisions_md(self, path: Path):
-        """Save decisions to a human-readable Markdown file"""
-        if not self.current_session or not self.current_session.decisions:
+        self._fold(latest, ours)
+        pending.session = latest
+        if self.current_session is ours:
+            self.current_session = latest
+
+    @staticmethod
+    def _fold(into: SessionState, ours: SessionState):
+        """
+        Add the records of ``ours`` that ``into`` lacks to ``into``.
+
+        Decisions and consultations are appended with IDs renumbered to
+        follow ``into``; constraints and patterns are unioned.
+        """
+        decision_ids = {}
+        stored = {(d.timestamp, d.description) for d in into.decisions}
+        for decision in ours.decisions:
+            if (decision.timestamp, decision.description) not in stored:
+                new_id = f"dec_{len(into.decisions) + 1}"
+                decision_ids[decision.id] = new_id
+                decision.id = new_id
+                into.decisions.append(decision)
+
+        stored = {(c.timestamp, c.query) for c in into.consultations}
+        for consultation in ours.consultations:
+            if (consultation.timestamp, consultation.query) not in stored:
+                consultation.id = f"consult_{len(into.consultations) + 1}"
+                consultation.decision_id = decision_ids.get(consultation.decision_id, consultation.decision_id)
+                into.consultations.append(consultation)
+
+        for item in ours.active_constraints:
+            if item not in into.active_constraints:
+                into.active_constraints.append(item)
+        for item in ours.patterns_agreed:
+            if item not in into.patterns_agreed:
+                into.patterns_agreed.append(item)
+        into.last_updated = ours.last_updated
+
+    def close(self):
+        """Flush queued writes and finish pending store work before exit"""
+        self.flush(include_batches=True)
+        if self._markdown_executor is not None:
+            self._markdown_executor.shutdown(wait=True)
+            self._markdown_executor = None
+        self.store.close()
+
+    def _queue_decisions_md(self, path: Path, session: SessionState):
+        """Update decisions.md now, or hand it to the background writer"""
+        if not session.decisions:
             return
-            
-        content = ["# Architectural Decisions Log\n"]
-        content.append(f"*Last updated: {datetime.now().isoformat()}*\n\n")
-        
-        for dec in reversed(self.current_session.decisions):
-            content.append(f"## {dec.id}: {dec.description}\n")
-            content.append(f"- **Date:** {dec.timestamp}\n")
-            content.append(f"- **Category:** {dec.category}\n")
-            content.append(f"- **Rationale:** {dec.rationale}\n")
-            if dec.context:
-                content.append(f"- **Context:** {json.dumps(dec.context)}\n")
-            content.append("\n---\n")
-            
-        with open(path, 'w') as f:
-            f.write("".join(content))
+        if self._decisions_rendered.get(path) == (session.session_id, len(session.decisions)):
+            return  # Only consultations/constraints changed
+
+        if not self.background_markdown:
+            self._save_decisions_md(path, session)
+            return
+
+        # The writer gets a snapshot of the decision list; repeated writes
+        # before it runs collapse into one render of the newest snapshot
+        snapshot = replace(session, decisions=list(session.decisions))
+        with self._lock:
+            queued = path in self._markdown_jobs
+            self._markdown_jobs[path] = snapshot
+            if self._markdown_executor is None:
+                self._markdown_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="sensei-decisions-md"
+                )
+        if not queued:
+            self._markdown_executor.submit(self._run_markdown_job, path)
+
+    def _run_markdown_job(self, path: Path):
+        with self._lock:
+            session = self._markdown_jobs.pop(path)
+        self._save_decisions_md(path, session)
+
+    @staticmethod
+    def _render_decision(dec: Decision) -> str:
+        content = [f"## {dec.id}: {dec.description}\n"]
+        content.append(f"- **Date:** {dec.timestamp}\n")
+        content.append(f"- **Category:** {dec.category}\n")
+        content.append(f"- **Rationale:** {dec.rationale}\n")
+        if dec.context:
+            content.append(f"- **Context:** {json.dumps(dec.context)}\n")
+        content.append("\n---\n")
+        return "".join(content)
+
+    def _save_decisions_md(self, path: Path, session: Optional[SessionState] = None):
+        """
+        Save decisions to a human-readable Markdown file (newest first).
+
+        Decisions are append-only, so when the file already renders the first
+        N decisions of this session only the newer ones are rendered and
+        prepended. "Last updated" is the newest decision's timestamp, so the
+        file only changes when decisions do.
+        """
+        session = session or self.current_session
+        if not session or not session.decisions:
+            return
+        decisions = session.decisions
+
+        with session_lock(path, self.lock_timeout):
+            try:
+                existing = path.read_text()
+            except FileNotFoundError:
+                existing = ""
+
+            header = _DECISIONS_MD_HEADER.match(existing)
+            if (header and header.group('session') == session.session_id
+                    and int(header.group('count')) <= len(decisions)):
+                rendered = int(header.group('count'))
+                body = existing[header.end():]
+            else:
+                rendered = 0
+                body = ""
+
+            if rendered < len(decisions):
+                content = [DECISIONS_MD_TITLE]
+                content.append(f"<!-- sensei:decisions session={session.session_id} rendered={len(decisions)} -->\n")
+                content.append(f"*Last updated: {decisions[-1].timestamp}*\n\n")
+                content.extend(self._render_decision(dec) for dec in reversed(decisions[rendered:]))
+                content.append(body)
+                atomic_write_text(path, "".join(content), self.store.durability)
+
+        self._decisions_rendered[path] = (session.session_id, len(decisions))
 
     def add_decision(self, category: str, description: str, rationale: str,
                      context: Dict[str, Any] = None, project_root: Optional[str] = None):
@@ -120,17 +658,20 @@ class SessionManager:
         if not self.current_session:
             self.get_or_create_session(project_root=project_root)
 
-        decision = Decision(
-            id=f"dec_{len(self.current_session.decisions) + 1}",
-            timestamp=datetime.now().isoformat(),
-            category=category,
-            description=description,
-            rationale=rationale,
-            context=context or {}
-        )
-
-        self.current_session.decisions.append(decision)
-        self.save_session()
+        session_file = self._current_file()
+        with self._file_lock(session_file):
+            decision = Decision(
+                id=f"dec_{len(self.current_session.decisions) + 1}",
+                timestamp=datetime.now().isoformat(),
+                category=category,
+                description=description,
+                rationale=rationale,
+                context=context or {}
+            )
+
+            self.current_session.decisions.append(decision)
+            self._queue(session_file, [("decision", decision)])
+        self._flush_or_schedule()
         return decision
 
     def add_consultation(
@@ -147,17 +688,20 @@ class SessionManager:
         if not self.current_session:
             self.get_or_create_session(project_root=project_root)
 
-        consultation = Consultation(
-            id=f"consult_{len(self.current_session.consultations) + 1}",
-            timestamp=datetime.now().isoformat(),
-            query=query,
-            mode=mode,
-            personas_consulted=personas_consulted,
-            context=context,
-            synthesis=synthesis,
-            decision_id=decision_id
-        )
-
-        self.current_session.consultations.append(consultation)
-        self.save_session()
+        session_file = self._current_file()
+        with self._file_lock(session_file):
+            consultation = Consultation(
+                id=f"consult_{len(self.current_session.consultations) + 1}",
+                timestamp=datetime.now().isoformat(),
+                query=query,
+                mode=mode,
+                personas_consulted=personas_consulted,
+                context=context,
+                synthesis=synthesis,
+                decision_id=decision_id
+            )
+
+            self.current_session.consultations.append(consultation)
+            self._queue(session_file, [("consultation", consultation)])
+        self._flush_or_schedule()
         return consultation
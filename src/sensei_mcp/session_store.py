@@ -0,0 +1,959 @@
+"""
+Session storage backends for SessionManager.
+
+The manager owns session semantics (IDs, the current session, decisions.md);
+a store only knows how to persist and restore a SessionState at a path.
+
+Backends:
+- JsonSessionStore: one pretty-printed ``<session>.json`` per session (default)
+- JournalSessionStore: append-only ``<session>.journal.jsonl`` replayed on top
+  of a periodic ``<session>.json`` snapshot
+- SqliteSessionStore: one ``sessions.db`` per session directory with indexed
+  decision/consultation/constraint tables
+
+Writes go to a temp file that is atomically renamed over the target, so a
+crash or a concurrent reader never sees a partial file. JSON documents end
+with a ``_checksum`` member; a reader that finds a torn or corrupted file
+falls back to the previous generation kept as ``<file>.bak``.
+
+session_lock() serializes writers of one session across threads and
+processes (advisory ``fcntl.flock`` on ``<file>.lock``).
+"""
+
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import SessionState, Decision, Consultation
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking is per process only
+    fcntl = None
+
+
+# (kind, record) pairs describing records appended to a session,
+# e.g. ("decision", Decision(...)) or ("consultation", Consultation(...))
+SessionEntry = Tuple[str, Any]
+
+
+def session_to_dict(session: SessionState) -> Dict[str, Any]:
+    """Serialize a SessionState into the on-disk JSON layout."""
+    return {
+        'session_id': session.session_id,
+        'started_at': session.started_at,
+        'decisions': [asdict(d) for d in session.decisions],
+        'active_constraints': list(session.active_constraints),
+        'patterns_agreed': list(session.patterns_agreed),
+        'consultations': [asdict(c) for c in session.consultations],
+        'last_updated': session.last_updated
+    }
+
+
+def session_from_dict(data: Dict[str, Any]) -> SessionState:
+    """Rebuild a SessionState from the on-disk JSON layout."""
+    return SessionState(
+        session_id=data['session_id'],
+        started_at=data['started_at'],
+        decisions=[Decision(**d) for d in data['decisions']],
+        active_constraints=data['active_constraints'],
+        patterns_agreed=data['patterns_agreed'],
+        consultations=[Consultation(**c) for c in data.get('consultations', [])],
+        last_updated=data['last_updated']
+    )
+
+
+def _apply_entry(session: SessionState, kind: str, record: Dict[str, Any]):
+    """Apply a single journaled record to a session in memory."""
+    if kind == 'decision':
+        session.decisions.append(Decision(**record))
+    elif kind == 'consultation':
+        session.consultations.append(Consultation(**record))
+
+
+def _file_token(path: Path) -> Optional[Tuple[int, int, int]]:
+    """(inode, mtime_ns, size) of a file, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+# How hard a write tries to reach stable storage before returning:
+#   none - atomic rename only; a crash may lose the latest write, never tear it
+#   file - fsync the temp file before renaming it into place
+#   dir  - also fsync the directory so the rename itself survives power loss
+DURABILITY_POLICIES = ('none', 'file', 'dir')
+
+# Last member of every JSON document we write: "_checksum": "crc32:<hex>"
+CHECKSUM_KEY = '_checksum'
+_CHECKSUM_SEPARATOR = ',\n  "' + CHECKSUM_KEY + '": "'
+
+
+def _fsync_dir(directory: Path):
+    """Flush a directory entry (renames) to disk where the platform allows it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # Directories can't be opened on Windows
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _tmp_path(path: Path) -> Path:
+    """Temp file next to ``path``, unique per process and thread."""
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def atomic_write_text(path: Path, text: str, durability: str = 'none'):
+    """Replace a file's content via a temp file so readers never see a partial write."""
+    tmp_path = _tmp_path(path)
+    try:
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+            if durability != 'none':
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if durability == 'dir':
+        _fsync_dir(path.parent)
+
+
+def _backup_path(path: Path) -> Path:
+    return path.with_name(path.name + ".bak")
+
+
+def _keep_backup(path: Path):
+    """Hard-link the current generation of ``path`` to ``<path>.bak`` (no copy)."""
+    backup_tmp = _tmp_path(_backup_path(path))
+    try:
+        os.link(path, backup_tmp)
+        os.replace(backup_tmp, _backup_path(path))
+    except FileNotFoundError:
+        pass  # Nothing written yet
+    except OSError:
+        backup_tmp.unlink(missing_ok=True)  # Filesystem without hard links
+
+
+def dump_checksummed(data: Dict[str, Any]) -> str:
+    """Serialize ``data`` as indented JSON ending with a checksum member."""
+    body = json.dumps(data, indent=2)
+    checksum = zlib.crc32(body.encode())
+    # body ends with "\n}"; splice the checksum in as the last member
+    return f'{body[:-2]}{_CHECKSUM_SEPARATOR}crc32:{checksum:08x}"\n}}'
+
+
+def parse_checksummed(text: str) -> Dict[str, Any]:
+    """
+    Parse a document written by dump_checksummed().
+
+    Documents without a checksum (written by older versions) are accepted.
+
+    Raises:
+        ValueError: If the document is truncated or fails its checksum
+    """
+    data = json.loads(text)
+    expected = data.pop(CHECKSUM_KEY, None)
+    if expected is None:
+        return data
+
+    split = text.rfind(_CHECKSUM_SEPARATOR)
+    body = text[:split] + "\n}"
+    if split == -1 or f"crc32:{zlib.crc32(body.encode()):08x}" != expected:
+        raise ValueError("checksum mismatch")
+    return data
+
+
+def write_json_document(path: Path, data: Dict[str, Any], durability: str = 'none'):
+    """Atomically write a checksummed JSON document, keeping the previous one as .bak."""
+    text = dump_checksummed(data)
+    _keep_backup(path)
+    atomic_write_text(path, text, durability)
+
+
+def read_json_document(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Read a JSON document, recovering from ``<path>.bak`` if it is torn.
+
+    Returns:
+        The document, or None if ``path`` doesn't exist
+
+    Raises:
+        ValueError: If both the document and its backup are unreadable
+    """
+    try:
+        text = path.read_text()
+    except FileNotFoundError:
+        return None
+
+    try:
+        return parse_checksummed(text)
+    except ValueError as error:
+        backup = _backup_path(path)
+        try:
+            data = parse_checksummed(backup.read_text())
+        except (OSError, ValueError):
+            raise ValueError(f"{path} is corrupt ({error}) and has no usable backup") from error
+        print(f"Warning: {path.name} is corrupt ({error}); using previous version from {backup.name}",
+              file=sys.stderr)
+        return data
+
+
+class SessionLockTimeout(TimeoutError):
+    """Raised when a session lock can't be acquired within the timeout."""
+
+
+class _SessionFileLock:
+    """
+    Advisory lock on ``<session>.lock``, reentrant within a process.
+
+    The thread lock serializes threads of this process; the first (outermost)
+    acquisition also takes an exclusive flock so other processes wait.
+    """
+
+    def __init__(self, lock_path: Path):
+        self.lock_path = lock_path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self, timeout: float):
+        deadline = time.monotonic() + timeout
+        if not self._thread_lock.acquire(timeout=timeout):
+            raise SessionLockTimeout(f"Timed out waiting for {self.lock_path}")
+
+        if self._depth == 0 and fcntl is not None:
+            try:
+                self._fd = self._lock_file(deadline)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def _lock_file(self, deadline: float) -> int:
+        """Open the lock file and flock it, backing off until the deadline."""
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        delay = 0.001
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise SessionLockTimeout(f"Timed out waiting for {self.lock_path}")
+                # Jittered exponential backoff keeps contending writers from lockstepping
+                time.sleep(delay * random.uniform(0.5, 1.5))
+                delay = min(delay * 2, 0.05)
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+
+_session_locks: Dict[Path, _SessionFileLock] = {}
+_session_locks_guard = threading.Lock()
+
+
+@contextmanager
+def session_lock(session_file: Path, timeout: float = 10.0):
+    """
+    Hold the exclusive lock for one session across threads and processes.
+
+    Reentrant for the holding thread, so store methods can take it again
+    while SessionManager holds it around a read-modify-write.
+
+    Args:
+        session_file: Canonical ``<session>.json`` path for the session
+        timeout: Seconds to wait before raising SessionLockTimeout
+    """
+    lock_path = session_file.with_name(session_file.name + ".lock")
+    with _session_locks_guard:
+        lock = _session_locks.get(lock_path)
+        if lock is None:
+            lock = _session_locks[lock_path] = _SessionFileLock(lock_path)
+
+    lock.acquire(timeout)
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+class SessionStore(ABC):
+    """
+    Base class for session persistence backends.
+
+    Subclasses implement load() and save(); append() lets a backend persist
+    newly added records more cheaply than a full save.
+    """
+
+    durability = 'none'
+
+    def __init__(self, durability: str = 'none'):
+        """
+        Args:
+            durability: Write durability policy, one of DURABILITY_POLICIES
+        """
+        if durability not in DURABILITY_POLICIES:
+            raise ValueError(f"Unknown durability policy {durability!r} "
+                             f"(expected one of {', '.join(DURABILITY_POLICIES)})")
+        self.durability = durability
+
+    @abstractmethod
+    def load(self, session_file: Path) -> Optional[SessionState]:
+        """
+        Load a session.
+
+        Args:
+            session_file: Canonical ``<session>.json`` path for the session
+
+        Returns:
+            The stored SessionState, or None if the session does not exist
+        """
+
+    @abstractmethod
+    def save(self, session_file: Path, session: SessionState):
+        """Persist the complete session state."""
+
+    def append(self, session_file: Path, session: SessionState, entries: List[SessionEntry]):
+        """
+        Persist records that were just appended to ``session``.
+
+        ``session`` already contains the entries. The default implementation
+        falls back to a full save.
+        """
+        self.save(session_file, session)
+
+    def version_token(self, session_file: Path) -> Optional[Any]:
+        """
+        Cheap token that changes whenever the stored session changes.
+
+        SessionManager compares tokens to decide whether a cached SessionState
+        is still current. None means the session isn't stored (never cached).
+        """
+        return _file_token(session_file)
+
+    def list_sessions(self, session_dir: Path) -> List[Dict[str, Any]]:
+        """
+        Summarize the sessions stored in a directory.
+
+        Returns:
+            List of dicts with keys: id, updated, decisions
+        """
+        sessions = []
+        for session_file in session_dir.glob("*.json"):
+            try:
+                session = self.load(session_file)
+            except (ValueError, KeyError, TypeError):
+                continue
+            if session:
+                sessions.append({
+                    'id': session.session_id,
+                    'updated': session.last_updated,
+                    'decisions': len(session.decisions)
+                })
+        return sessions
+
+    def find_consultation(self, session_file: Path, consultation_id: str) -> Optional[Consultation]:
+        """Look up a single consultation by ID."""
+        session = self.load(session_file)
+        if not session:
+            return None
+        return next((c for c in session.consultations if c.id == consultation_id), None)
+
+    def load_window(self, session_file: Path, since: Optional[str] = None) -> Optional[SessionState]:
+        """
+        Load a session keeping only consultations at or after ``since``.
+
+        ``since`` is an ISO date/timestamp; it is a coarse prefilter and callers
+        still apply their exact time filtering.
+        """
+        session = self.load(session_file)
+        if session and since:
+            session.consultations = [c for c in session.consultations if c.timestamp >= since]
+        return session
+
+    def close(self):
+        """Flush any background work. Called on server shutdown."""
+
+
+class JsonSessionStore(SessionStore):
+    """Stores each session as a single pretty-printed JSON document."""
+
+    def load(self, session_file: Path) -> Optional[SessionState]:
+        data = read_json_document(session_file)
+        return session_from_dict(data) if data is not None else None
+
+    def save(self, session_file: Path, session: SessionState):
+        write_json_document(session_file, session_to_dict(session), self.durability)
+
+
+class _JournalState:
+    """Per-session bookkeeping for JournalSessionStore."""
+
+    def __init__(self, seq: int = 0):
+        self.seq = seq                  # Sequence number of the last journaled entry
+        self.snapshot_seq = seq         # Sequence number covered by the snapshot on disk
+        self.since_snapshot = 0         # Entries appended since the last snapshot
+        self.compacting = False
+
+
+class JournalSessionStore(SessionStore):
+    """
+    Append-only session storage.
+
+    Every appended decision/consultation becomes one JSON line in
+    ``<session>.journal.jsonl``. Loading reads the ``<session>.json`` snapshot
+    and replays journal lines newer than the snapshot's ``journal_seq``.
+    After ``snapshot_every`` appends the session is compacted: a fresh
+    snapshot is written (in a background thread by default) and the
+    journal is trimmed to the entries the snapshot doesn't cover yet.
+
+    Existing ``<session>.json`` files written by JsonSessionStore are valid
+    snapshots, so current sessions migrate without conversion.
+    """
+
+    JOURNAL_SUFFIX = ".journal.jsonl"
+
+    def __init__(self, snapshot_every: int = 200, background_compaction: bool = True,
+                 durability: str = 'none'):
+        """
+        Args:
+            snapshot_every: Appends between snapshots (compaction threshold)
+            background_compaction: Write snapshots in a background thread
+            durability: Write durability policy; 'file'/'dir' also fsync appends
+        """
+        super().__init__(durability)
+        self.snapshot_every = snapshot_every
+        self.background_compaction = background_compaction
+        self._lock = threading.Lock()
+        self._states: Dict[Path, _JournalState] = {}
+        self._threads: List[threading.Thread] = []
+        # Session file → (file token after our own compaction, token before it).
+        # Compaction rewrites the files but not the session, so it must not
+        # look like a write from another process
+        self._compacted: Dict[Path, Tuple[Any, Any]] = {}
+
+    def journal_path(self, session_file: Path) -> Path:
+        """Journal file that accompanies a session snapshot."""
+        return session_file.with_name(session_file.stem + self.JOURNAL_SUFFIX)
+
+    def version_token(self, session_file: Path) -> Optional[Any]:
+        with self._lock:
+            return self._version_token(session_file)
+
+    def _version_token(self, session_file: Path) -> Optional[Any]:
+        """version_token(), keeping the pre-compaction token. Caller holds the lock."""
+        token = self._file_tokens(session_file)
+        compacted = self._compacted.get(session_file)
+        if compacted is not None and compacted[0] == token:
+            return compacted[1]
+        return token
+
+    def _file_tokens(self, session_file: Path) -> Optional[Any]:
+        snapshot = _file_token(session_file)
+        if snapshot is None:
+            return None
+        return (snapshot, _file_token(self.journal_path(session_file)))
+
+    def load(self, session_file: Path) -> Optional[SessionState]:
+        # Replay may truncate a torn tail, which must not race another
+        # process that is mid-append
+        with session_lock(session_file):
+            return self._load(session_file)
+
+    def _load(self, session_file: Path) -> Optional[SessionState]:
+        journal_file = self.journal_path(session_file)
+
+        with self._lock:
+            data = read_json_document(session_file)
+            if data is None:
+                # Snapshots are written before the first append, so a journal
+                # without a snapshot is an orphan and can't be replayed
+                return None
+
+            session = session_from_dict(data)
+            seq = data.get('journal_seq', 0)
+
+            if journal_file.exists():
+                seq = self._replay(journal_file, session, seq)
+
+            state = _JournalState(seq)
+            state.snapshot_seq = data.get('journal_seq', 0)
+            state.since_snapshot = seq - state.snapshot_seq
+            self._states[session_file] = state
+            return session
+
+    def _replay(self, journal_file: Path, session: SessionState, snapshot_seq: int) -> int:
+        """Apply journal entries newer than the snapshot. Returns the last seq seen."""
+        seq = snapshot_seq
+        valid_bytes = 0
+
+        with open(journal_file, 'rb') as f:
+            for raw_line in f:
+                if not raw_line.endswith(b"\n"):
+                    break  # Torn tail from an interrupted append
+                try:
+                    entry = json.loads(raw_line)
+                except json.JSONDecodeError:
+                    break
+                valid_bytes += len(raw_line)
+
+                if entry['seq'] <= snapshot_seq:
+                    continue
+                _apply_entry(session, entry['op'], entry['record'])
+                session.last_updated = entry.get('last_updated', session.last_updated)
+                seq = entry['seq']
+
+        # Drop a torn tail so the next append starts on a clean line
+        if journal_file.stat().st_size != valid_bytes:
+            os.truncate(journal_file, valid_bytes)
+
+        return seq
+
+    def save(self, session_file: Path, session: SessionState):
+        with session_lock(session_file), self._lock:
+            state = self._states.setdefault(session_file, _JournalState())
+            data = session_to_dict(session)
+            data['journal_seq'] = state.seq
+            write_json_document(session_file, data, self.durability)
+            state.snapshot_seq = state.seq
+            state.since_snapshot = 0
+
+            journal_file = self.journal_path(session_file)
+            if journal_file.exists():
+                self._trim_journal(journal_file, state.seq)
+
+    def append(self, session_file: Path, session: SessionState, entries: List[SessionEntry]):
+        if not entries:
+            return
+
+        with session_lock(session_file):
+            data, state = self._append(session_file, session, entries)
+        if data is None:
+            return
+
+        if self.background_compaction:
+            thread = threading.Thread(
+                target=self._compact,
+                args=(session_file, data, state),
+                name=f"sensei-compact-{session_file.stem}",
+                daemon=True
+            )
+            self._threads = [t for t in self._threads if t.is_alive()]
+            self._threads.append(thread)
+            thread.start()
+        else:
+            self._compact(session_file, data, state)
+
+    def _append(self, session_file: Path, session: SessionState, entries: List[SessionEntry]
+                ) -> Tuple[Optional[Dict[str, Any]], Optional[_JournalState]]:
+        """
+        Journal ``entries``. Caller holds the session lock.
+
+        Returns:
+            (snapshot data, state) when compaction is due, else (None, None)
+        """
+        with self._lock:
+            state = self._states.get(session_file)
+        if state is None or not session_file.exists():
+            # First write for this session: start from a snapshot
+            self.save(session_file, session)
+            return None, None
+
+        with self._lock:
+            lines = []
+            for kind, record in entries:
+                state.seq += 1
+                lines.append(json.dumps({
+                    'seq': state.seq,
+                    'op': kind,
+                    'record': asdict(record) if is_dataclass(record) else record,
+                    'last_updated': session.last_updated,
+                }))
+
+            with open(self.journal_path(session_file), 'a') as f:
+                f.write("\n".join(lines) + "\n")
+                if self.durability != 'none':
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            state.since_snapshot += len(entries)
+            if state.since_snapshot < self.snapshot_every or state.compacting:
+                return None, None
+
+            # Capture the snapshot now; writing it can happen off-thread
+            data = session_to_dict(session)
+            data['journal_seq'] = state.seq
+            state.since_snapshot = 0
+            state.compacting = True
+            return data, state
+
+    def _compact(self, session_file: Path, data: Dict[str, Any], state: _JournalState):
+        """Write a snapshot and trim journal entries it covers."""
+        tmp_path = session_file.with_name(session_file.name + ".compact.tmp")
+        try:
+            atomic_write_text(tmp_path, dump_checksummed(data), self.durability)
+            with session_lock(session_file), self._lock:
+                # A synchronous save() here, or another process, may have
+                # written a newer snapshot meanwhile
+                on_disk = read_json_document(session_file) or {}
+                if data['journal_seq'] <= max(state.snapshot_seq, on_disk.get('journal_seq', 0)):
+                    tmp_path.unlink()
+                    return
+                before = self._version_token(session_file)
+                _keep_backup(session_file)
+                os.replace(tmp_path, session_file)
+                if self.durability == 'dir':
+                    _fsync_dir(session_file.parent)
+                state.snapshot_seq = data['journal_seq']
+                journal_file = self.journal_path(session_file)
+                if journal_file.exists():
+                    self._trim_journal(journal_file, state.snapshot_seq)
+                self._compacted[session_file] = (self._file_tokens(session_file), before)
+        finally:
+            state.compacting = False
+
+    def _trim_journal(self, journal_file: Path, snapshot_seq: int):
+        """Rewrite the journal keeping only entries newer than snapshot_seq. Caller holds the lock."""
+        with open(journal_file, 'r') as f:
+            remaining = [line for line in f if json.loads(line)['seq'] > snapshot_seq]
+
+        if remaining:
+            atomic_write_text(journal_file, "".join(remaining), self.durability)
+        else:
+            journal_file.unlink()
+
+    def close(self):
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Stores sessions in a SQLite database (``sessions.db``) per session directory.
+
+    Decisions, consultations, constraints/patterns and consultation personas
+    live in separate tables indexed by session, timestamp, persona and
+    context, so listing sessions, finding a consultation or loading a time
+    window are indexed queries rather than full JSON parses.
+
+    A session missing from the database but present as ``<session>.json`` is
+    imported on first load; import_json_sessions() does this in bulk.
+    """
+
+    DB_NAME = "sessions.db"
+
+    # Durability policy → PRAGMA synchronous. OFF can corrupt the database on
+    # power loss, so it is never used. In WAL mode NORMAL keeps the database
+    # consistent and only risks the last commits (like an unsynced JSON
+    # write); FULL syncs the WAL on every commit, which also covers 'dir'.
+    SYNCHRONOUS = {'none': 'NORMAL', 'file': 'FULL', 'dir': 'FULL'}
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            started_at TEXT NOT NULL,
+            last_updated TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS decisions (
+            session_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            id TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            category TEXT,
+            description TEXT,
+            rationale TEXT,
+            context TEXT,
+            PRIMARY KEY (session_id, seq)
+        );
+        CREATE TABLE IF NOT EXISTS consultations (
+            session_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            id TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            query TEXT,
+            mode TEXT,
+            personas_consulted TEXT,
+            context TEXT,
+            synthesis TEXT,
+            decision_id TEXT,
+            PRIMARY KEY (session_id, seq)
+        );
+        CREATE TABLE IF NOT EXISTS consultation_personas (
+            session_id TEXT NOT NULL,
+            consultation_seq INTEGER NOT NULL,
+            persona TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS constraints (
+            session_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (session_id, kind, position)
+        );
+        CREATE INDEX IF NOT EXISTS idx_decisions_timestamp ON decisions (session_id, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_consultations_id ON consultations (session_id, id);
+        CREATE INDEX IF NOT EXISTS idx_consultations_timestamp ON consultations (session_id, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_consultations_context ON consultations (context);
+        CREATE INDEX IF NOT EXISTS idx_consultation_personas ON consultation_personas (persona, session_id);
+    """
+
+    def __init__(self, durability: str = 'none'):
+        super().__init__(durability)
+        self._lock = threading.RLock()
+        self._connections: Dict[Path, sqlite3.Connection] = {}
+
+    def _connect(self, session_dir: Path) -> sqlite3.Connection:
+        """Open (once) the database for a session directory."""
+        db_path = session_dir / self.DB_NAME
+        conn = self._connections.get(db_path)
+        if conn is None:
+            conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self.SYNCHRONOUS[self.durability]}")
+            conn.executescript(self.SCHEMA)
+            self._connections[db_path] = conn
+        return conn
+
+    def version_token(self, session_file: Path) -> Optional[Any]:
+        # data_version changes when another connection commits to the database;
+        # our own writes go through SessionManager, which refreshes its cache
+        with self._lock:
+            conn = self._connect(session_file.parent)
+            exists = conn.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_file.stem,)
+            ).fetchone()
+            if not exists:
+                return None
+            return conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self, session_file: Path) -> Optional[SessionState]:
+        return self.load_window(session_file)
+
+    def load_window(self, session_file: Path, since: Optional[str] = None) -> Optional[SessionState]:
+        session_id = session_file.stem
+        with self._lock:
+            conn = self._connect(session_file.parent)
+            row = conn.execute(
+                "SELECT started_at, last_updated FROM sessions WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+
+            if row is None:
+                if not session_file.exists():
+                    return None
+                # Lazy migration of a legacy JSON session
+                self.save(session_file, JsonSessionStore().load(session_file))
+                return self.load_window(session_file, since)
+
+            started_at, last_updated = row
+            decisions = [
+                Decision(id=r[0], timestamp=r[1], category=r[2], description=r[3],
+                         rationale=r[4], context=json.loads(r[5]) if r[5] else {})
+                for r in conn.execute(
+                    "SELECT id, timestamp, category, description, rationale, context "
+                    "FROM decisions WHERE session_id = ? ORDER BY seq",
+                    (session_id,)
+                )
+            ]
+
+            query = ("SELECT id, timestamp, query, mode, personas_consulted, context, synthesis, decision_id "
+                     "FROM consultations WHERE session_id = ?")
+            params: Tuple = (session_id,)
+            if since:
+                query += " AND timestamp >= ?"
+                params = (session_id, since)
+            consultations = [
+                Consultation(id=r[0], timestamp=r[1], query=r[2], mode=r[3],
+                             personas_consulted=json.loads(r[4]), context=r[5],
+                             synthesis=r[6], decision_id=r[7])
+                for r in conn.execute(query + " ORDER BY seq", params)
+            ]
+
+            constraints: Dict[str, List[str]] = {'constraint': [], 'pattern': []}
+            for kind, value in conn.execute(
+                "SELECT kind, value FROM constraints WHERE session_id = ? ORDER BY kind, position",
+                (session_id,)
+            ):
+                constraints[kind].append(value)
+
+        return SessionState(
+            session_id=session_id,
+            started_at=started_at,
+            decisions=decisions,
+            active_constraints=constraints['constraint'],
+            patterns_agreed=constraints['pattern'],
+            consultations=consultations,
+            last_updated=last_updated
+        )
+
+    def save(self, session_file: Path, session: SessionState):
+        # Rows are keyed by the file stem so load() finds them again
+        session_id = session_file.stem
+        with self._lock:
+            conn = self._connect(session_file.parent)
+            with conn:
+                for table in ("decisions", "consultations", "consultation_personas", "constraints"):
+                    conn.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, started_at, last_updated) VALUES (?, ?, ?)",
+                    (session_id, session.started_at, session.last_updated)
+                )
+                for seq, decision in enumerate(session.decisions):
+                    self._insert_decision(conn, session_id, seq, decision)
+                for seq, consultation in enumerate(session.consultations):
+                    self._insert_consultation(conn, session_id, seq, consultation)
+                conn.executemany(
+                    "INSERT INTO constraints (session_id, kind, position, value) VALUES (?, ?, ?, ?)",
+                    [(session_id, 'constraint', i, v) for i, v in enumerate(session.active_constraints)]
+                    + [(session_id, 'pattern', i, v) for i, v in enumerate(session.patterns_agreed)]
+                )
+
+    def append(self, session_file: Path, session: SessionState, entries: List[SessionEntry]):
+        session_id = session_file.stem
+        with self._lock:
+            conn = self._connect(session_file.parent)
+            exists = conn.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if not exists:
+                self.save(session_file, session)
+                return
+
+            with conn:
+                for kind, record in entries:
+                    table = "decisions" if kind == "decision" else "consultations"
+                    seq = conn.execute(
+                        f"SELECT COALESCE(MAX(seq), -1) + 1 FROM {table} WHERE session_id = ?",
+                        (session_id,)
+                    ).fetchone()[0]
+                    if kind == "decision":
+                        self._insert_decision(conn, session_id, seq, record)
+                    else:
+                        self._insert_consultation(conn, session_id, seq, record)
+                conn.execute(
+                    "UPDATE sessions SET last_updated = ? WHERE session_id = ?",
+                    (session.last_updated, session_id)
+                )
+
+    @staticmethod
+    def _insert_decision(conn: sqlite3.Connection, session_id: str, seq: int, decision: Decision):
+        conn.execute(
+            "INSERT INTO decisions (session_id, seq, id, timestamp, category, description, rationale, context) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (session_id, seq, decision.id, decision.timestamp, decision.category,
+             decision.description, decision.rationale, json.dumps(decision.context))
+        )
+
+    @staticmethod
+    def _insert_consultation(conn: sqlite3.Connection, session_id: str, seq: int, consultation: Consultation):
+        conn.execute(
+            "INSERT INTO consultations (session_id, seq, id, timestamp, query, mode, personas_consulted, "
+            "context, synthesis, decision_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (session_id, seq, consultation.id, consultation.timestamp, consultation.query,
+             consultation.mode, json.dumps(consultation.personas_consulted), consultation.context,
+             consultation.synthesis, consultation.decision_id)
+        )
+        conn.executemany(
+            "INSERT INTO consultation_personas (session_id, consultation_seq, persona) VALUES (?, ?, ?)",
+            [(session_id, seq, persona) for persona in consultation.personas_consulted]
+        )
+
+    def list_sessions(self, session_dir: Path) -> List[Dict[str, Any]]:
+        # Legacy JSON sessions are otherwise only imported when loaded by ID
+        self._import_new_json_sessions(session_dir)
+        with self._lock:
+            rows = self._connect(session_dir).execute(
+                "SELECT s.session_id, s.last_updated, "
+                "(SELECT COUNT(*) FROM decisions d WHERE d.session_id = s.session_id) "
+                "FROM sessions s"
+            ).fetchall()
+        return [{'id': r[0], 'updated': r[1], 'decisions': r[2]} for r in rows]
+
+    def find_consultation(self, session_file: Path, consultation_id: str) -> Optional[Consultation]:
+        with self._lock:
+            row = self._connect(session_file.parent).execute(
+                "SELECT id, timestamp, query, mode, personas_consulted, context, synthesis, decision_id "
+                "FROM consultations WHERE session_id = ? AND id = ?",
+                (session_file.stem, consultation_id)
+            ).fetchone()
+        if row is None:
+            return None
+        return Consultation(id=row[0], timestamp=row[1], query=row[2], mode=row[3],
+                            personas_consulted=json.loads(row[4]), context=row[5],
+                            synthesis=row[6], decision_id=row[7])
+
+    def import_json_sessions(self, session_dir: Path) -> List[str]:
+        """
+        Bulk-import every ``<session>.json`` in a directory into its database.
+
+        Args:
+            session_dir: ``~/.sensei/sessions`` or a project's ``.sensei`` directory
+
+        Returns:
+            IDs of the imported sessions (unreadable files are skipped)
+        """
+        json_store = JsonSessionStore()
+        imported = []
+        for session_file in sorted(session_dir.glob("*.json")):
+            try:
+                session = json_store.load(session_file)
+            except (ValueError, KeyError, TypeError):
+                continue
+            self.save(session_file, session)
+            imported.append(session_file.stem)
+        return imported
+
+    def _import_new_json_sessions(self, session_dir: Path):
+        """Import ``<session>.json`` files that have no rows in the database yet."""
+        with self._lock:
+            known = {r[0] for r in self._connect(session_dir).execute("SELECT session_id FROM sessions")}
+            json_store = JsonSessionStore()
+            for session_file in sorted(session_dir.glob("*.json")):
+                if session_file.stem in known:
+                    continue
+                try:
+                    session = json_store.load(session_file)
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if session:
+                    self.save(session_file, session)
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections = {}
+
+
+# Backend name → store class (used by the --session-store CLI flag)
+SESSION_STORES = {
+    'json': JsonSessionStore,
+    'journal': JournalSessionStore,
+    'sqlite': SqliteSessionStore,
+}
@@ -0,0 +1,99 @@
+"""
+Bounded thread pool for blocking tool work.
+
+Following Performance Engineer: Keep the event loop free, do the I/O elsewhere.
+Following Site Reliability Engineer: Bounded concurrency, observable via stats().
+
+FastMCP runs synchronous tools directly on its event loop, so one slow call
+(git on a large repository, a cold session file, a skill body read) holds up
+every other request of the client. ToolPool.offloaded() turns a blocking tool
+function into an ``async def`` tool whose body runs on a bounded
+ThreadPoolExecutor; the loop keeps serving other calls meanwhile.
+
+The wrapped function stays available as ``tool.blocking`` for in-process
+callers that are already off the loop (e.g. one tool delegating to another).
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class ToolPool:
+    """Runs blocking tool bodies on a bounded thread pool."""
+
+    def __init__(self, max_workers: int = 8):
+        """
+        Args:
+            max_workers: Tool bodies running at the same time (others wait in line)
+        """
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.active = 0
+        self.completed = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The executor, started on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="sensei-tool")
+            return self._executor
+
+    def resize(self, max_workers: int):
+        """Use ``max_workers`` threads from now on (running calls finish on the old pool)."""
+        with self._lock:
+            previous, self._executor = self._executor, None
+            self.max_workers = max_workers
+        if previous is not None:
+            previous.shutdown(wait=False)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            previous, self._executor = self._executor, None
+        if previous is not None:
+            previous.shutdown(wait=wait)
+
+    def _call(self, fn: Callable[..., Any], args, kwargs) -> Any:
+        with self._lock:
+            self.active += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> Awaitable[Any]:
+        """Await ``fn(*args, **kwargs)`` run on the pool."""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.executor, self._call, fn, args, kwargs)
+
+    def offloaded(self, fn: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+        """
+        Decorator making a blocking function an async tool that runs on the pool.
+
+        Example:
+            @mcp.tool()
+            @tool_pool.offloaded
+            def get_session_context(session_id: str = "default") -> str: ...
+        """
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await self.run(fn, *args, **kwargs)
+
+        wrapper.blocking = fn
+        return wrapper
+
+    def stats(self) -> Dict[str, int]:
+        """Pool size, tool bodies running now and completed so far."""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'active': self.active,
+                'completed': self.completed,
+            }
@@ -0,0 +1,93 @@
+"""
+Tests for the HTTP transport and pre-fork worker mode.
+
+Testing a multi-worker server end to end (requests spread over the workers,
+SIGHUP replaces them, SIGTERM stops the server) and argument validation.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+
+from sensei_mcp import server
+from sensei_mcp.http_server import PreforkServer
+
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork mode needs os.fork")
+
+
+def wait_for(predicate, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(0.1)
+    raise AssertionError("timed out")
+
+
+def answering_pids(url: str, calls: int = 8) -> set:
+    """Worker PIDs that answered ``calls`` get_server_stats requests."""
+    async def scenario():
+        async with streamable_http_client(url) as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                pids = set()
+                for _ in range(calls):
+                    result = await session.call_tool("get_server_stats", {})
+                    pids.add(json.loads(result.content[0].text)["process"]["pid"])
+                return pids
+    return asyncio.run(scenario())
+
+
+@pytest.fixture
+def prefork_server(tmp_path):
+    log = tmp_path / "server.log"
+    env = dict(os.environ, HOME=str(tmp_path))
+    with open(log, "w") as stderr:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "sensei_mcp", "--transport", "streamable-http", "--port", "0", "--workers", "2"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=stderr, env=env,
+        )
+    try:
+        line = wait_for(lambda: next((l for l in log.read_text().splitlines() if l.startswith("Serving MCP at")), None))
+        yield process, line.split()[3], log
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+def test_workers_share_requests_and_reload(prefork_server):
+    process, url, log = prefork_server
+    assert "64 personas" in log.read_text()
+
+    first = wait_for(lambda: answering_pids(url) if log.read_text().count("Application startup complete") >= 2 else None)
+    assert first and process.pid not in first  # Workers answer, not the master
+
+    process.send_signal(signal.SIGHUP)
+    wait_for(lambda: "Reloaded: generation 2" in log.read_text())
+    second = wait_for(lambda: (pids := answering_pids(url)) and not pids & first and pids)
+    assert len(second) <= 2
+
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=30) == 0
+
+
+def test_sse_cannot_be_shared_by_workers():
+    with pytest.raises(ValueError, match="streamable-http"):
+        PreforkServer(server.mcp, sock=None, workers=2, reload=lambda: None, transport="sse")
+
+
+def test_workers_require_streamable_http():
+    result = subprocess.run([sys.executable, "-m", "sensei_mcp", "--workers", "2"], capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "--workers requires --transport streamable-http" in result.stderr
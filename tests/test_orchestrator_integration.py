@@ -4,6 +4,7 @@ Integration tests for the Skill Orchestrator.
 Tests multi-persona coordination, context detection, and session integration.
 """
 
+import re
 from pathlib import Path
 from sensei_mcp.orchestrator import SkillOrchestrator
 from sensei_mcp.personas import PersonaRegistry
@@ -177,6 +178,104 @@ def test_output_formats():
     print("\n✅ All output format tests passed")
 
 
+RANKING_QUERIES = [
+    "Should we use microservices or a monolith?",
+    "Our AWS bill is $50k/month, how do we reduce cloud cost?",
+    "How do I design a rapid API for mobile data analytics?",
+    "Security and compliance review for the ML platform deployment",
+    "The team is burning out, leadership wants better documentation",
+    "Incident in production: database latency and monitoring gaps",
+    "What's the best way to learn Python?",
+    "",
+]
+
+
+def _full_scan_selection(orchestrator, query, max_personas=5):
+    """Reference auto-mode selection: score every persona with relevance_score()."""
+    registry = orchestrator.registry
+    context = orchestrator.detector.get_primary_context(query)
+    selected_names = orchestrator.CONTEXT_PERSONAS.get(context, ['snarky-senior-engineer'])
+    personas = [registry.get(name) for name in selected_names if registry.get(name)]
+
+    scored = []
+    for name, persona in registry.get_all().items():
+        if name not in selected_names:
+            score = persona.relevance_score(query)
+            if score > 0.2:
+                scored.append((score, name, persona))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    for score, name, persona in scored:
+        if len(personas) >= max_personas:
+            break
+        if name not in [p.name for p in personas]:
+            personas.append(persona)
+
+    snarky = registry.get('snarky-senior-engineer')
+    if snarky and snarky not in personas:
+        personas.insert(0, snarky)
+    return [p.name for p in personas[:max_personas]]
+
+
+def test_indexed_selection_matches_full_scan():
+    """Test that the inverted expertise index reproduces the full-scan ranking."""
+    skills_dir = Path(__file__).parent.parent / "src" / "sensei_mcp" / "personas" / "skills"
+    registry = PersonaRegistry(skills_dir)
+    orchestrator = SkillOrchestrator(registry, retrieval='keyword')
+
+    for query in RANKING_QUERIES:
+        expected_scores = {
+            name: persona.relevance_score(query)
+            for name, persona in registry.get_all().items()
+            if persona.relevance_score(query) > 0
+        }
+        assert registry.relevance_scores(query) == expected_scores
+
+        for max_personas in (3, 5, 8):
+            selected = orchestrator.select_personas(query, mode='auto', max_personas=max_personas)
+            assert [p.name for p in selected] == _full_scan_selection(orchestrator, query, max_personas)
+
+
+DETECTION_QUERIES = RANKING_QUERIES + [
+    "The production database is down!",
+    "Our AWS bill is $50k/month, how do we reduce it?",
+    "The CEO's nephew wants us to use MongoDB",
+    "PROD IS DOWN and customers are SCREAMING",
+    "product launch: system design review, performance review next week",
+    "Fix the ſecurity hole: ıNJECTION in the login form",  # IGNORECASE folds ſ→s and ı→i
+    "authentic authorization bypass\non a separate line",
+    "",
+]
+
+
+def _pattern_scan(query):
+    """Reference detection: search every pattern separately."""
+    detected = {}
+    for context, patterns in ContextDetector.PATTERNS.items():
+        matches = sum(1 for pattern in patterns if re.search(pattern, query.lower(), re.IGNORECASE))
+        if matches:
+            detected[context] = matches
+    ranked = sorted(detected.items(), key=lambda x: x[1], reverse=True)
+    return ranked or [(QueryContext.GENERAL, 0)]
+
+
+def test_prefiltered_detection_matches_pattern_scan():
+    """Test that literal prefiltering and memoization don't change detection results."""
+    detector = ContextDetector()
+
+    for query in DETECTION_QUERIES:
+        assert detector.detect_contexts(query) == _pattern_scan(query), query
+
+    # Repeated detection is served from the per-query cache
+    before = detector._detect_cached.cache_info().hits
+    detector.get_context_explanation(DETECTION_QUERIES[0])
+    detector.get_primary_context(DETECTION_QUERIES[0])
+    assert detector._detect_cached.cache_info().hits == before + 2
+
+    # Callers get their own list
+    detector.detect_contexts(DETECTION_QUERIES[0]).clear()
+    assert detector.detect_contexts(DETECTION_QUERIES[0]) == _pattern_scan(DETECTION_QUERIES[0])
+
+
 if __name__ == "__main__":
     print("=" * 70)
     print("SENSEI MCP v0.3.0 - ORCHESTRATOR INTEGRATION TESTS")
@@ -189,6 +288,8 @@ if __name__ == "__main__":
     test_session_context_integration()
     test_specific_persona_selection()
     test_output_formats()
+    test_indexed_selection_matches_full_scan()
+    test_prefiltered_detection_matches_pattern_scan()
 
     print("\n" + "=" * 70)
     print("✅ ALL INTEGRATION TESTS PASSED!")
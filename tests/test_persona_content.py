@@ -0,0 +1,75 @@
+"""
+Tests for partial persona content delivery.
+
+Testing get_persona_content's digest and outline modes, section addressing
+and cursor pagination.
+"""
+
+import asyncio
+import re
+
+import pytest
+
+from sensei_mcp import server
+
+
+PERSONA = "snarky-senior-engineer"
+
+
+def get_persona_content(*args, **kwargs) -> str:
+    return asyncio.run(server.get_persona_content(*args, **kwargs))
+
+
+def test_default_is_the_full_skill():
+    persona = server.persona_registry.get(PERSONA)
+    assert get_persona_content(PERSONA, include_metadata=False) == persona.full_content
+
+
+def test_digest_is_principles_and_personality():
+    full = get_persona_content(PERSONA)
+    digest = get_persona_content(PERSONA, mode="digest")
+
+    assert "## 0. Core Principles" in digest and "## 1. Personality & Tone" in digest
+    assert "## 2. Core Engineering Philosophy" not in digest
+    assert "- §2 Core Engineering Philosophy" in digest  # Listed in the outline instead
+    assert len(digest) * 5 < len(full)
+
+
+def test_sections_by_number_and_title():
+    both = get_persona_content(PERSONA, include_metadata=False, section="4, mantras")
+    assert both.startswith("## 4. APIs & Contracts") and "## 16. Mantras" in both
+    assert "## 5." not in both
+
+    titled = get_persona_content(PERSONA, include_metadata=False, section="Risk, Compliance & Data Governance")
+    assert titled.startswith("## 18. Risk, Compliance & Data Governance")
+    assert "## 19." not in titled
+
+    missing = get_persona_content(PERSONA, section="4, 99")
+    assert missing.startswith("❌ Section(s) not found") and "99" in missing and "- §56 One-Line Summary" in missing
+
+
+def test_cursor_pages_reassemble_the_content():
+    full = get_persona_content(PERSONA)
+    pages, cursor = [], None
+    while True:
+        response = get_persona_content(PERSONA, cursor=cursor, max_chars=4000)
+        page, footer = response.rsplit("\n\n---\n📄", 1)
+        pages.append(page)
+        match = re.search(r'cursor="(\d+)"', footer)
+        if match is None:
+            assert "(last page)" in footer
+            break
+        cursor = match.group(1)
+
+    assert len(pages) > 10
+    assert "".join(pages) == full
+
+
+@pytest.mark.parametrize("arguments,error", [
+    ({"mode": "everything"}, "Unknown mode"),
+    ({"cursor": "abc"}, "Invalid cursor"),
+    ({"cursor": "10000000"}, "past the end"),
+    ({"max_chars": 0}, "must be positive"),
+])
+def test_invalid_arguments(arguments, error):
+    assert error in get_persona_content(PERSONA, **arguments)
@@ -0,0 +1,126 @@
+"""
+Tests for BM25 persona retrieval.
+
+Testing tokenization, ranking over SKILL.md content, persistence of the
+index next to the registry snapshot, and orchestrator selection.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from sensei_mcp.orchestrator import SkillOrchestrator
+from sensei_mcp.personas import PersonaRegistry
+from sensei_mcp.personas.retrieval import BM25Index, stem, tokenize
+
+
+SKILLS_DIR = Path(__file__).parent.parent / "src" / "sensei_mcp" / "personas" / "skills"
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return PersonaRegistry(SKILLS_DIR)
+
+
+@pytest.fixture
+def skills_dir(tmp_path):
+    """Copy of a few skills that tests can modify."""
+    target = tmp_path / "skills"
+    target.mkdir()
+    for name in ["snarky-senior-engineer.md", "pragmatic-architect.md", "security-sentinel.md"]:
+        shutil.copy(SKILLS_DIR / name, target / name)
+    return target
+
+
+def test_stem_merges_inflections():
+    assert stem("deployed") == stem("deployment") == stem("deploy")
+    assert stem("databases") == stem("database")
+    assert stem("scaling") == stem("scale")
+    assert stem("policies") == "policy"
+    assert stem("access") == "access"
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("How should we scale the Postgres databases?") == ["scal", "postgr", "databas"]
+
+
+@pytest.mark.parametrize("query,expected", [
+    ("SQL injection vulnerability in the login form", "security-sentinel"),
+    ("We need to translate the UI into Japanese", "localization-i18n-engineer"),
+    ("Reduce our cloud spending on AWS", "finops-optimizer"),
+])
+def test_search_ranks_specialist_first(registry, query, expected):
+    assert registry.search(query, limit=1)[0][0] == expected
+
+
+def test_search_scores_are_sorted(registry):
+    results = registry.search("database migration with zero downtime")
+
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+    assert registry.search("zzzz qqqq") == []
+
+
+def test_matched_terms_reports_query_words(registry):
+    terms = registry.search_index().matched_terms("translate the UI into Japanese", "localization-i18n-engineer")
+    assert set(terms) == {"translate", "ui", "japanese"}
+
+
+def test_index_is_persisted_and_invalidated(tmp_path, skills_dir, monkeypatch):
+    snapshot_path = tmp_path / "cache" / "personas.pickle"
+    PersonaRegistry(skills_dir, snapshot_path=snapshot_path).search_index()
+    index_path = tmp_path / "cache" / "personas.bm25.pickle"
+    assert index_path.exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("index was rebuilt despite a valid snapshot")
+
+    monkeypatch.setattr(BM25Index, "build", fail)
+    assert len(PersonaRegistry(skills_dir, snapshot_path=snapshot_path).search_index()) == 3
+    monkeypatch.undo()
+
+    skill_file = skills_dir / "pragmatic-architect.md"
+    skill_file.write_text(skill_file.read_text() + "\n## Quasar Telemetry\n")
+    registry = PersonaRegistry(skills_dir, snapshot_path=snapshot_path)
+    assert registry.search("quasar")[0][0] == "pragmatic-architect"
+
+
+def test_orchestrator_selects_by_skill_content(registry):
+    orchestrator = SkillOrchestrator(registry)
+
+    selected = [p.name for p in orchestrator.select_personas("We need to translate the UI into Japanese")]
+    assert "localization-i18n-engineer" in selected
+    assert len(selected) <= 5
+
+
+BATCH_QUERIES = [
+    "SQL injection vulnerability in the login form",
+    "We need to translate the UI into Japanese",
+    "Reduce our cloud spending on AWS",
+    "Should we split the monolith into microservices?",
+    "zzzz qqqq",
+    "",
+]
+
+
+@pytest.mark.parametrize("retrieval", ["bm25", "keyword"])
+def test_batch_ranking_matches_per_query(registry, retrieval):
+    pytest.importorskip("numpy")
+    orchestrator = SkillOrchestrator(registry, retrieval=retrieval)
+
+    expected = [orchestrator.relevance_ranking(query) for query in BATCH_QUERIES]
+    assert orchestrator.relevance_ranking_batch(BATCH_QUERIES) == expected
+    assert orchestrator.relevance_ranking_batch(BATCH_QUERIES, top_k=2) == [ranked[:2] for ranked in expected]
+    assert orchestrator.relevance_ranking_batch([]) == []
+
+
+@pytest.mark.parametrize("retrieval", ["bm25", "keyword"])
+def test_batch_ranking_without_numpy(registry, retrieval, monkeypatch):
+    monkeypatch.setattr("sensei_mcp.personas.retrieval._numpy", lambda: None)
+    monkeypatch.setattr("sensei_mcp.personas.registry._numpy", lambda: None)
+    orchestrator = SkillOrchestrator(registry, retrieval=retrieval)
+
+    expected = [orchestrator.relevance_ranking(query)[:3] for query in BATCH_QUERIES]
+    assert orchestrator.relevance_ranking_batch(BATCH_QUERIES, top_k=3) == expected
+    assert orchestrator.relevance_ranking_batch([]) == []
@@ -0,0 +1,93 @@
+"""
+Tests for the precompiled persona registry snapshot.
+
+Testing snapshot round-trips, invalidation when a SKILL.md changes, and
+reuse when only mtimes change.
+"""
+
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+import pytest
+
+from sensei_mcp.personas import PersonaRegistry
+from sensei_mcp.personas.loader import SkillLoader
+from sensei_mcp.personas.snapshot import compile_snapshot, load_snapshot, skills_fingerprint
+
+
+SKILLS_DIR = Path(__file__).parent.parent / "src" / "sensei_mcp" / "personas" / "skills"
+
+
+@pytest.fixture
+def skills_dir(tmp_path):
+    """Copy of a few skills that tests can modify."""
+    target = tmp_path / "skills"
+    target.mkdir()
+    for name in ["snarky-senior-engineer.md", "pragmatic-architect.md", "security-sentinel.md"]:
+        shutil.copy(SKILLS_DIR / name, target / name)
+    return target
+
+
+def test_snapshot_matches_parsed_skills(tmp_path, skills_dir):
+    snapshot_path = tmp_path / "cache" / "personas.pickle"
+    compile_snapshot(skills_dir, snapshot_path)
+
+    assert load_snapshot(snapshot_path, skills_dir) == SkillLoader.load_all_skills(
+        skills_dir, include_content=False
+    )
+
+
+def test_registry_writes_and_uses_snapshot(tmp_path, skills_dir, monkeypatch):
+    snapshot_path = tmp_path / "cache" / "personas.pickle"
+    assert len(PersonaRegistry(skills_dir, snapshot_path=snapshot_path)) == 3
+    assert snapshot_path.exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("skills were parsed despite a valid snapshot")
+
+    monkeypatch.setattr(SkillLoader, "load_all_skills", fail)
+    registry = PersonaRegistry(skills_dir, snapshot_path=snapshot_path)
+    assert registry.get("pragmatic-architect").core_principles
+
+
+def test_changed_skill_invalidates_snapshot(tmp_path, skills_dir):
+    snapshot_path = tmp_path / "personas.pickle"
+    compile_snapshot(skills_dir, snapshot_path)
+
+    skill_file = skills_dir / "security-sentinel.md"
+    skill_file.write_text(skill_file.read_text().replace('description: "', 'description: "Updated. ', 1))
+    assert load_snapshot(snapshot_path, skills_dir) is None
+
+    registry = PersonaRegistry(skills_dir, snapshot_path=snapshot_path)
+    assert registry.get("security-sentinel").description.startswith("Updated")
+
+
+def test_touched_skill_keeps_snapshot(tmp_path, skills_dir):
+    snapshot_path = tmp_path / "personas.pickle"
+    compile_snapshot(skills_dir, snapshot_path)
+
+    skill_file = skills_dir / "pragmatic-architect.md"
+    os.utime(skill_file, ns=(0, 0))
+    assert load_snapshot(snapshot_path, skills_dir) is not None
+
+    # The fingerprint was refreshed for the next start
+    with open(snapshot_path, 'rb') as f:
+        assert pickle.load(f)['fingerprint'] == skills_fingerprint(skills_dir)
+
+
+def test_moved_skills_dir_invalidates_snapshot(tmp_path, skills_dir):
+    snapshot_path = tmp_path / "personas.pickle"
+    compile_snapshot(skills_dir, snapshot_path)
+
+    moved = shutil.copytree(skills_dir, tmp_path / "moved")
+    assert load_snapshot(snapshot_path, moved) is None
+
+
+def test_corrupt_snapshot_is_ignored(tmp_path, skills_dir):
+    snapshot_path = tmp_path / "personas.pickle"
+    snapshot_path.write_bytes(b"not a pickle")
+
+    assert load_snapshot(snapshot_path, skills_dir) is None
+    assert len(PersonaRegistry(skills_dir, snapshot_path=snapshot_path)) == 3
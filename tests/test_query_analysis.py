@@ -0,0 +1,104 @@
+"""
+Tests for the shared query analysis cache.
+
+Testing the bounded LRU, that persona selection, MCP suggestions and context
+hints fill in and reuse one analysis per query, and that repeat queries skip
+the scoring work.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from sensei_mcp.context_detector import QueryContext
+from sensei_mcp.mcp_orchestrator import MCPOrchestrator
+from sensei_mcp.orchestrator import SkillOrchestrator
+from sensei_mcp.personas import PersonaRegistry
+from sensei_mcp.query_analysis import QueryAnalysisCache
+
+
+SKILLS_DIR = Path(__file__).parent.parent / "src" / "sensei_mcp" / "personas" / "skills"
+QUERY = "Our Postgres database is down and the API returns 500s"
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return PersonaRegistry(SKILLS_DIR)
+
+
+def test_cache_is_bounded_lru():
+    cache = QueryAnalysisCache(max_entries=2)
+    first = cache.get("first query")
+    cache.get("second query")
+    assert cache.get("first query") is first  # Refreshes "first query"
+    cache.get("third query")  # Evicts "second query"
+
+    assert cache.stats() == {'hits': 1, 'misses': 3, 'entries': 2, 'max_entries': 2}
+    assert cache.get("first query") is first
+    assert cache.get("second query").contexts is None
+
+
+def test_analysis_normalizes_once():
+    analysis = QueryAnalysisCache().get("Scaling the Databases")
+
+    assert analysis.normalized == "scaling the databases"
+    assert analysis.tokens == ("scal", "databas")
+
+
+def test_consumers_share_one_analysis(registry):
+    analyses = QueryAnalysisCache()
+    orchestrator = SkillOrchestrator(registry, analyses=analyses)
+    mcp_orchestrator = MCPOrchestrator(analyses=analyses)
+
+    orchestrator.select_personas(QUERY)
+    suggestions = mcp_orchestrator.suggest_mcps_for_query(QUERY, context="CRISIS")
+
+    analysis = analyses.get(QUERY)
+    assert analysis.primary_context == QueryContext.CRISIS
+    assert analysis.persona_rankings['bm25'] == tuple(orchestrator.relevance_ranking(QUERY))
+    assert set(analysis.mcp_keywords) == {mcp.value for mcp in MCPOrchestrator.MCP_PATTERNS}
+    assert analysis.workflow_templates == ("incident-postmortem", "api-design-review")
+    assert [w["template"] for w in suggestions["matching_workflows"]] == list(analysis.workflow_templates)
+    assert analyses.stats()['misses'] == 1
+
+
+def test_repeat_query_skips_scoring(registry, monkeypatch):
+    orchestrator = SkillOrchestrator(registry)
+    selected = [p.name for p in orchestrator.select_personas(QUERY)]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("query was scored again")
+
+    monkeypatch.setattr(registry, "search_terms", fail)
+    monkeypatch.setattr(orchestrator.detector, "detect_contexts", fail)
+    assert [p.name for p in orchestrator.select_personas(QUERY)] == selected
+    assert orchestrator.orchestrate(QUERY)['context'] == QueryContext.CRISIS.value
+
+
+def test_rankings_are_kept_per_retrieval_mode(registry):
+    orchestrator = SkillOrchestrator(registry)
+    bm25 = orchestrator.relevance_ranking(QUERY)
+    orchestrator.retrieval = 'keyword'
+    keyword = orchestrator.relevance_ranking(QUERY)
+
+    assert keyword == SkillOrchestrator(registry, retrieval='keyword').relevance_ranking(QUERY)
+    assert set(orchestrator.analyses.get(QUERY).persona_rankings) == {'bm25', 'keyword'}
+    assert bm25 != keyword
+
+
+def test_mcp_suggestions_use_cached_keywords():
+    mcp_orchestrator = MCPOrchestrator()
+    query = "Review the PR for auth security issues"
+    first = mcp_orchestrator.suggest_mcps_for_query(query, "SECURITY")
+
+    assert [(s["mcp"], s["confidence"]) for s in first["suggested_mcps"]] == [
+        ("sensei", 1.0), ("github", 0.4), ("context7", 0.3), ("tavily", 0.3)
+    ]
+    assert [w["template"] for w in first["matching_workflows"]] == [
+        "auth-security-review", "pr-security-review", "issue-triage"
+    ]
+
+    # Same query, other context: keyword matches come from the cache, context scoring still applies
+    second = mcp_orchestrator.suggest_mcps_for_query(query, "TEAM")
+    assert [s["mcp"] for s in second["suggested_mcps"]] == ["sensei", "github"]
+    assert mcp_orchestrator.analyses.stats()['misses'] == 1
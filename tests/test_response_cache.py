@@ -0,0 +1,114 @@
+"""
+Tests for the response cache of deterministic MCP tools.
+
+Testing argument normalization, invalidation by content generation, byte-bounded
+eviction, stats, and the cached server tools.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from sensei_mcp import server
+from sensei_mcp.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache(generation_ttl=0)
+    cache.generations = {"docs": 1}
+    cache.register_source("docs", lambda: cache.generations["docs"])
+    return cache
+
+
+def test_arguments_are_normalized(cache):
+    calls = []
+
+    @cache.cached("docs")
+    def render(name: str, verbose: bool = False, options: dict = None) -> str:
+        calls.append(name)
+        return f"{name}:{verbose}:{sorted((options or {}).items())}"
+
+    first = render("alpha", options={"b": 2, "a": 1})
+    assert render(name="alpha", verbose=False, options={"a": 1, "b": 2}) == first
+    assert render("alpha", True) != first
+    assert calls == ["alpha", "alpha"]
+
+
+def test_new_generation_renders_again(cache):
+    calls = []
+
+    @cache.cached("docs")
+    def render(name: str) -> str:
+        calls.append(name)
+        return f"{name} v{cache.generations['docs']}"
+
+    assert render("alpha") == "alpha v1"
+    cache.generations["docs"] = 2
+    assert render("alpha") == "alpha v2"
+    assert render("alpha") == "alpha v2"
+    assert calls == ["alpha", "alpha"]
+
+
+def test_generation_is_polled_at_most_once_per_ttl():
+    polls = []
+    cache = ResponseCache(generation_ttl=60)
+    cache.register_source("docs", lambda: polls.append(1) or len(polls))
+
+    @cache.cached("docs")
+    def render(name: str) -> str:
+        return name
+
+    for name in ["alpha", "beta", "alpha"]:
+        render(name)
+    assert len(polls) == 1
+
+
+def test_eviction_is_bounded_by_bytes(cache):
+    cache.max_bytes = 250
+
+    @cache.cached("docs")
+    def render(name: str) -> str:
+        return name * 100
+
+    render("a")
+    render("b")
+    render("a")  # Refreshes "a"
+    render("c")  # Evicts "b"
+    render("é")  # 200 bytes: evicts "a" and "c"
+    render("d" * 3)  # Larger than the whole cache: not stored
+
+    stats = cache.stats()
+    assert (stats['entries'], stats['bytes'], stats['evictions']) == (1, 200, 3)
+    assert stats['tools'] == {'render': {'hits': 1, 'misses': 5}}
+    assert stats['hit_rate'] == round(1 / 6, 3)
+
+
+def test_unknown_source_is_rejected(cache):
+    with pytest.raises(ValueError, match="nope"):
+        cache.cached("nope")(lambda: "")
+
+
+def test_server_tools_are_served_from_cache(monkeypatch):
+    monkeypatch.setattr(server.response_cache, "_responses", type(server.response_cache._responses)())
+    monkeypatch.setattr(server.response_cache, "hits", {})
+    monkeypatch.setattr(server.response_cache, "misses", {})
+
+    content = asyncio.run(server.get_persona_content("security-sentinel"))
+    monkeypatch.setattr(server.persona_registry, "get", lambda name: pytest.fail("persona was rendered again"))
+    assert asyncio.run(server.get_persona_content(persona_name="security-sentinel", include_metadata=True)) == content
+
+    stats = json.loads(asyncio.run(server.get_server_stats()))
+    assert stats["response_cache"]["tools"]["get_persona_content"] == {"hits": 1, "misses": 1}
+    assert {"query_analyses", "path_classification", "sessions"} <= set(stats)
+
+
+def test_workflow_template_parameters_do_not_leak():
+    template = server.get_mcp_workflow_template.blocking
+    with_parameters = json.loads(template("auth-security-review", {"framework": "FastAPI"}))
+    plain = json.loads(template("auth-security-review"))
+
+    assert "FastAPI vulnerabilities 2025" in json.dumps(with_parameters)
+    assert "{framework} vulnerabilities 2025" in json.dumps(plain)
+    assert plain["workflow"]["mcps"][0] == "sensei"
@@ -0,0 +1,117 @@
+"""
+Tests for embedding-based semantic persona matching.
+
+Testing skill chunking, the hashed n-gram embedder, ranking, memory-mapped
+persistence per skills content hash, and the orchestrator's semantic mode.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sensei_mcp.orchestrator import SkillOrchestrator  # noqa: E402
+from sensei_mcp.personas import PersonaRegistry  # noqa: E402
+from sensei_mcp.personas.semantic import HashingEmbedder, SemanticIndex, load_embedder, skill_chunks  # noqa: E402
+
+
+SKILLS_DIR = Path(__file__).parent.parent / "src" / "sensei_mcp" / "personas" / "skills"
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return PersonaRegistry(SKILLS_DIR)
+
+
+@pytest.fixture
+def skills_dir(tmp_path):
+    """Copy of a few skills that tests can modify."""
+    target = tmp_path / "skills"
+    target.mkdir()
+    for name in ["snarky-senior-engineer.md", "pragmatic-architect.md", "security-sentinel.md"]:
+        shutil.copy(SKILLS_DIR / name, target / name)
+    return target
+
+
+def test_skill_chunks_start_with_summary():
+    skill_data = {'metadata': {'name': 'demo-persona', 'description': 'Demo description'}, 'use_when': 'Demos'}
+    body = "---\nname: demo-persona\n---\n# Demo\n\n## Principles\n\n" + "Principle text. " * 10
+
+    chunks = skill_chunks(skill_data, body)
+    assert chunks[0].startswith("demo persona Demo description Demos")
+    assert chunks[1].startswith("Principles")
+    assert len(chunks) == 2
+
+
+def test_hashing_embedder_matches_inflections():
+    embedder = HashingEmbedder(dim=256)
+    vectors = embedder.encode(["requests time out", "request timeouts", "quarterly budget review"])
+
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+    assert vectors.dtype == np.float32
+
+
+@pytest.mark.parametrize("query,expected", [
+    ("translate the UI into Japanese", "localization-i18n-engineer"),
+    ("our AWS bill doubled last month", "finops-optimizer"),
+    ("flaky tests in CI", "test-engineering-lead"),
+])
+def test_semantic_search_ranks_specialist_first(registry, query, expected):
+    assert registry.semantic_search(query, limit=1)[0][0] == expected
+
+
+def test_batch_matches_single_queries(registry):
+    queries = ["flaky tests in CI", "our AWS bill doubled last month", ""]
+    expected = [registry.semantic_search(query, limit=3) for query in queries]
+
+    batch = registry.semantic_search_batch(queries, limit=3)
+    assert [[name for name, _ in ranked] for ranked in batch] == [[name for name, _ in ranked] for ranked in expected]
+    assert batch[2] == []
+
+
+def test_vectors_are_memory_mapped_per_content_hash(tmp_path, skills_dir, monkeypatch):
+    snapshot_path = tmp_path / "cache" / "personas.pickle"
+    first = PersonaRegistry(skills_dir, snapshot_path=snapshot_path).semantic_index()
+    [vectors_file] = (tmp_path / "cache").glob("semantic-*.f32")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("skills were embedded again despite a valid cache")
+
+    monkeypatch.setattr(SemanticIndex, "build", fail)
+    loaded = PersonaRegistry(skills_dir, snapshot_path=snapshot_path).semantic_index()
+    assert isinstance(loaded.vectors, np.memmap)
+    assert np.array_equal(loaded.vectors, first.vectors)
+    assert loaded.search("SQL injection") == first.search("SQL injection")
+    monkeypatch.undo()
+
+    # A changed skill gets new vectors; the stale file is removed
+    skill_file = skills_dir / "pragmatic-architect.md"
+    skill_file.write_text(skill_file.read_text() + "\n## Quasar Telemetry\n\n" + "Quasar telemetry pipelines. " * 5)
+    rebuilt = PersonaRegistry(skills_dir, snapshot_path=snapshot_path)
+    assert rebuilt.semantic_search("quasar telemetry")[0][0] == "pragmatic-architect"
+    assert [path.name for path in (tmp_path / "cache").glob("semantic-*.f32")] != [vectors_file.name]
+    assert not vectors_file.exists()
+
+
+def test_missing_model_falls_back_to_hashing(capsys):
+    embedder = load_embedder("no-such-model-for-tests")
+
+    assert isinstance(embedder, HashingEmbedder)
+    assert "Could not load embedding model" in capsys.readouterr().err
+
+
+def test_orchestrator_semantic_mode(registry, monkeypatch):
+    orchestrator = SkillOrchestrator(registry, retrieval='semantic')
+
+    ranking = orchestrator.relevance_ranking("flaky tests in CI")
+    assert ranking[0][0] == "test-engineering-lead"
+    assert all(score >= orchestrator.MIN_SEMANTIC_SCORE for _, score in ranking)
+    assert orchestrator.relevance_ranking_batch(["flaky tests in CI"]) == [ranking]
+
+    # Without NumPy, semantic mode ranks with BM25
+    monkeypatch.setattr("sensei_mcp.orchestrator.semantic_available", lambda: False)
+    assert orchestrator.relevance_ranking("flaky tests in CI") == \
+        SkillOrchestrator(registry).relevance_ranking("flaky tests in CI")
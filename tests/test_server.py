@@ -11,7 +11,10 @@ Comprehensive tests to validate:
 6. Tool functionality
 """
 
+import asyncio
 import json
+import os
+import re
 import sys
 from pathlib import Path
 import tempfile
@@ -27,6 +30,9 @@ from sensei_mcp.server import (
     SessionManager,
     DIRECTIVES_PATH,
 )
+from sensei_mcp import engine
+from sensei_mcp.engine import PathShapeCache, estimate_tokens, summarize_section
+from sensei_mcp.server import get_engineering_context
 
 
 # ============================================================================
@@ -67,6 +73,106 @@ def test_section_extraction(context_type):
     assert len(content) > 50, f"Section {section_name} is too short"
 
 
+def test_section_index_matches_marker_scan():
+    """The offset index returns what scanning for each marker does, and misses are reported"""
+    rulebook = RulebookLoader(DIRECTIVES_PATH)
+    content = DIRECTIVES_PATH.read_text()
+    for context_type in ContextType:
+        match = re.search(f"<!-- SECTION: {context_type.value} -->(.*?)(?=<!-- SECTION:|$)", content, re.DOTALL)
+        assert rulebook.extract_section(context_type.value) == match.group(1).strip()
+
+    assert rulebook.extract_section("no_such_section") == "Section 'no_such_section' not found in directives."
+    assert rulebook.extract_multiple_sections(["no_such_section", "personality"]) == \
+        rulebook.extract_section("personality")
+
+
+def test_edited_rulebook_is_reloaded(tmp_path):
+    """Sections are re-indexed when the directives file changes on disk"""
+    directives = tmp_path / "core-directives.md"
+    directives.write_text("<!-- SECTION: alpha -->\nFirst alpha\n<!-- SECTION: beta -->\nBeta\n")
+    rulebook = RulebookLoader(directives)
+    assert rulebook.extract_section("alpha") == "First alpha"
+    assert "not found" in rulebook.extract_section("gamma")
+
+    directives.write_text("<!-- SECTION: gamma -->\nGamma\n<!-- SECTION: alpha -->\nSecond alpha, edited\n")
+    os.utime(directives, ns=(0, 10**18))  # Make sure the mtime moves on coarse-grained filesystems
+    assert rulebook.extract_section("alpha") == "Second alpha, edited"
+    assert rulebook.extract_section("gamma") == "Gamma"
+    assert "not found" in rulebook.extract_section("beta")
+
+    # A rulebook removed while running keeps being served
+    directives.unlink()
+    assert rulebook.extract_section("gamma") == "Gamma"
+
+
+def test_reload_during_a_call_keeps_versions_apart(tmp_path, monkeypatch):
+    """A reload by a concurrent call doesn't mix the old and the edited rulebook"""
+    directives = tmp_path / "core-directives.md"
+    directives.write_text("<!-- SECTION: alpha -->\nFirst alpha\n")
+    rulebook = RulebookLoader(directives)
+    edited = "Second alpha, edited at some length"
+
+    def summarize_while_reloaded(name, content):
+        # Another tool call loads the edited rulebook while this one is summarizing
+        monkeypatch.setattr(engine, "summarize_section", summarize_section)
+        directives.write_text(f"<!-- SECTION: alpha -->\n{edited}\n")
+        os.utime(directives, ns=(0, 10**18))
+        assert rulebook.extract_section("alpha") == edited
+        return summarize_section(name, content)
+
+    monkeypatch.setattr(engine, "summarize_section", summarize_while_reloaded)
+    assembly = rulebook.assemble_sections(["alpha"], max_tokens=1000)
+
+    assert assembly.content == "First alpha"
+    assert rulebook.section_tokens("alpha") == estimate_tokens(edited)
+
+
+def _write_rules(project_root, text):
+    rules = Path(project_root) / ".sensei" / "rules.md"
+    rules.parent.mkdir(parents=True, exist_ok=True)
+    rules.write_text(text)
+    return rules
+
+
+def test_local_rules_do_not_leak_between_projects(tmp_path):
+    """Rules are returned per project root and only appended when passed in"""
+    rulebook = RulebookLoader(DIRECTIVES_PATH)
+    _write_rules(tmp_path / "alpha", "Alpha rule: no ORMs")
+    (tmp_path / "beta").mkdir()
+
+    alpha_rules = rulebook.load_local_rules(str(tmp_path / "alpha"))
+    assert alpha_rules == "Alpha rule: no ORMs"
+    assert "Alpha rule" in rulebook.extract_multiple_sections(["personality"], local_rules=alpha_rules)
+
+    for other_project in [str(tmp_path / "beta"), None]:
+        rules = rulebook.load_local_rules(other_project)
+        assert rules is None
+        assert "Alpha rule" not in rulebook.extract_multiple_sections(["personality"], local_rules=rules)
+        assert "not found" in rulebook.extract_section("local_rules", local_rules=rules)
+
+
+def test_local_rules_cached_per_project_root(tmp_path, monkeypatch):
+    """Unchanged rules are served from memory, edits are picked up, the cache is bounded"""
+    rulebook = RulebookLoader(DIRECTIVES_PATH, local_rules_cache_size=2)
+    rules_file = _write_rules(tmp_path / "alpha", "Version 1")
+    assert rulebook.load_local_rules(str(tmp_path / "alpha")) == "Version 1"
+
+    reads = []
+    read_text = Path.read_text
+    monkeypatch.setattr(Path, "read_text", lambda self, *a, **kw: reads.append(self) or read_text(self, *a, **kw))
+    assert rulebook.load_local_rules(str(tmp_path / "alpha" / ".." / "alpha")) == "Version 1"
+    assert reads == []
+
+    rules_file.write_text("Version 2, longer")
+    assert rulebook.load_local_rules(str(tmp_path / "alpha")) == "Version 2, longer"
+    assert reads == [rules_file.resolve()]
+
+    for name in ["beta", "gamma"]:
+        _write_rules(tmp_path / name, name)
+        rulebook.load_local_rules(str(tmp_path / name))
+    assert list(rulebook._local_rules_cache) == [(tmp_path / "beta").resolve(), (tmp_path / "gamma").resolve()]
+
+
 # ============================================================================
 # Test Suite 3: File Pattern Mapping
 # ============================================================================
@@ -91,6 +197,144 @@ def test_file_pattern_mapping(file_path, expected_contexts):
     assert len(matches) > 0, f"Expected one of {[e.value for e in expected_contexts]}, got {[c.value for c in contexts]}"
 
 
+CLASSIFIER_PATHS = [
+    "services/billing/api/handler.go",
+    "src/.config/settings.json",           # ".c" and ".js" prefixes, as the regexes match them
+    "db/seed.ts",
+    "legacy/old-code/Makefile",            # Capitalized patterns never match the lowercased path
+    ".github/workflows/deploy.YAML",
+    "templates/emails/welcome.html",
+    "charts/datadog.yml",
+    "docs/breaking_change.rst",
+    "",
+]
+
+
+def _regex_scan(file_path):
+    contexts = set()
+    for pattern, context_types in ContextInferenceEngine.FILE_PATTERNS.items():
+        if re.search(pattern, file_path.lower()):
+            contexts.update(context_types)
+    return contexts
+
+
+@pytest.mark.parametrize("file_path", CLASSIFIER_PATHS)
+def test_file_classifier_matches_regex_scan(file_path):
+    """The compiled classifier gives exactly what searching every pattern does"""
+    classifier = ContextInferenceEngine.file_classifier()
+    assert classifier.contexts_for_mask(classifier.mask(file_path)) == _regex_scan(file_path)
+
+
+def test_classify_files_bulk():
+    """Bulk classification returns per-path contexts and their union"""
+    classification = ContextInferenceEngine.classify_files(CLASSIFIER_PATHS)
+
+    assert classification.per_path == {path: _regex_scan(path) for path in CLASSIFIER_PATHS}
+    assert classification.contexts == set().union(*classification.per_path.values())
+    assert ContextInferenceEngine.infer_contexts(file_paths=CLASSIFIER_PATHS) == \
+        classification.contexts | {ContextType.CORE_PRINCIPLES, ContextType.PERSONALITY}
+
+
+def test_path_shape_cache_skips_known_shapes(monkeypatch):
+    """Paths differing only in digit runs share one cached classification"""
+    monkeypatch.setattr(ContextInferenceEngine, "path_cache", PathShapeCache())
+    classifier = ContextInferenceEngine.file_classifier()
+    assert classifier.shape("DB/Migrations/0042_K8s.SQL") == "db/migrations/00_k8s.sql"
+
+    first = ContextInferenceEngine.classify_files(["db/migrations/0042_users.sql", "web/App.tsx"])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("known shape was matched again")
+
+    monkeypatch.setattr(classifier, "mask", fail)
+    second = ContextInferenceEngine.classify_files(["db/migrations/0043_users.sql", "web/App.tsx"])
+    assert list(second.per_path.values()) == list(first.per_path.values())
+    assert second.per_path["db/migrations/0043_users.sql"] == _regex_scan("db/migrations/0043_users.sql")
+    stats = ContextInferenceEngine.path_cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries'], stats['hit_rate']) == (2, 2, 2, 0.5)
+
+
+def test_path_shape_cache_persists_per_pattern_set(monkeypatch, tmp_path):
+    """Saved shapes are reloaded for the same FILE_PATTERNS only"""
+    cache_file = tmp_path / "cache" / "path-shapes.json"
+    monkeypatch.setattr(ContextInferenceEngine, "path_cache", PathShapeCache())
+    ContextInferenceEngine.classify_files(["api/v1/users.py", "infra/main.tf"])
+    assert ContextInferenceEngine.save_path_cache(cache_file)
+    assert not ContextInferenceEngine.save_path_cache(cache_file)  # Unchanged since the last save
+
+    monkeypatch.setattr(ContextInferenceEngine, "path_cache", PathShapeCache())
+    assert ContextInferenceEngine.load_path_cache(cache_file) == 2
+    ContextInferenceEngine.classify_files(["api/v2/users.py"])
+    assert ContextInferenceEngine.path_cache.stats()['hits'] == 0  # Single digits are kept
+    ContextInferenceEngine.classify_files(["infra/main.tf"])
+    assert ContextInferenceEngine.path_cache.stats()['hits'] == 1
+
+    # Different patterns: the saved masks don't apply
+    monkeypatch.setattr(ContextInferenceEngine, "path_cache", PathShapeCache())
+    monkeypatch.setattr(ContextInferenceEngine, "FILE_PATTERNS", {r'\.tf': [ContextType.CLOUD_PLATFORM]})
+    assert ContextInferenceEngine.load_path_cache(cache_file) == 0
+    assert ContextInferenceEngine.classify_files(["infra/main.tf"]).contexts == {ContextType.CLOUD_PLATFORM}
+
+
+def test_prioritized_contexts_order_by_source():
+    """Core, session-relevant, file, operation and keyword contexts come in that order"""
+    ordered = ContextInferenceEngine.prioritize_contexts(
+        file_paths=["README.md"],
+        operation="REFACTOR",
+        description="add caching for the checkout page",
+        session_text="All tenant data must stay isolated"
+    )
+    inferred = ContextInferenceEngine.infer_contexts(
+        file_paths=["README.md"], operation="REFACTOR", description="add caching for the checkout page"
+    )
+
+    assert set(ordered) == inferred and len(ordered) == len(inferred)
+    assert ordered[:2] == [ContextType.CORE_PRINCIPLES, ContextType.PERSONALITY]
+    file_contexts = ContextInferenceEngine.classify_files(["README.md"]).contexts
+    session_contexts = ContextInferenceEngine.keyword_contexts("All tenant data must stay isolated") & inferred
+    assert set(ordered[2:2 + len(session_contexts)]) == session_contexts
+    first_file = min(ordered.index(ctx) for ctx in file_contexts - session_contexts)
+    assert all(ordered.index(ctx) > first_file for ctx in inferred - file_contexts - session_contexts
+               - set(ContextInferenceEngine.CORE_CONTEXTS))
+
+
+@pytest.mark.parametrize("max_tokens", [60, 400, 1500, 100_000])
+def test_section_assembly_respects_budget(max_tokens):
+    """Sections are summarized before any is dropped, and expanded in priority order"""
+    rulebook = RulebookLoader(DIRECTIVES_PATH)
+    names = [ctx.value for ctx in ContextInferenceEngine.prioritize_contexts(
+        file_paths=["src/api/users.controller.ts"], operation="reviewing API endpoints"
+    )]
+    assembly = rulebook.assemble_sections(names, max_tokens, local_rules="Project rule: no ORMs")
+
+    assert assembly.tokens <= max_tokens
+    assert abs(estimate_tokens(assembly.content) - assembly.tokens) <= len(names)  # Rounding only
+    assert sorted(assembly.full + assembly.summarized + assembly.omitted) == sorted(names + ["local_rules"])
+    assert "local_rules" in assembly.full or max_tokens < 100
+    for name in assembly.summarized:  # Summarized only because the full text doesn't fit
+        summary_tokens = estimate_tokens(summarize_section(name, rulebook.extract_section(name)))
+        assert assembly.tokens - summary_tokens + rulebook.section_tokens(name) > max_tokens
+    if max_tokens == 100_000:
+        sections = [rulebook.extract_section(name) for name in names]
+        sections.insert(2, "# 🏠 Project Local Rules\n\nProject rule: no ORMs")
+        assert assembly.content == "\n\n---\n\n".join(sections)
+    if max_tokens == 1500:
+        assert assembly.full and assembly.summarized and not assembly.omitted
+        assert "returns the full section" in assembly.content
+
+
+def test_engineering_context_token_budget():
+    """get_engineering_context stays within max_tokens for the standards sections"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        unbounded = asyncio.run(get_engineering_context(file_paths=["src/api/users.controller.ts"],
+                                                        project_root=temp_dir))
+        bounded = asyncio.run(get_engineering_context(file_paths=["src/api/users.controller.ts"],
+                                                      project_root=temp_dir, max_tokens=800))
+
+    assert estimate_tokens(bounded) < estimate_tokens(unbounded)
+    assert "of 800 tokens" in bounded
+    assert "Token efficiency" in unbounded
+
 # ============================================================================
 # Test Suite 4: Operation Mapping
 # ============================================================================
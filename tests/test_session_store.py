@@ -0,0 +1,725 @@
+"""
+Tests for session storage backends.
+
+Testing JsonSessionStore (atomic writes, checksums, .bak recovery),
+JournalSessionStore (append, replay, compaction,
+migration from JSON sessions), SqliteSessionStore (indexed queries, import)
+and SessionManager integration, including concurrent writers in separate
+processes.
+"""
+
+import json
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from sensei_mcp.session import SessionManager
+from sensei_mcp.session_store import (
+    JsonSessionStore, JournalSessionStore, SqliteSessionStore,
+    dump_checksummed, parse_checksummed
+)
+
+
+@pytest.fixture
+def journal_manager(tmp_path):
+    """SessionManager backed by a journal store with synchronous compaction."""
+    store = JournalSessionStore(snapshot_every=5, background_compaction=False)
+    return SessionManager(global_session_dir=tmp_path, store=store)
+
+
+def _add_consultations(manager, count):
+    for i in range(count):
+        manager.add_consultation(
+            query=f"Query {i}",
+            mode="orchestrated",
+            personas_consulted=["pragmatic-architect"],
+            context="ARCHITECTURAL",
+            synthesis=f"Synthesis {i}"
+        )
+
+
+class TestJsonSessionStore:
+    """Test the default single-document store."""
+
+    def test_missing_session_returns_none(self, tmp_path):
+        assert JsonSessionStore().load(tmp_path / "missing.json") is None
+
+    def test_round_trip(self, tmp_path):
+        manager = SessionManager(global_session_dir=tmp_path)
+        manager.get_or_create_session("round-trip")
+        manager.add_decision("architecture", "Use Postgres", "Proven at scale")
+        _add_consultations(manager, 2)
+
+        loaded = JsonSessionStore().load(tmp_path / "round-trip.json")
+        assert [d.description for d in loaded.decisions] == ["Use Postgres"]
+        assert [c.id for c in loaded.consultations] == ["consult_1", "consult_2"]
+
+    def test_checksum_footer(self):
+        text = dump_checksummed({'session_id': 'x', 'decisions': []})
+        assert json.loads(text)['_checksum'].startswith("crc32:")
+        assert parse_checksummed(text) == {'session_id': 'x', 'decisions': []}
+
+        with pytest.raises(ValueError):
+            parse_checksummed(text.replace('"x"', '"y"'))
+
+    def test_legacy_file_without_checksum(self, tmp_path):
+        manager = SessionManager(global_session_dir=tmp_path)
+        manager.get_or_create_session("legacy")
+        manager.add_decision("architecture", "Use Postgres", "Proven at scale")
+
+        session_file = tmp_path / "legacy.json"
+        data = json.loads(session_file.read_text())
+        del data['_checksum']
+        session_file.write_text(json.dumps(data, indent=2))
+
+        assert len(JsonSessionStore().load(session_file).decisions) == 1
+
+    def test_no_temp_files_left_behind(self, tmp_path):
+        manager = SessionManager(global_session_dir=tmp_path, store=JsonSessionStore(durability="dir"))
+        manager.get_or_create_session("atomic")
+        _add_consultations(manager, 3)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["atomic.json", "atomic.json.bak", "atomic.json.lock"]
+
+    def test_torn_write_recovers_previous_generation(self, tmp_path, capsys):
+        manager = SessionManager(global_session_dir=tmp_path)
+        manager.get_or_create_session("torn")
+        _add_consultations(manager, 2)
+
+        session_file = tmp_path / "torn.json"
+        text = session_file.read_text()
+        session_file.write_text(text[:len(text) // 2])
+
+        loaded = JsonSessionStore().load(session_file)
+        assert [c.id for c in loaded.consultations] == ["consult_1"]
+        assert "torn.json is corrupt" in capsys.readouterr().err
+
+    def test_list_sessions_uses_backup(self, tmp_path):
+        manager = SessionManager(global_session_dir=tmp_path)
+        manager.get_or_create_session("listed")
+        _add_consultations(manager, 2)
+        (tmp_path / "listed.json").write_text("{")
+
+        assert [s['id'] for s in JsonSessionStore().list_sessions(tmp_path)] == ["listed"]
+
+    def test_unknown_durability_policy(self):
+        with pytest.raises(ValueError):
+            JsonSessionStore(durability="paranoid")
+
+
+class TestJournalSessionStore:
+    """Test append-only storage with snapshots."""
+
+    def test_appends_one_line_per_mutation(self, tmp_path, journal_manager):
+        journal_manager.get_or_create_session("journal")
+        journal_manager.add_decision("architecture", "Use Postgres", "Proven at scale")
+        _add_consultations(journal_manager, 2)
+
+        journal = tmp_path / "journal.journal.jsonl"
+        lines = journal.read_text().splitlines()
+        # The first write creates the snapshot; later mutations are journaled
+        assert [json.loads(line)['op'] for line in lines] == ["consultation", "consultation"]
+
+        snapshot = json.loads((tmp_path / "journal.json").read_text())
+        assert len(snapshot['decisions']) == 1
+        assert len(snapshot['consultations']) == 0
+
+    def test_replay_rebuilds_state(self, tmp_path, journal_manager):
+        journal_manager.get_or_create_session("replay")
+        _add_consultations(journal_manager, 3)
+
+        reloaded = SessionManager(tmp_path, store=JournalSessionStore()).get_or_create_session("replay")
+        assert [c.id for c in reloaded.consultations] == ["consult_1", "consult_2", "consult_3"]
+        assert reloaded.consultations[2].synthesis == "Synthesis 2"
+
+    def test_compaction_trims_journal(self, tmp_path, journal_manager):
+        journal_manager.get_or_create_session("compact")
+        _add_consultations(journal_manager, 7)
+
+        snapshot = json.loads((tmp_path / "compact.json").read_text())
+        journal = tmp_path / "compact.journal.jsonl"
+        remaining = [json.loads(line)['seq'] for line in journal.read_text().splitlines()]
+
+        assert snapshot['journal_seq'] == 5
+        assert len(snapshot['consultations']) == 6
+        assert remaining == [6]
+
+        reloaded = SessionManager(tmp_path, store=JournalSessionStore()).get_or_create_session("compact")
+        assert len(reloaded.consultations) == 7
+
+    def test_background_compaction(self, tmp_path):
+        store = JournalSessionStore(snapshot_every=3)
+        manager = SessionManager(tmp_path, store=store)
+        manager.get_or_create_session("background")
+        _add_consultations(manager, 10)
+        manager.close()
+
+        reloaded = SessionManager(tmp_path, store=JournalSessionStore()).get_or_create_session("background")
+        assert [c.id for c in reloaded.consultations] == [f"consult_{i}" for i in range(1, 11)]
+
+    @pytest.mark.parametrize("background", [False, True], ids=["sync", "background"])
+    def test_own_compaction_is_not_a_foreign_write(self, tmp_path, monkeypatch, background):
+        store = JournalSessionStore(snapshot_every=3, background_compaction=background)
+        manager = SessionManager(tmp_path, store=store)
+        rebases = []
+        monkeypatch.setattr(manager, "_rebase", lambda *args: rebases.append(args))
+
+        session = manager.get_or_create_session("compacted")
+        for _ in range(10):
+            _add_consultations(manager, 1)
+            store.close()  # Let a background compaction finish before the next write
+
+        assert json.loads((tmp_path / "compacted.json").read_text())['journal_seq'] == 9
+        assert rebases == []
+        assert manager.get_or_create_session("compacted") is session
+
+        # Writes from elsewhere still count
+        other = SessionManager(tmp_path, store=JournalSessionStore())
+        other.get_or_create_session("compacted")
+        _add_consultations(other, 1)
+        assert len(manager.get_or_create_session("compacted").consultations) == 11
+
+    def test_full_save_writes_snapshot(self, tmp_path, journal_manager):
+        session = journal_manager.get_or_create_session("full-save")
+        _add_consultations(journal_manager, 2)
+        session.active_constraints.append("postgres-only")
+        journal_manager.save_session()
+
+        assert not (tmp_path / "full-save.journal.jsonl").exists()
+        snapshot = json.loads((tmp_path / "full-save.json").read_text())
+        assert snapshot['active_constraints'] == ["postgres-only"]
+        assert len(snapshot['consultations']) == 2
+
+    def test_torn_tail_is_ignored(self, tmp_path, journal_manager):
+        journal_manager.get_or_create_session("torn")
+        _add_consultations(journal_manager, 3)
+
+        journal = tmp_path / "torn.journal.jsonl"
+        with open(journal, 'a') as f:
+            f.write('{"seq": 4, "op": "consultation", "rec')
+
+        manager = SessionManager(tmp_path, store=JournalSessionStore())
+        session = manager.get_or_create_session("torn")
+        assert len(session.consultations) == 3
+
+        # New appends start on a clean line after the torn tail is dropped
+        _add_consultations(manager, 1)
+        reloaded = SessionManager(tmp_path, store=JournalSessionStore()).get_or_create_session("torn")
+        assert [c.id for c in reloaded.consultations][-1] == "consult_4"
+
+    def test_migrates_existing_json_session(self, tmp_path):
+        legacy = SessionManager(tmp_path)
+        legacy.get_or_create_session("legacy")
+        legacy.add_decision("architecture", "Use Postgres", "Proven at scale")
+
+        manager = SessionManager(tmp_path, store=JournalSessionStore())
+        session = manager.get_or_create_session("legacy")
+        assert session.decisions[0].description == "Use Postgres"
+
+        manager.add_decision("pattern", "Hexagonal architecture", "Testability")
+        reloaded = SessionManager(tmp_path, store=JournalSessionStore()).get_or_create_session("legacy")
+        assert [d.id for d in reloaded.decisions] == ["dec_1", "dec_2"]
+
+
+class TestSqliteSessionStore:
+    """Test the indexed SQLite backend."""
+
+    @pytest.fixture
+    def sqlite_manager(self, tmp_path):
+        manager = SessionManager(global_session_dir=tmp_path, store=SqliteSessionStore())
+        yield manager
+        manager.close()
+
+    @pytest.mark.parametrize("durability,level", [("none", 1), ("file", 2), ("dir", 2)])
+    def test_durability_never_turns_sync_off(self, tmp_path, durability, level):
+        store = SqliteSessionStore(durability=durability)
+        conn = store._connect(tmp_path)
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == level  # 1 NORMAL, 2 FULL
+        store.close()
+
+    def test_lists_legacy_json_sessions(self, tmp_path):
+        legacy = SessionManager(tmp_path)
+        legacy.get_or_create_session("legacy")
+        legacy.add_decision("architecture", "Use Postgres", "Proven at scale")
+
+        manager = SessionManager(tmp_path, store=SqliteSessionStore())
+        manager.get_or_create_session("native")
+        manager.add_decision("pattern", "Hexagonal architecture", "Testability")
+
+        listed = {s['id']: s['decisions'] for s in manager.list_sessions()}
+        assert listed == {"legacy": 1, "native": 1}
+        assert manager.get_or_create_session("legacy").decisions[0].description == "Use Postgres"
+        manager.close()
+
+    def test_round_trip(self, tmp_path, sqlite_manager):
+        session = sqlite_manager.get_or_create_session("sqlite")
+        sqlite_manager.add_decision("architecture", "Use Postgres", "Proven at scale",
+                                    context={"constraint": "postgres-only"})
+        session.active_constraints.append("postgres-only")
+        session.patterns_agreed.append("hexagonal-architecture")
+        sqlite_manager.save_session()
+        _add_consultations(sqlite_manager, 2)
+
+        assert (tmp_path / "sessions.db").exists()
+        assert not (tmp_path / "sqlite.json").exists()
+
+        reloaded = SessionManager(tmp_path, store=SqliteSessionStore()).get_or_create_session("sqlite")
+        assert reloaded.decisions[0].context == {"constraint": "postgres-only"}
+        assert reloaded.active_constraints == ["postgres-only"]
+        assert reloaded.patterns_agreed == ["hexagonal-architecture"]
+        assert [c.id for c in reloaded.consultations] == ["consult_1", "consult_2"]
+        assert reloaded.consultations[0].personas_consulted == ["pragmatic-architect"]
+
+    def test_list_sessions(self, sqlite_manager):
+        sqlite_manager.get_or_create_session("alpha")
+        sqlite_manager.add_decision("architecture", "Use Postgres", "Proven at scale")
+        sqlite_manager.get_or_create_session("beta")
+        _add_consultations(sqlite_manager, 1)
+
+        summaries = {s['id']: s['decisions'] for s in sqlite_manager.list_sessions()}
+        assert summaries == {"alpha": 1, "beta": 0}
+
+    def test_find_consultation(self, sqlite_manager):
+        sqlite_manager.get_or_create_session("lookup")
+        _add_consultations(sqlite_manager, 3)
+
+        consultation = sqlite_manager.find_consultation("consult_2", "lookup")
+        assert consultation.query == "Query 1"
+        assert sqlite_manager.find_consultation("consult_9", "lookup") is None
+
+    def test_load_session_window(self, sqlite_manager):
+        session = sqlite_manager.get_or_create_session("window")
+        _add_consultations(sqlite_manager, 2)
+        session.consultations[0].timestamp = "2020-01-01T00:00:00"
+        sqlite_manager.save_session()
+
+        windowed = sqlite_manager.load_session_window("window", since="2021-01-01")
+        assert [c.id for c in windowed.consultations] == ["consult_2"]
+
+    def test_import_json_sessions(self, tmp_path):
+        legacy = SessionManager(tmp_path)
+        for session_id in ("one", "two"):
+            legacy.get_or_create_session(session_id)
+            legacy.add_decision("architecture", f"Decision for {session_id}", "Because")
+        (tmp_path / "broken.json").write_text("{not json")
+
+        store = SqliteSessionStore()
+        assert store.import_json_sessions(tmp_path) == ["one", "two"]
+        assert sorted(s['id'] for s in store.list_sessions(tmp_path)) == ["one", "two"]
+        store.close()
+
+    def test_lazy_import_of_json_session(self, tmp_path):
+        legacy = SessionManager(tmp_path)
+        legacy.get_or_create_session("legacy")
+        legacy.add_decision("architecture", "Use Postgres", "Proven at scale")
+
+        manager = SessionManager(tmp_path, store=SqliteSessionStore())
+        assert manager.get_or_create_session("legacy").decisions[0].description == "Use Postgres"
+        manager.close()
+
+
+class TestSessionCache:
+    """Test the SessionManager LRU cache."""
+
+    def test_repeat_reads_hit_cache(self, tmp_path):
+        manager = SessionManager(tmp_path)
+        manager.get_or_create_session("cached")
+        manager.add_decision("architecture", "Use Postgres", "Proven at scale")
+
+        first = manager.get_or_create_session("cached")
+        second = manager.get_or_create_session("cached")
+
+        assert first is second
+        assert manager.cache_stats()['hits'] == 2
+
+    def test_external_write_invalidates(self, tmp_path):
+        manager = SessionManager(tmp_path)
+        manager.get_or_create_session("shared")
+        manager.add_decision("architecture", "Use Postgres", "Proven at scale")
+
+        other = SessionManager(tmp_path)
+        other.get_or_create_session("shared")
+        other.add_decision("pattern", "Hexagonal architecture", "Testability")
+
+        session = manager.get_or_create_session("shared")
+        assert [d.id for d in session.decisions] == ["dec_1", "dec_2"]
+
+    def test_unsaved_sessions_are_shared_not_cached(self, tmp_path):
+        manager = SessionManager(tmp_path)
+        first = manager.get_or_create_session("fresh")
+        second = manager.get_or_create_session("fresh")
+
+        assert first is second
+        assert manager.cache_stats()['entries'] == 0
+        assert manager.cache_stats()['misses'] == 1
+
+    def test_superseded_copy_is_rebased(self, tmp_path):
+        manager = SessionManager(tmp_path, cache_max_entries=0)
+        stale = manager.get_or_create_session("shared")
+        manager.add_decision("architecture", "Use Postgres", "Proven at scale")
+
+        other = SessionManager(tmp_path)
+        other.get_or_create_session("shared")
+        other.add_decision("pattern", "Hexagonal architecture", "Testability")
+
+        fresh = manager.get_or_create_session("shared")
+        assert fresh is not stale and len(fresh.decisions) == 2
+
+        # A tool call still working on the copy read before the other write
+        manager.current_session = stale
+        decision = manager.add_decision("security", "Rotate keys", "Compliance")
+
+        assert decision.id == "dec_3"
+        stored = JsonSessionStore().load(tmp_path / "shared.json")
+        assert [d.description for d in stored.decisions] == [
+            "Use Postgres", "Hexagonal architecture", "Rotate keys"
+        ]
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        manager = SessionManager(tmp_path, cache_max_entries=2)
+        for session_id in ("a", "b", "c"):
+            manager.get_or_create_session(session_id)
+            manager.save_session()
+
+        manager.get_or_create_session("c")
+        stats = manager.cache_stats()
+        assert stats['entries'] == 2
+        assert stats['hits'] == 1
+
+        manager.get_or_create_session("a")
+        assert manager.cache_stats()['misses'] == 4
+
+    def test_byte_budget(self, tmp_path):
+        manager = SessionManager(tmp_path, cache_max_bytes=1000)
+        manager.get_or_create_session("large")
+        manager.add_consultation(
+            query="Query", mode="orchestrated", personas_consulted=[],
+            context="GENERAL", synthesis="x" * 5000
+        )
+
+        assert manager.cache_stats()['entries'] == 0
+
+    def test_sqlite_cache_invalidation(self, tmp_path):
+        manager = SessionManager(tmp_path, store=SqliteSessionStore())
+        manager.get_or_create_session("shared")
+        manager.add_decision("architecture", "Use Postgres", "Proven at scale")
+        assert manager.get_or_create_session("shared") is manager.current_session
+        assert manager.cache_stats()['hits'] == 1
+
+        other = SessionManager(tmp_path, store=SqliteSessionStore())
+        other.get_or_create_session("shared")
+        other.add_decision("pattern", "Hexagonal architecture", "Testability")
+
+        assert len(manager.get_or_create_session("shared").decisions) == 2
+        manager.close()
+        other.close()
+
+
+class _CountingStore(JsonSessionStore):
+    """JsonSessionStore that counts writes."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def save(self, session_file, session):
+        self.writes += 1
+        super().save(session_file, session)
+
+
+class TestWriteCoalescing:
+    """Test batch() and debounced flushing."""
+
+    def test_batch_writes_once(self, tmp_path):
+        store = _CountingStore()
+        manager = SessionManager(tmp_path, store=store)
+
+        with manager.batch():
+            session = manager.get_or_create_session("batched")
+            manager.add_decision("architecture", "Use Postgres", "Proven at scale")
+            session.active_constraints.append("postgres-only")
+            manager.save_session()
+            session.patterns_agreed.append("hexagonal-architecture")
+            manager.save_session()
+            assert store.writes == 0
+
+        assert store.writes == 1
+        reloaded = SessionManager(tmp_path).get_or_create_session("batched")
+        assert reloaded.active_constraints == ["postgres-only"]
+        assert reloaded.patterns_agreed == ["hexagonal-architecture"]
+        assert len(reloaded.decisions) == 1
+
+    def test_nested_batches_flush_at_outermost_exit(self, tmp_path):
+        store = _CountingStore()
+        manager = SessionManager(tmp_path, store=store)
+
+        with manager.batch():
+            manager.get_or_create_session("nested")
+            with manager.batch():
+                _add_consultations(manager, 2)
+            assert store.writes == 0
+            _add_consultations(manager, 1)
+
+        assert store.writes == 1
+
+    def test_debounce_coalesces_tool_calls(self, tmp_path):
+        store = _CountingStore()
+        manager = SessionManager(tmp_path, store=store, flush_interval=60)
+        manager.get_or_create_session("debounced")
+        _add_consultations(manager, 5)
+        assert store.writes == 0
+
+        # Reads see queued mutations before they reach disk
+        assert len(manager.get_or_create_session("debounced").consultations) == 5
+
+        manager.close()
+        assert store.writes == 1
+        reloaded = SessionManager(tmp_path).get_or_create_session("debounced")
+        assert len(reloaded.consultations) == 5
+
+    def test_store_queries_see_queued_writes(self, tmp_path):
+        manager = SessionManager(tmp_path, store=SqliteSessionStore(), flush_interval=60)
+        manager.get_or_create_session("debounced")
+        _add_consultations(manager, 2)
+        manager.add_decision("architecture", "Use Postgres", "Proven at scale")
+
+        assert manager.find_consultation("consult_2", "debounced").query == "Query 1"
+        assert len(manager.load_session_window("debounced").consultations) == 2
+        assert manager.list_sessions()[0]['decisions'] == 1
+        manager.close()
+
+    def test_debounce_timer_flushes(self, tmp_path):
+        store = _CountingStore()
+        manager = SessionManager(tmp_path, store=store, flush_interval=0.05)
+        manager.get_or_create_session("timer")
+        _add_consultations(manager, 3)
+
+        deadline = time.monotonic() + 5
+        while store.writes == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.writes == 1
+
+    def test_batches_are_per_thread(self, tmp_path):
+        store = _CountingStore()
+        manager = SessionManager(tmp_path, store=store)
+        opened, resume = threading.Event(), threading.Event()
+
+        def batched():
+            with manager.batch():
+                manager.get_or_create_session("batched")
+                _add_consultations(manager, 1)
+                opened.set()
+                resume.wait(timeout=10)
+                _add_consultations(manager, 1)
+
+        worker = threading.Thread(target=batched)
+        worker.start()
+        assert opened.wait(timeout=5)
+
+        # Another thread's writes don't wait for the open batch, and its
+        # reads don't write out half of it
+        manager.get_or_create_session("direct")
+        _add_consultations(manager, 1)
+        assert (tmp_path / "direct.json").exists()
+        assert manager.find_consultation("consult_1", "batched") is None
+        manager.list_sessions()
+        manager.flush()
+        assert not (tmp_path / "batched.json").exists()
+
+        resume.set()
+        worker.join(timeout=5)
+        assert store.writes == 2
+        reloaded = SessionManager(tmp_path).get_or_create_session("batched")
+        assert len(reloaded.consultations) == 2
+
+    def test_record_decision_tool_writes_once(self, tmp_path, monkeypatch):
+        from sensei_mcp import server
+
+        store = _CountingStore()
+        monkeypatch.setattr(server, "session_mgr", SessionManager(tmp_path, store=store))
+        server.record_decision.blocking(
+            category="architecture",
+            description="Use Postgres",
+            rationale="Proven at scale",
+            session_id="tool",
+            constraint="postgres-only",
+            pattern="repository-pattern"
+        )
+
+        assert store.writes == 1
+
+
+class _BlockingStore(JsonSessionStore):
+    """JsonSessionStore whose saves of one session wait until released."""
+
+    def __init__(self, blocked_session):
+        super().__init__()
+        self.blocked_session = blocked_session
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def save(self, session_file, session):
+        if session.session_id == self.blocked_session:
+            self.entered.set()
+            self.release.wait(timeout=10)
+        super().save(session_file, session)
+
+
+class TestThreadedCalls:
+    """Test that calls on different sessions don't wait for each other."""
+
+    def test_slow_write_holds_up_only_its_session(self, tmp_path):
+        store = _BlockingStore("slow")
+        manager = SessionManager(tmp_path, store=store)
+
+        def record(session_id):
+            manager.get_or_create_session(session_id)
+            manager.add_decision("architecture", f"{session_id} decision", "Because")
+
+        slow = threading.Thread(target=record, args=("slow",))
+        slow.start()
+        assert store.entered.wait(timeout=5)
+
+        fast = threading.Thread(target=record, args=("fast",))
+        fast.start()
+        fast.join(timeout=5)
+        finished_while_blocked = not fast.is_alive()
+
+        store.release.set()
+        slow.join(timeout=5)
+        assert finished_while_blocked and not slow.is_alive()
+        for session_id in ("slow", "fast"):
+            stored = JsonSessionStore().load(tmp_path / f"{session_id}.json")
+            assert [d.description for d in stored.decisions] == [f"{session_id} decision"]
+
+
+class TestDecisionsMarkdown:
+    """Test the incrementally maintained decisions.md projection."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        (tmp_path / "project" / ".sensei").mkdir(parents=True)
+        return tmp_path / "project"
+
+    def test_newest_first_and_prepends(self, tmp_path, project):
+        manager = SessionManager(global_session_dir=tmp_path / "global")
+        manager.get_or_create_session("adr", project_root=str(project))
+        manager.add_decision("architecture", "Use Postgres", "Proven at scale")
+        manager.add_decision("architecture", "Use Redis", "Caching")
+
+        md = (project / ".sensei" / "decisions.md").read_text()
+        assert md.startswith("# Architectural Decisions Log\n<!-- sensei:decisions session=adr rendered=2 -->")
+        assert md.index("## dec_2: Use Redis") < md.index("## dec_1: Use Postgres")
+
+        # Existing entries are kept as-is (not re-rendered) when a decision is added
+        md_file = project / ".sensei" / "decisions.md"
+        md_file.write_text(md + "Edited by hand\n")
+        other = SessionManager(global_session_dir=tmp_path / "global")
+        other.get_or_create_session("adr", project_root=str(project))
+        other.add_decision("security", "Rotate keys", "Compliance")
+
+        updated = md_file.read_text()
+        assert "rendered=3" in updated
+        assert updated.index("## dec_3: Rotate keys") < updated.index("## dec_2: Use Redis")
+        assert updated.endswith("Edited by hand\n")
+
+    def test_consultations_do_not_touch_file(self, tmp_path, project):
+        manager = SessionManager(global_session_dir=tmp_path / "global")
+        manager.get_or_create_session("adr", project_root=str(project))
+        manager.add_decision("architecture", "Use Postgres", "Proven at scale")
+
+        md_file = project / ".sensei" / "decisions.md"
+        before = md_file.stat().st_mtime_ns
+        time.sleep(0.01)
+        _add_consultations(manager, 3)
+        assert md_file.stat().st_mtime_ns == before
+
+    def test_background_writer(self, tmp_path, project):
+        manager = SessionManager(global_session_dir=tmp_path / "global", background_markdown=True)
+        manager.get_or_create_session("adr", project_root=str(project))
+        for i in range(5):
+            manager.add_decision("architecture", f"Decision {i}", "Because")
+        manager.close()
+
+        md = (project / ".sensei" / "decisions.md").read_text()
+        assert "rendered=5" in md
+        assert md.count("## dec_") == 5
+
+
+def _append_from_process(session_dir, store_name, worker, count):
+    """Worker for the multi-process tests: append ``count`` consultations."""
+    stores = {
+        'json': JsonSessionStore,
+        'journal': lambda: JournalSessionStore(snapshot_every=7, background_compaction=False),
+        'sqlite': SqliteSessionStore,
+    }
+    manager = SessionManager(global_session_dir=session_dir, store=stores[store_name]())
+    for i in range(count):
+        manager.get_or_create_session("shared")
+        manager.add_consultation(
+            query=f"worker {worker} query {i}",
+            mode="orchestrated",
+            personas_consulted=["pragmatic-architect"],
+            context="ARCHITECTURAL",
+            synthesis="ok"
+        )
+        if i % 5 == 0:
+            manager.get_or_create_session("shared")
+            manager.add_decision("architecture", f"worker {worker} decision {i}", "stress")
+    manager.close()
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(),
+                    reason="needs the fork start method")
+class TestMultiProcessWriters:
+    """Test that concurrent processes appending to one session lose nothing."""
+
+    WORKERS = 4
+    PER_WORKER = 20
+
+    @pytest.mark.parametrize("store_name", ["json", "journal", "sqlite"])
+    def test_no_lost_or_duplicate_records(self, tmp_path, store_name):
+        ctx = multiprocessing.get_context("fork")
+        workers = [
+            ctx.Process(target=_append_from_process, args=(tmp_path, store_name, w, self.PER_WORKER))
+            for w in range(self.WORKERS)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        store = {
+            'json': JsonSessionStore,
+            'journal': JournalSessionStore,
+            'sqlite': SqliteSessionStore,
+        }[store_name]()
+        session = SessionManager(global_session_dir=tmp_path, store=store).get_or_create_session("shared")
+
+        total = self.WORKERS * self.PER_WORKER
+        assert sorted(c.query for c in session.consultations) == sorted(
+            f"worker {w} query {i}" for w in range(self.WORKERS) for i in range(self.PER_WORKER)
+        )
+        assert [c.id for c in session.consultations] == [f"consult_{n}" for n in range(1, total + 1)]
+
+        decisions_per_worker = len(range(0, self.PER_WORKER, 5))
+        assert len(session.decisions) == self.WORKERS * decisions_per_worker
+        assert len({d.id for d in session.decisions}) == len(session.decisions)
+
+    def test_stale_copy_is_rebased(self, tmp_path):
+        first = SessionManager(global_session_dir=tmp_path)
+        second = SessionManager(global_session_dir=tmp_path)
+        first.get_or_create_session("shared")
+        second.get_or_create_session("shared")
+
+        first.add_decision("architecture", "Use Postgres", "Proven at scale")
+        second.current_session.active_constraints.append("No vendor lock-in")
+        decision = second.add_decision("architecture", "Use Redis", "Caching")
+
+        assert decision.id == "dec_2"
+        stored = JsonSessionStore().load(tmp_path / "shared.json")
+        assert [d.description for d in stored.decisions] == ["Use Postgres", "Use Redis"]
+        assert stored.active_constraints == ["No vendor lock-in"]
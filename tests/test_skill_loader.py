@@ -0,0 +1,209 @@
+"""
+Tests for SkillLoader.load_all_skills.
+
+Testing deterministic ordering, parallel loading, per-file timings,
+error aggregation, lazily read SKILL.md bodies, section/page reads and
+registry loading and reloading under concurrent calls.
+"""
+
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from sensei_mcp.personas import PersonaRegistry
+from sensei_mcp.personas.content import paginate, read_skill_bytes
+from sensei_mcp.personas.loader import SkillLoader, SkillLoadReport
+from sensei_mcp.personas.retrieval import BM25Index
+
+
+SKILLS_DIR = Path(__file__).parent.parent / "src" / "sensei_mcp" / "personas" / "skills"
+
+
+@pytest.fixture
+def skills_dir(tmp_path):
+    """A few valid skills plus two malformed ones."""
+    target = tmp_path / "skills"
+    target.mkdir()
+    for name in ["snarky-senior-engineer.md", "pragmatic-architect.md", "security-sentinel.md"]:
+        shutil.copy(SKILLS_DIR / name, target / name)
+    (target / "no-frontmatter.md").write_text("# Just a heading\n")
+    (target / "no-name.md").write_text("---\ndescription: \"Missing name\"\n---\n")
+    return target
+
+
+def test_parallel_matches_serial():
+    serial = SkillLoader.load_all_skills(SKILLS_DIR)
+    threaded = SkillLoader.load_all_skills(SKILLS_DIR, workers=4)
+
+    assert list(threaded) == list(serial)
+    assert threaded == serial
+
+
+def test_order_follows_file_names(skills_dir):
+    skills = SkillLoader.load_all_skills(skills_dir, workers=2, report=SkillLoadReport())
+    assert list(skills) == ["pragmatic-architect", "security-sentinel", "snarky-senior-engineer"]
+
+
+def test_report_collects_timings_and_errors(skills_dir):
+    report = SkillLoadReport()
+    SkillLoader.load_all_skills(skills_dir, workers=2, report=report)
+
+    assert set(report.timings) == {path.name for path in skills_dir.glob("*.md")}
+    assert sorted(report.errors) == ["no-frontmatter.md", "no-name.md"]
+    assert "Missing required field 'name'" in report.errors["no-name.md"]
+    assert len(report.slowest(2)) == 2
+    assert report.total_seconds > 0
+
+
+def test_errors_are_summarized_on_stderr(skills_dir, capsys):
+    SkillLoader.load_all_skills(skills_dir)
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Failed to load 2 skill file(s)" in captured.err
+    assert "no-frontmatter.md" in captured.err
+
+
+def test_no_valid_skills_lists_errors(tmp_path):
+    (tmp_path / "broken.md").write_text("no frontmatter")
+
+    with pytest.raises(ValueError, match="broken.md"):
+        SkillLoader.load_all_skills(tmp_path)
+
+
+def test_metadata_only_load_keeps_source_path(skills_dir):
+    skills = SkillLoader.load_all_skills(skills_dir, include_content=False, report=SkillLoadReport())
+
+    assert all('full_content' not in data for data in skills.values())
+    assert skills['security-sentinel']['source_path'] == str(skills_dir / "security-sentinel.md")
+
+
+def test_registry_reads_bodies_lazily(skills_dir):
+    registry = PersonaRegistry(skills_dir, content_cache_size=1)
+    personas = registry.get_all()
+
+    expected = (skills_dir / "pragmatic-architect.md").read_text(encoding='utf-8')
+    assert personas['pragmatic-architect'].full_content == expected
+    assert personas['pragmatic-architect'].full_content == expected
+    assert personas['security-sentinel'].full_content.startswith("---")
+
+    # One body resident at a time; the repeat read was a hit
+    stats = registry.content_cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 1)
+
+
+def test_offset_reads(skills_dir):
+    path = skills_dir / "security-sentinel.md"
+    data = path.read_bytes()
+
+    assert read_skill_bytes(path, 4, 20) == data[4:20]
+    assert read_skill_bytes(path) == data
+
+
+def test_sections_are_read_by_offset(skills_dir):
+    registry = PersonaRegistry(skills_dir)
+    persona = registry.get('snarky-senior-engineer')
+    text = (skills_dir / "snarky-senior-engineer.md").read_text(encoding='utf-8')
+
+    assert [s.number for s in persona.sections] == list(range(57))
+    apis = persona.find_section("APIs & Contracts")
+    assert persona.find_section("4") == persona.find_section("apis") == apis
+    assert persona.section_content(apis) == text[text.index("## 4. "):text.index("## 5. ")]
+    assert persona.find_section("Risk, Compliance & Data Governance").number == 18
+    assert persona.find_section("99") is None
+    assert registry.content_cache.stats()['misses'] == 0  # The body was never loaded
+
+
+def test_stale_section_offsets_are_reindexed(skills_dir):
+    persona = PersonaRegistry(skills_dir).get('security-sentinel')
+    section = persona.find_section("2")
+    path = skills_dir / "security-sentinel.md"
+    path.write_text(path.read_text(encoding='utf-8').replace("## 0.", "Added line\n\n## 0.", 1), encoding='utf-8')
+
+    assert persona.section_content(section).startswith("## 2. Security Domains")
+
+
+@pytest.mark.parametrize("max_chars", [1, 200, 3000, 10 ** 6])
+def test_pages_reassemble(max_chars):
+    text = (SKILLS_DIR / "security-sentinel.md").read_text(encoding='utf-8')
+    pages, offset = [], 0
+    while offset is not None:
+        page, offset = paginate(text, offset, max_chars)
+        assert 0 < len(page) <= max_chars
+        pages.append(page)
+
+    assert "".join(pages) == text
+    if max_chars == 3000:
+        assert all(page.endswith("\n") for page in pages)
+
+
+def test_reload_picks_up_edited_skills(skills_dir):
+    registry = PersonaRegistry(skills_dir)
+    assert registry.get('security-sentinel').description.startswith("Acts as")
+    index = registry.search_index()
+
+    path = skills_dir / "security-sentinel.md"
+    path.write_text(path.read_text(encoding='utf-8').replace('description: "', 'description: "Reloaded. ', 1),
+                    encoding='utf-8')
+    registry.reload()
+
+    assert registry.get('security-sentinel').description.startswith("Reloaded. ")
+    assert registry.search_index() is not index
+
+
+def test_concurrent_first_calls_load_once(skills_dir, monkeypatch):
+    calls = {'load': 0, 'build': 0}
+    load_all_skills, build = SkillLoader.load_all_skills, BM25Index.build
+
+    def slow_load(*args, **kwargs):
+        calls['load'] += 1
+        time.sleep(0.05)  # Long enough for every thread to arrive
+        return load_all_skills(*args, **kwargs)
+
+    def counted_build(*args, **kwargs):
+        calls['build'] += 1
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(SkillLoader, "load_all_skills", slow_load)
+    monkeypatch.setattr(BM25Index, "build", counted_build)
+    registry = PersonaRegistry(skills_dir)
+    barrier = threading.Barrier(4)
+    indexes = []
+
+    def first_call():
+        barrier.wait()
+        indexes.append(registry.search_index())
+
+    threads = [threading.Thread(target=first_call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == {'load': 1, 'build': 1}
+    assert len(indexes) == 4 and all(index is indexes[0] for index in indexes)
+
+
+def test_calls_during_reload_see_the_previous_load(skills_dir, monkeypatch):
+    registry = PersonaRegistry(skills_dir)
+    before = registry.get_all()
+    load_all_skills = SkillLoader.load_all_skills
+    during = []
+
+    def load_while_called(*args, **kwargs):
+        # Another tool call runs while the skills are parsed again
+        monkeypatch.setattr(SkillLoader, "load_all_skills", load_all_skills)
+        reader = threading.Thread(target=lambda: during.append(registry.get_all()))
+        reader.start()
+        reader.join(timeout=10)
+        return load_all_skills(*args, **kwargs)
+
+    monkeypatch.setattr(SkillLoader, "load_all_skills", load_while_called)
+    registry.reload()
+
+    assert during == [before]
+    assert registry.get_all().keys() == before.keys()
+    assert registry.get('security-sentinel') is not before['security-sentinel']
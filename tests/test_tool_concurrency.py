@@ -0,0 +1,119 @@
+"""
+Tests for concurrent tool calls.
+
+Testing that blocking tool work runs off the event loop (a slow git doesn't
+stall other calls) and that concurrent session writes stay consistent.
+"""
+
+import asyncio
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+from sensei_mcp import server
+from sensei_mcp.session import SessionManager
+
+
+GIT_DELAY = 1.0
+
+
+@pytest.fixture
+def sessions(request, tmp_path, monkeypatch):
+    """Server session manager in tmp_path (param: cache_max_entries)."""
+    manager = SessionManager(tmp_path / "sessions", cache_max_entries=getattr(request, "param", 64))
+    monkeypatch.setattr(server, "session_mgr", manager)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def slow_git(tmp_path, monkeypatch):
+    """A fake git on PATH that takes GIT_DELAY seconds per command."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    git = bin_dir / "git"
+    git.write_text(
+        "#!/bin/sh\n"
+        f"sleep {GIT_DELAY}\n"
+        'case "$*" in\n'
+        '  *--stat*) echo " src/api/users.py | 2 +-" ;;\n'
+        "  *) echo src/api/users.py ;;\n"
+        "esac\n"
+    )
+    git.chmod(git.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return git
+
+
+def call_tool(name: str, **arguments):
+    return server.mcp.call_tool(name, arguments)
+
+
+def test_slow_git_does_not_stall_other_calls(tmp_path, sessions, slow_git):
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        analysis = asyncio.create_task(call_tool("analyze_changes", project_root=str(tmp_path)))
+        await asyncio.sleep(0.1)  # git is running now
+
+        contexts = await asyncio.gather(*(
+            call_tool("get_session_context", session_id=f"client-{i}") for i in range(5)
+        ))
+        answered = loop.time() - started
+        still_analyzing = not analysis.done()
+        report = await analysis
+        return answered, still_analyzing, loop.time() - started, contexts, report
+
+    answered, still_analyzing, total, contexts, report = asyncio.run(scenario())
+
+    assert still_analyzing and answered < GIT_DELAY
+    # Names and stats are queried concurrently: one git delay, not two
+    assert GIT_DELAY <= total < 2 * GIT_DELAY
+    assert all(json.loads(content[0].text)["session_id"].startswith("client-") for content, _ in contexts)
+    assert "`src/api/users.py`" in report[0][0].text and "src/api/users.py | 2 +-" in report[0][0].text
+    assert "Path classification cache" not in report[0][0].text  # Server metrics stay in get_server_stats
+
+
+@pytest.mark.parametrize("sessions", [64, 0], ids=["cached", "uncached"], indirect=True)
+def test_concurrent_decisions_keep_sessions_apart(sessions, monkeypatch):
+    # Each wave of pool threads has loaded its session before any of them
+    # records: all of a session's callers must be working on one copy
+    workers = server.tool_pool.max_workers
+    barrier = threading.Barrier(workers, timeout=10)
+    add_decision = sessions.add_decision
+
+    def add_decision_after_all_loaded(*args, **kwargs):
+        barrier.wait()
+        return add_decision(*args, **kwargs)
+
+    monkeypatch.setattr(sessions, "add_decision", add_decision_after_all_loaded)
+
+    async def scenario():
+        await asyncio.gather(*(
+            call_tool("record_decision", category="architecture", description=f"{session} decision {i}",
+                      rationale="Tested", session_id=session)
+            for i in range(workers) for session in ("alpha", "beta")
+        ))
+
+    asyncio.run(scenario())
+    sessions.clear_cache()
+
+    for session_id in ("alpha", "beta"):
+        decisions = sessions.get_or_create_session(session_id).decisions
+        assert sorted(d.description for d in decisions) == sorted(f"{session_id} decision {i}" for i in range(workers))
+        assert sorted(d.id for d in decisions) == sorted(f"dec_{i}" for i in range(1, workers + 1))
+
+
+def test_record_consultation_uses_its_session(sessions):
+    # The thread's current session is left over from an earlier call
+    server.get_session_context.blocking(session_id="earlier")
+    response = server.record_consultation.blocking(
+        query="Should we shard?", personas_used=["database-architect"], session_id="target"
+    )
+
+    assert "**ID:** consult_1" in response
+    assert [c.query for c in sessions.get_or_create_session("target").consultations] == ["Should we shard?"]
+    assert sessions.get_or_create_session("earlier").consultations == []